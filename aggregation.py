@@ -0,0 +1,139 @@
+"""Portfolio roll-ups over the telemetry store.
+
+Keeps one monthly roll-up per dataset, indexed by (property, month). It is
+built once from the store and then maintained incrementally: every append
+reported by the store is reduced to per-month sums and queued, and queued
+deltas are folded into the roll-up on the next read.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from telemetry_store import ALL_PROPERTIES, get_store
+
+ROLLUP_COLUMNS = {
+    "energy": ["standard", "optimized"],
+    "maintenance": ["predicted", "actual", "urgent"],
+}
+
+
+def monthly_sums(columns, names):
+    """Reduce raw readings to per-month sums with one bincount per column."""
+    months, inverse = np.unique(np.asarray(columns["timestamp"]).astype("datetime64[M]"), return_inverse=True)
+    index = pd.PeriodIndex(months.astype(str), freq="M", name="month")
+    return pd.DataFrame(
+        {name: np.bincount(inverse, weights=columns[name], minlength=len(months)) for name in names},
+        index=index,
+    )
+
+
+class PortfolioAggregator:
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.RLock()
+        self._rollups = {}
+        self._pending = {dataset: [] for dataset in ROLLUP_COLUMNS}
+        self._version = None
+        store.add_listener(self._on_write)
+
+    def _on_write(self, dataset, property_name, columns, version):
+        with self._lock:
+            # Only extend a roll-up that was current up to this write; anything
+            # else (e.g. writes from another process) forces a rebuild on read.
+            if self._version != version - 1:
+                return
+            if property_name is not None and dataset in ROLLUP_COLUMNS:
+                delta = monthly_sums(columns, ROLLUP_COLUMNS[dataset])
+                self._pending[dataset].append(pd.concat({property_name: delta}, names=["property"]))
+            self._version = version
+
+    def rebuild(self):
+        # Writes in this process wait until the rebuild is done, so none can
+        # be both read here and queued as a delta by _on_write. The store's
+        # lock is taken first, in the same order as append -> _on_write.
+        with self.store.write_lock, self._lock:
+            version = self.store.version
+            for dataset, names in ROLLUP_COLUMNS.items():
+                frames = {
+                    name: self.store.monthly(dataset, name, names)
+                    for name in self.store.properties()
+                    if self.store.has_data(dataset, name)
+                }
+                if frames:
+                    rollup = pd.concat(frames, names=["property"])
+                else:
+                    rollup = pd.DataFrame(
+                        columns=names,
+                        index=pd.MultiIndex.from_arrays([[], pd.PeriodIndex([], freq="M")], names=["property", "month"]),
+                        dtype="float64",
+                    )
+                self._rollups[dataset] = rollup
+                self._pending[dataset] = []
+            self._version = version
+
+    def rollup(self, dataset):
+        """Monthly sums for every property, indexed by (property, month)."""
+        with self._lock:
+            stale = self._version != self.store.version
+        if stale:
+            self.rebuild()
+        with self._lock:
+            if self._pending[dataset]:
+                combined = pd.concat([self._rollups[dataset], *self._pending[dataset]])
+                self._rollups[dataset] = combined.groupby(level=["property", "month"]).sum().sort_index()
+                self._pending[dataset] = []
+            return self._rollups[dataset]
+
+    def has_data(self, dataset, property_name=ALL_PROPERTIES):
+        rollup = self.rollup(dataset)
+        if property_name in (None, ALL_PROPERTIES):
+            return not rollup.empty
+        return property_name in rollup.index.get_level_values("property")
+
+    def monthly(self, dataset, property_name=ALL_PROPERTIES):
+        rollup = self.rollup(dataset)
+        if property_name in (None, ALL_PROPERTIES):
+            return rollup.groupby(level="month").sum()
+        return rollup.xs(property_name, level="property")
+
+    def property_totals(self):
+        """One row per property: kWh, savings and maintenance counts."""
+        energy = self.rollup("energy").groupby(level="property").sum()
+        maintenance = self.rollup("maintenance").groupby(level="property").sum()
+        totals = energy.rename(columns={"standard": "standard_kwh", "optimized": "optimized_kwh"}).join(
+            maintenance, how="outer"
+        ).fillna(0)
+        totals["savings_kwh"] = totals["standard_kwh"] - totals["optimized_kwh"]
+        standard = totals["standard_kwh"].to_numpy()
+        totals["savings_pct"] = np.divide(
+            totals["savings_kwh"].to_numpy() * 100, standard, out=np.zeros_like(standard), where=standard > 0
+        )
+        return totals[["standard_kwh", "optimized_kwh", "savings_kwh", "savings_pct", "predicted", "actual", "urgent"]]
+
+    def portfolio_totals(self):
+        totals = self.property_totals()
+        sums = totals.drop(columns="savings_pct").sum()
+        standard = sums["standard_kwh"]
+        return {
+            "properties": len(totals),
+            "standard_kwh": float(standard),
+            "optimized_kwh": float(sums["optimized_kwh"]),
+            "savings_kwh": float(sums["savings_kwh"]),
+            "savings_pct": float(sums["savings_kwh"] / standard * 100) if standard else 0.0,
+            "predicted": int(sums["predicted"]),
+            "actual": int(sums["actual"]),
+            "urgent": int(sums["urgent"]),
+        }
+
+
+_aggregator = None
+_aggregator_lock = threading.Lock()
+
+
+def get_aggregator():
+    global _aggregator
+    with _aggregator_lock:
+        if _aggregator is None:
+            _aggregator = PortfolioAggregator(get_store())
+        return _aggregator
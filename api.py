@@ -0,0 +1,271 @@
+"""Local JSON API over the dashboard's computed metrics.
+
+    GET  /v1/health
+    GET  /v1/properties
+    GET  /v1/metrics?property=A&property=B&metric=energy&horizon=5
+    POST /v1/metrics  {"properties": ["A", "B"], "metrics": ["energy"], "time_horizon": 5}
+
+Metrics are registered by the app with the builders its views use, so the
+API reports exactly what the dashboard shows. A query names any number of
+properties and metrics and is answered in one response; each
+(property, metric) value is computed once per data version on a small
+thread pool and cached, so overlapping batches share work.
+
+Whole responses are cached too, keyed by the normalized query and the data
+version, and carry an ETag derived from their body. A client that sends it
+back in ``If-None-Match`` gets a 304 without anything being recomputed or
+re-encoded, so polling costs a dictionary lookup until the data changes.
+
+The server runs in the app process when ``PROPERTYPULSE_API_PORT`` is set,
+sharing its caches with the views, or standalone with ``python api.py``.
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from cache import ResultCache, cache_key
+
+API_PORT = os.environ.get("PROPERTYPULSE_API_PORT")
+API_HOST = os.environ.get("PROPERTYPULSE_API_HOST", "127.0.0.1")
+API_WORKERS = int(os.environ.get("PROPERTYPULSE_API_WORKERS", 4))
+API_CACHE_ENTRIES = int(os.environ.get("PROPERTYPULSE_API_CACHE_ENTRIES", 1024))
+# Largest batch one request may ask for
+MAX_BATCH_PROPERTIES = 1000
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class APIError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class MetricsAPI:
+    def __init__(self, version=None, properties=None, max_workers=API_WORKERS, cache_entries=API_CACHE_ENTRIES):
+        self.version = version or (lambda: 0)
+        self.properties = properties or (lambda: [])
+        self._builders = {}
+        self._values = ResultCache(max_entries=cache_entries * 8)
+        self._responses = ResultCache(max_entries=cache_entries)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api")
+        self._server = None
+        self._thread = None
+        self.stats = {"requests": 0, "not_modified": 0, "cached": 0, "computed": 0, "values_computed": 0, "errors": 0,
+                      "last_error": None}
+
+    def register(self, metric, builder, uses_horizon=True):
+        """``builder(selected_property, time_horizon)`` returns the metric's JSON-ready dict."""
+        self._builders[metric] = (builder, uses_horizon)
+
+    # --- Queries ------------------------------------------------------------
+
+    def _normalize(self, properties, metrics, time_horizon):
+        for name, value in (("properties", properties), ("metrics", metrics)):
+            if value is not None and not (isinstance(value, list) and all(isinstance(v, str) for v in value)):
+                raise APIError(400, f"{name} must be a list of strings")
+        properties = list(dict.fromkeys(properties or []))
+        metrics = list(dict.fromkeys(metrics or self._builders))
+        if not properties:
+            raise APIError(400, "no properties given")
+        if len(properties) > MAX_BATCH_PROPERTIES:
+            raise APIError(413, f"at most {MAX_BATCH_PROPERTIES} properties per request")
+        unknown = [m for m in metrics if m not in self._builders]
+        if unknown:
+            raise APIError(400, f"unknown metrics: {', '.join(unknown)}")
+        known = set(self.properties())
+        unknown = [p for p in properties if p not in known]
+        if unknown:
+            raise APIError(404, f"unknown properties: {', '.join(unknown[:10])}")
+        try:
+            time_horizon = int(time_horizon)
+        except (TypeError, ValueError):
+            raise APIError(400, "time_horizon must be an integer") from None
+        if not 1 <= time_horizon <= 10:
+            raise APIError(400, "time_horizon must be between 1 and 10")
+        return tuple(properties), tuple(metrics), time_horizon
+
+    def _value(self, selected_property, metric, time_horizon, version):
+        builder, uses_horizon = self._builders[metric]
+        horizon = time_horizon if uses_horizon else None
+        key = cache_key(selected_property, metric, horizon, version)
+        value = self._values.get(key)
+        if value is None:
+            value = self._values.put(key, builder(selected_property, horizon))
+            self.stats["values_computed"] += 1
+        return value
+
+    def query(self, properties, metrics=None, time_horizon=5):
+        """Encoded response body and its ETag for one batched query."""
+        properties, metrics, time_horizon = self._normalize(properties, metrics, time_horizon)
+        version = self.version()
+        self._values.sync_version(version)
+        self._responses.sync_version(version)
+
+        key = cache_key(properties, metrics, time_horizon, version)
+        response = self._responses.get(key)
+        if response is not None:
+            self.stats["cached"] += 1
+            return response
+
+        pairs = [(p, m) for p in properties for m in metrics]
+        results = {p: {} for p in properties}
+        try:
+            values = self._pool.map(lambda pair: self._value(*pair, time_horizon, version), pairs)
+            for (p, m), value in zip(pairs, values):
+                results[p][m] = value
+            body = json.dumps({"version": version, "time_horizon": time_horizon, "properties": results},
+                              separators=(",", ":"), default=_json_default).encode()
+        except Exception as exc:
+            self.stats["last_error"] = f"{exc!r}"
+            raise APIError(500, f"failed to compute metrics: {exc}") from exc
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.stats["computed"] += 1
+        return self._responses.put(key, (body, etag))
+
+    # --- Serving ------------------------------------------------------------
+
+    @property
+    def address(self):
+        return self._server.server_address if self._server is not None else None
+
+    def start(self, host=API_HOST, port=API_PORT):
+        """Listen in a background thread; a port that cannot be bound is recorded, not retried."""
+        if self._thread is None:
+            self._thread = False
+            try:
+                self._server = ThreadingHTTPServer((host, int(port)), _handler(self))
+            except OSError as exc:
+                self.stats["last_error"] = f"cannot listen on {host}:{port}: {exc}"
+                return self
+            self._server.daemon_threads = True
+            self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-api", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = self._thread = None
+
+
+def _json_default(value):
+    # NumPy scalars and arrays from the data helpers
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _handler(api):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = parse_qs(url.query)
+            if url.path == "/v1/health":
+                self._send_json(200, {"status": "ok", "version": api.version()})
+            elif url.path == "/v1/properties":
+                self._send_json(200, {"properties": api.properties()})
+            elif url.path == "/v1/metrics":
+                self._metrics(params.get("property"), params.get("metric"), params.get("horizon", [5])[0])
+            else:
+                self._send_json(404, {"error": f"no such endpoint: {url.path}"})
+
+        def do_POST(self):
+            if urlsplit(self.path).path != "/v1/metrics":
+                self._send_json(404, {"error": f"no such endpoint: {self.path}"})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY_BYTES:
+                self._send_json(413, {"error": "request body too large"})
+                return
+            try:
+                query = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(query, dict):
+                    raise ValueError("body must be a JSON object")
+            except ValueError as exc:
+                self._send_json(400, {"error": f"invalid JSON body: {exc}"})
+                return
+            self._metrics(query.get("properties"), query.get("metrics"), query.get("time_horizon", 5))
+
+        def _metrics(self, properties, metrics, time_horizon):
+            api.stats["requests"] += 1
+            try:
+                body, etag = api.query(properties, metrics, time_horizon)
+            except APIError as exc:
+                api.stats["errors"] += 1
+                self._send_json(exc.status, {"error": str(exc)})
+                return
+            if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+                api.stats["not_modified"] += 1
+                self._send(304, b"", etag)
+                return
+            self._send(200, body, etag)
+
+        def _send_json(self, status, payload):
+            self._send(status, json.dumps(payload, default=_json_default).encode())
+
+        def _send(self, status, body, etag=None):
+            self.send_response(status)
+            if etag is not None:
+                self.send_header("ETag", etag)
+                # Clients may keep the response but must revalidate it
+                self.send_header("Cache-Control", "no-cache")
+            if status != 304:
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Polling clients would flood the app's console
+            pass
+
+    return Handler
+
+
+_api = None
+_api_lock = threading.Lock()
+
+
+def get_metrics_api():
+    """Process-wide API, or None unless ``PROPERTYPULSE_API_PORT`` is set.
+
+    The app registers its metrics on it and then starts it.
+    """
+    global _api
+    with _api_lock:
+        if _api is None and API_PORT:
+            _api = MetricsAPI()
+        return _api
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the dashboard's metrics without the dashboard.")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=int(API_PORT or 8502))
+    args = parser.parse_args(argv)
+
+    # The app module holds the metric builders; importing it does not start the dashboard
+    import app
+
+    api = MetricsAPI()
+    app.register_api(api)
+    api.start(args.host, args.port)
+    if api.address is None:
+        parser.exit(1, f"{api.stats['last_error']}\n")
+    print(f"serving metrics on http://{args.host}:{args.port}/v1/metrics")
+    try:
+        api._thread.join()
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == "__main__":
+    main()
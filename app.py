@@ -1,12 +1,37 @@
+import calendar
+import functools
+import json
+import time
+
+from profiling import profile_startup, profiled, profiled_run, render_profiler, startup_profile
+
+# Plotly is imported inside the figure builders, which only run on a figure
+# cache miss, so a cold start pays for it in the first view that draws a chart.
+profile_startup()
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
+
+from aggregation import get_aggregator
+from api import get_metrics_api
+from cache import ResultCache, cache_key, figure_cache, result_cache
+from cache_backend import get_shared_cache
+from exports import DEFAULT_FORMATS as DEFAULT_EXPORT_FORMATS, FORMATS as EXPORT_FORMATS, get_exporter
+from downsample import downsample_frame
+from feeds import PAGE_SIZE as FEED_PAGE_SIZE, PRIORITIES, FeedIndex
+from forecast import forecast_frame
+import html_render
+from ingestion import get_pipeline
+from maintenance_scoring import get_engine
+from roi import cumulative_roi
+from savings import OPTIMIZATION_LEVELS, calculator_estimate, roi_surface, savings_kernel
+from scheduler import MaintenanceScheduler, get_scheduler, tasks_from_items
+from scenarios import EXISTING as SCENARIO_EXISTING, LEVELS as SCENARIO_LEVELS, implementation_costs, run_scenarios
+from sentiment import get_sentiment_pipeline
+from shared_data import get_shared_frames, shared
+from snapshots import get_snapshot_worker
+from telemetry_store import ALL_PROPERTIES, COST_CATEGORIES, DEMO_PROPERTIES, get_store
 
 # Set page configuration
 st.set_page_config(
@@ -68,6 +93,24 @@ st.markdown("""
         border-left: 4px solid dodgerblue;
         margin-bottom: 0.5rem;
     }
+    .card-grid {
+        display: grid;
+        gap: 1rem;
+        margin-bottom: 1rem;
+    }
+    .card-grid > .card, .card-grid > .innovation-card {
+        margin-bottom: 0;
+    }
+    .scroll-list {
+        max-height: 32rem;
+        overflow-y: auto;
+        padding-right: 0.25rem;
+    }
+    @media (max-width: 640px) {
+        .card-grid {
+            grid-template-columns: minmax(0, 1fr) !important;
+        }
+    }
     .innovation-card {
         padding: 1rem;
         border-radius: 0.25rem;
@@ -87,79 +130,485 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Headline figures on the overview and financial cards, also served by the metrics API
+HEALTH_SCORE = 87
+ANNUAL_COST_SAVINGS = 247500
+# ROI periods beyond this share the top of the calculator surface's color scale
+ROI_SURFACE_MAX_YEARS = 10
+# Report export sections, and how often a running export's progress is redrawn
+EXPORT_SECTIONS = {
+    "roi": "ROI Table",
+    "cost_breakdown": "Cost Breakdown",
+    "energy_savings": "Energy Savings",
+    "maintenance_timeline": "Maintenance Timeline",
+}
+EXPORT_POLL_SECONDS = 1
+
 # Sample data generation functions
-def generate_maintenance_data():
-    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul"]
-    predicted = [12, 15, 10, 8, 14, 16, 18]
-    actual = [15, 14, 11, 8, 0, 0, 0]
-    urgent = [3, 2, 1, 0, 0, 0, 0]
-    future = [False, False, False, False, True, True, True]
-    
+def store_monthly_frame(dataset, selected_property, columns):
+    # Monthly roll-up from the telemetry store, or None when the store has no
+    # readings for this property and the sample data should be shown instead.
+    aggregator = get_aggregator()
+    if not aggregator.has_data(dataset, selected_property):
+        return None
+
+    monthly = aggregator.monthly(dataset, selected_property)[columns]
+    return monthly.reset_index().rename(columns={"month": "period"})
+
+@profiled("data")
+@shared
+def generate_maintenance_data(selected_property="All Properties", time_horizon=5):
+    history = store_monthly_frame("maintenance", selected_property, ["predicted", "actual", "urgent"])
+    if history is None:
+        history = pd.DataFrame({
+            "period": pd.period_range("2025-01", periods=4, freq="M"),
+            "predicted": [12, 15, 10, 8],
+            "actual": [15, 14, 11, 8],
+            "urgent": [3, 2, 1, 0]
+        })
+    history = history.astype({"predicted": int, "actual": int, "urgent": int})
+    
+    data = forecast_frame(history, "maintenance", (selected_property, "maintenance", get_store().version),
+                          time_horizon * 12, ["predicted"])
+    
+    # Failures the scoring engine already expects land in the first forecast month
+    engine = get_engine()
+    if engine is not None and data["future"].any():
+        first_future = data.index[data["future"]][0]
+        data.loc[first_future, "predicted"] += round(engine.expected_failures(selected_property))
+    
+    data.insert(0, "month", data["period"].dt.strftime("%b %Y"))
+    return data
+
+@profiled("data")
+@shared
+def generate_energy_data(selected_property="All Properties", time_horizon=5):
+    history = store_monthly_frame("energy", selected_property, ["standard", "optimized"])
+    if history is None:
+        history = pd.DataFrame({
+            "period": pd.period_range("2025-01", periods=4, freq="M"),
+            "standard": [45000, 42000, 44000, 46000],
+            "optimized": [45000, 40000, 38000, 37000]
+        })
+    
+    data = forecast_frame(history, "energy", (selected_property, "energy", get_store().version),
+                          time_horizon * 12, ["standard", "optimized"])
+    data.insert(0, "month", data["period"].dt.strftime("%b %Y"))
+    return data
+
+def meter_months(selected_property="All Properties"):
+    # Months with interval energy readings, for the detail chart's range selector
+    store = get_store()
+    names = store.properties() if selected_property == ALL_PROPERTIES else [selected_property]
+    return sorted({month for name in names for month in store.months("energy", name)})
+
+@profiled("data")
+@shared
+def generate_meter_readings(selected_property, start, end):
+    # Interval readings in [start, end), summed across meters per timestamp
+    columns = get_store().read("energy", selected_property, ["timestamp", "standard", "optimized"],
+                               start=np.datetime64(start, "s"), end=np.datetime64(end, "s"))
+    timestamps, inverse = np.unique(columns["timestamp"], return_inverse=True)
     return pd.DataFrame({
-        "month": months,
-        "predicted": predicted,
-        "actual": actual,
-        "urgent": urgent,
-        "future": future
+        "timestamp": timestamps,
+        "standard": np.bincount(inverse, weights=columns["standard"], minlength=len(timestamps)),
+        "optimized": np.bincount(inverse, weights=columns["optimized"], minlength=len(timestamps)),
     })
 
-def generate_energy_data():
-    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul"]
-    standard = [45000, 42000, 44000, 46000, 48000, 52000, 54000]
-    optimized = [45000, 40000, 38000, 37000, 36000, 35000, 34000]
-    future = [False, False, False, False, True, True, True]
+@profiled("data")
+@shared
+def generate_tenant_satisfaction_data(selected_property="All Properties", time_horizon=5):
+    store = get_store()
+    if store.has_data("tenant_surveys", selected_property):
+        # Mean survey score per quarter
+        surveys = store.read("tenant_surveys", selected_property, ["timestamp", "score"])
+        quarters = pd.DatetimeIndex(surveys["timestamp"]).to_period("Q")
+        scores = pd.Series(surveys["score"], dtype="float64").groupby(quarters).mean()
+        history = pd.DataFrame({"period": scores.index, "score": scores.to_numpy().round(1)})
+    else:
+        history = pd.DataFrame({
+            "period": pd.period_range("2025Q1", periods=3, freq="Q"),
+            "score": [76, 82, 89]
+        })
+    
+    data = forecast_frame(history, "tenant_satisfaction", (selected_property, "tenant_satisfaction", get_store().version),
+                          time_horizon * 4, ["score"])
+    data.insert(0, "quarter", data["period"].dt.strftime("Q%q %Y"))
+    return data
+
+@profiled("data")
+@shared
+def generate_cost_savings_data(selected_property="All Properties"):
+    categories = COST_CATEGORIES
+    values = [32, 45, 15, 8]
+    
+    store = get_store()
+    if store.has_data("cost_lines", selected_property):
+        # Share of realized savings per category, in percent
+        lines = store.read("cost_lines", selected_property, ["category_id", "amount"])
+        totals = np.bincount(lines["category_id"], weights=lines["amount"], minlength=len(categories))
+        values = (totals / totals.sum() * 100).round(1)
     
     return pd.DataFrame({
-        "month": months,
-        "standard": standard,
-        "optimized": optimized,
-        "future": future
+        "category": categories,
+        "value": values
     })
 
-def generate_tenant_satisfaction_data():
-    quarters = ["Q1", "Q2", "Q3", "Q4"]
-    scores = [76, 82, 89, 94]
-    future = [False, False, False, True]
+@profiled("data")
+@shared
+def generate_sentiment_data(selected_property="All Properties"):
+    pipeline = get_sentiment_pipeline()
+    if pipeline is not None and pipeline.has_data(selected_property):
+        return pipeline.aggregates(selected_property)
     
     return pd.DataFrame({
-        "quarter": quarters,
-        "score": scores,
-        "future": future
+        "category": ["Maintenance", "Amenities", "Location", "Value", "Security", "Staff"],
+        "positive": [78, 85, 92, 68, 75, 88],
+        "neutral": [15, 10, 6, 22, 15, 9],
+        "negative": [7, 5, 2, 10, 10, 3]
     })
 
-def generate_cost_savings_data():
-    categories = ["Maintenance", "Energy", "Staffing", "Operations"]
-    values = [32, 45, 15, 8]
+@profiled("data")
+@shared
+def generate_roi_data():
+    years = list(range(2025, 2030))
+    investment = [350000, 75000, 50000, 50000, 25000]
+    returns = [247500, 320000, 382500, 420000, 475000]
+    roi = cumulative_roi(investment, returns)
     
     return pd.DataFrame({
-        "category": categories,
-        "value": values
+        "year": years,
+        "investment": investment,
+        "returns": returns,
+        "cumulative_roi": roi["cumulative_roi"],
+        "net": roi["net"]
     })
 
-def generate_alerts():
-    return [
-        {"property": "Los Altos Ranch Market", "issue": "HVAC system predicted failure within 14 days", "priority": "High"},
-        {"property": "San Isidro Plaza", "issue": "Energy usage 15% above optimal levels", "priority": "Medium"},
-        {"property": "Coronado Building", "issue": "Elevator maintenance recommended", "priority": "Low"}
+def roi_break_even(roi_data):
+    # Year and month (1-12) in which returns catch up, or None if they never do
+    roi = cumulative_roi(roi_data["investment"], roi_data["returns"])
+    index = int(roi["break_even_index"])
+    if index < 0:
+        return None
+    month = min(int((roi["break_even_period"] - index) * 12) + 1, 12)
+    return int(roi_data["year"].iloc[index]), month
+
+@profiled("data")
+def generate_portfolio_totals():
+    # Per-property and portfolio totals, or None before any readings exist
+    aggregator = get_aggregator()
+    if not (aggregator.has_data("energy") or aggregator.has_data("maintenance")):
+        return None
+    return {"properties": aggregator.property_totals(), "portfolio": aggregator.portfolio_totals()}
+
+@profiled("data")
+def generate_alert_feed():
+    # Live scores once sensor readings exist; the engine keeps them current
+    # incrementally and rebuilds the feed index only after scores change, so
+    # this is not routed through the result cache.
+    engine = get_engine()
+    if engine is not None:
+        engine.score_pending()
+        return engine.alert_feed()
+
+    return FeedIndex.from_items([
+        {"property": "Los Altos Ranch Market", "issue": "HVAC system predicted failure within 14 days", "priority": "High", "due_days": 14},
+        {"property": "San Isidro Plaza", "issue": "Energy usage 15% above optimal levels", "priority": "Medium", "due_days": 30},
+        {"property": "Coronado Building", "issue": "Elevator maintenance recommended", "priority": "Low", "due_days": 30}
+    ], scoped=False)
+
+@profiled("data")
+def generate_maintenance_schedule():
+    # Once equipment is being scored, the predicted failures are assigned to
+    # technicians; after new scores only the changed tasks and those behind
+    # them in the plan are re-planned.
+    engine = get_engine()
+    if engine is not None:
+        engine.score_pending()
+        scheduler = get_scheduler()
+        scheduler.sync(engine.maintenance_tasks(), engine.describe, version=engine.scored_version)
+        return scheduler
+
+    items = [
+        {"task": "HVAC Compressor Replacement", "property": "Los Altos Ranch Market", "equipment": "HVAC Compressor", "due_days": 14, "priority": "High"},
+        {"task": "Parking Lot Lighting Upgrade", "property": "San Isidro Plaza", "equipment": "Lighting Controller", "due_days": 21, "priority": "Medium"},
+        {"task": "Elevator Annual Maintenance", "property": "Coronado Building", "equipment": "Elevator", "due_days": 30, "priority": "Low"},
+        {"task": "Roof Inspection", "property": "Granada Square", "equipment": "Rooftop Unit", "due_days": 45, "priority": "Medium"},
+        {"task": "Plumbing System Check", "property": "San Ignacio Apartments", "equipment": "Water Pump", "due_days": 60, "priority": "Low"}
     ]
+    scheduler = MaintenanceScheduler()
+    scheduler.sync(tasks_from_items(items), lambda keys: [items[k] for k in keys])
+    return scheduler
+
+@profiled("data")
+def generate_maintenance_feed():
+    # The sample timeline is shown whichever property is selected
+    return generate_maintenance_schedule().feed(scoped=get_engine() is not None)
 
+@profiled("data")
 def generate_properties():
-    return [
-        "All Properties",
-        "San Isidro Plaza",
-        "Los Altos Ranch Market",
-        "Three Amigos",
-        "Santa Fe Building 440",
-        "1651 Galisteo",
-        "Coronado Building",
-        "Imaging Center",
-        "Granada Square",
-        "San Ignacio Apartments",
-        "San Isidro Apartments",
-        "Target Store",
-        "Whole Foods"
-    ]
+    # Properties with readings in the store, or the demo portfolio until there are any
+    return [ALL_PROPERTIES] + (get_store().properties() or DEMO_PROPERTIES)
 
+def add_future_marker(fig, data, x_col, y_value, text):
+    # Dashed line separating past readings from AI predictions, when any exist
+    future_rows = data[data["future"]]
+    if future_rows.empty:
+        return
+
+    future_start = future_rows[x_col].iloc[0]
+    fig.add_vline(x=future_start, line_dash="dash", line_color="grey")
+    fig.add_annotation(x=future_start, y=y_value, text=text, showarrow=True, arrowhead=1)
+
+def chart_points(data, y_columns):
+    # Reduce long series to the chart's point budget, keeping the first
+    # forecast row so the projection marker stays where it belongs
+    keep = np.flatnonzero(data["future"].to_numpy())[:1] if "future" in data else None
+    return downsample_frame(data, y_columns, keep=keep)
+
+def session_cache():
+    # Small per-session layer in front of the process-wide result cache
+    if "result_cache" not in st.session_state:
+        st.session_state["result_cache"] = ResultCache(max_entries=64)
+    return st.session_state["result_cache"]
+
+def cached_data(view, selected_property, builder, *args, time_horizon=None):
+    data_version = get_store().version
+    cache = session_cache()
+    result_cache.sync_version(data_version)
+    cache.sync_version(data_version)
+
+    key = cache_key(selected_property, view, time_horizon, data_version)
+    return cache.get_or_compute(key, result_cache.get_or_compute, key, builder, *args)
+
+def figure_spec(chart, builder, *args):
+    # Build a figure and serialize it to the dict spec st.plotly_chart accepts
+    with render_profiler.step(f"build:{chart}", "figure"):
+        fig = builder(*args)
+    with render_profiler.step(f"serialize:{chart}", "figure"):
+        return json.loads(fig.to_json())
+
+def show_figure(chart, spec):
+    with render_profiler.step(f"plotly_chart:{chart}", "chart") as step:
+        st.plotly_chart(spec, use_container_width=True)
+        if render_profiler.enabled:
+            step["payload_bytes"] = len(json.dumps(spec))
+
+def plot_chart(chart, selected_property, builder, *args, time_horizon=None):
+    # Figures are built and serialized once per input key; later reruns hand
+    # the cached spec straight to Streamlit.
+    key = cache_key(selected_property, chart, time_horizon, get_store().version)
+    spec = figure_cache.get(key)
+    if spec is None:
+        spec = figure_cache.put(key, figure_spec(chart, builder, *args))
+    show_figure(chart, spec)
+
+def snapshot_version():
+    # Telemetry writes, new failure scores and newly arrived tenant feedback
+    # all outdate snapshots
+    engine = get_engine()
+    pipeline = get_sentiment_pipeline()
+    return (get_store().version, engine.scored_version if engine is not None else 0,
+            pipeline.version if pipeline is not None else 0)
+
+def view_snapshot(view, selected_property, time_horizon=None):
+    # Latest precomputed snapshot of a view; a stale one is shown while the
+    # background worker recomputes it.
+    worker = get_snapshot_worker()
+    worker.version = snapshot_version
+    register_snapshots(worker)
+    snapshot = worker.get(view, selected_property, time_horizon)
+    # Have the property's other views ready by the time the user switches
+    worker.prefetch(selected_property, time_horizon)
+    
+    age = time.time() - snapshot["computed_at"]
+    status = "up to date" if worker.is_current(snapshot) else "newer data is being processed"
+    st.caption(f"Computed {age:,.0f}s ago in {snapshot['seconds']:.2f}s ({status})")
+    return snapshot["value"]
+
+def live_section(render, *args):
+    # While readings are streaming in, re-run just this section on each flush
+    # interval; new data reaches it through the incrementally updated roll-ups.
+    pipeline = get_pipeline()
+    fragment = getattr(st, "fragment", None)
+    if pipeline is None or fragment is None:
+        render(*args)
+        return
+    fragment(run_every=pipeline.flush_interval)(profiled_run(render))(*args)
+
+def set_feed_page(state_key, page):
+    st.session_state[state_key] = page
+
+def show_feed(name, generate_feed, selected_property, render_item, empty_message):
+    # One page of a feed. The page is looked up in the feed's index and only
+    # its items are rendered, as one block, however long the feed is.
+    feed = generate_feed()
+    counts = feed.counts(selected_property)
+    priorities = st.multiselect("Priority", PRIORITIES, default=PRIORITIES, key=f"{name}_priorities")
+    st.caption(" · ".join(f"{priority}: {counts[priority]:,}" for priority in PRIORITIES))
+    
+    # Paging starts over whenever the property or the filter changes
+    state_key = f"{name}_page:{selected_property}:{','.join(priorities)}"
+    result = feed.page(selected_property, priorities, st.session_state.get(state_key, 1))
+    if not result["items"]:
+        st.markdown(empty_message)
+        return
+    
+    st.markdown(html_render.stack(map(render_item, result["items"]), scroll_after=FEED_PAGE_SIZE),
+                unsafe_allow_html=True)
+    page, pages = result["page"], result["pages"]
+    first = (page - 1) * FEED_PAGE_SIZE + 1
+    col1, col2, col3 = st.columns([1, 4, 1])
+    col1.button("Previous", key=f"{name}_previous", disabled=page <= 1,
+                on_click=set_feed_page, args=(state_key, page - 1))
+    col2.caption(f"{first:,}-{first + len(result['items']) - 1:,} of {result['total']:,} "
+                 f"(page {page:,} of {pages:,})")
+    col3.button("Next", key=f"{name}_next", disabled=page >= pages,
+                on_click=set_feed_page, args=(state_key, page + 1))
+
+def feed_section(*args):
+    # Paging and filtering rerun only the feed, not the whole view
+    fragment = getattr(st, "fragment", None)
+    if fragment is None:
+        show_feed(*args)
+        return
+    fragment(profiled_run(show_feed))(*args)
+
+def show_ingestion_status():
+    pipeline = get_pipeline()
+    if pipeline is None:
+        return
+    stats = pipeline.stats
+    last_flush = f"{time.time() - pipeline.last_flush:.0f}s ago" if pipeline.last_flush else "pending"
+    st.caption(f"Live ingestion: {stats['received']:,} readings received, "
+               f"{stats['rejected']:,} rejected, {stats['dropped']:,} dropped, {stats['lost']:,} lost in "
+               f"{stats['errors']:,} failed writes. Last flush {last_flush}.")
+
+def show_cache_stats():
+    with st.expander("Cache Statistics"):
+        caches = (("Process", result_cache), ("Session", session_cache()), ("Figures", figure_cache))
+        for label, cache in caches:
+            stats = cache.stats()
+            st.markdown(f"**{label}:** {stats['hits']} hits / {stats['misses']} misses "
+                        f"({stats['hit_rate']:.0%}), {stats['entries']} entries, "
+                        f"{stats['bytes'] / 1024:,.0f} KB"
+                        + (f", {stats['shared_hits']} loaded from other workers" if cache.backend else ""))
+        stats = get_shared_frames().stats()
+        st.markdown(f"**Shared frames:** {stats['hits']} hits / {stats['misses']} misses "
+                    f"({stats['hit_rate']:.0%}), {stats['entries']} entries "
+                    f"({stats['referenced']} in use by {stats['references']} references), "
+                    f"{stats['bytes'] / 1024:,.0f} KB")
+        stats = get_snapshot_worker().stats
+        st.markdown(f"**Snapshots:** {stats['computed']} computed, {stats['shared']} loaded from other workers, "
+                    f"{stats['served']} served ({stats['served_stale']} while refreshing), {stats['errors']} errors")
+        api = get_metrics_api()
+        if api is not None:
+            stats = api.stats
+            status = f"listening on port {api.address[1]}" if api.address else stats["last_error"]
+            st.markdown(f"**Metrics API:** {status}; {stats['requests']} requests, {stats['not_modified']} not "
+                        f"modified, {stats['cached']} from cache, {stats['computed']} computed")
+        backend = get_shared_cache()
+        if backend is not None:
+            stats = backend.stats
+            st.markdown(f"**Shared cache:** {stats['hits']} hits / {stats['misses']} misses, "
+                        f"{stats['writes']} writes, {stats['errors']} errors")
+
+def start_export(properties, sections, formats, time_horizon):
+    exporter = get_exporter()
+    register_exports(exporter)
+    job = exporter.submit(properties, sections, formats, time_horizon)
+    st.session_state["export_job"] = job.id
+
+def read_export(path):
+    with open(path, "rb") as handle:
+        return handle.read()
+
+def show_export_progress():
+    job = get_exporter().job(st.session_state.get("export_job"))
+    if job is None:
+        return
+    progress = job.progress()
+    if not job.done:
+        st.progress(progress["fraction"], text=f"{progress['completed']:,} of {progress['total']:,} properties "
+                                               f"exported ({progress['elapsed']:,.0f}s)")
+        st.button("Cancel Export", on_click=job.cancel)
+        return
+    
+    rows = ", ".join(f"{EXPORT_SECTIONS[section]}: {count:,} rows" for section, count in progress["rows"].items())
+    st.caption(f"Export {progress['status']} after {progress['elapsed']:,.0f}s: {progress['completed']:,} of "
+               f"{progress['total']:,} properties, {progress['files']:,} files. {rows}")
+    for error in progress["errors"][:5]:
+        st.warning(error)
+    if progress["archive"]:
+        # The archive is only read when the button is clicked
+        st.download_button("Download Report Pack", functools.partial(read_export, progress["archive"]),
+                           file_name=f"propertypulse_reports_{job.id}.zip", mime="application/zip")
+
+def poll_export_progress():
+    show_export_progress()
+    job = get_exporter().job(st.session_state.get("export_job"))
+    if job is None or job.done:
+        # Stop polling and bring the export form back
+        st.rerun()
+
+def show_report_export(properties, time_horizon):
+    # Bulk report packs run on the exporter's pools; the form only submits
+    # the job and a fragment redraws its progress until it finishes.
+    with st.expander("Report Export"):
+        job = get_exporter().job(st.session_state.get("export_job"))
+        running = job is not None and not job.done
+        portfolio = [name for name in properties if name != ALL_PROPERTIES]
+        selected = st.multiselect("Properties", properties, default=portfolio, key="export_properties")
+        sections = st.multiselect("Sections", list(EXPORT_SECTIONS), default=list(EXPORT_SECTIONS),
+                                  format_func=EXPORT_SECTIONS.get, key="export_sections")
+        formats = st.multiselect("Formats", EXPORT_FORMATS, default=DEFAULT_EXPORT_FORMATS, key="export_formats")
+        st.button("Start Export", disabled=running or not (selected and sections and formats),
+                  on_click=start_export, args=(selected, sections, formats, time_horizon))
+        
+        fragment = getattr(st, "fragment", None)
+        if running and fragment is not None:
+            fragment(run_every=EXPORT_POLL_SECONDS)(profiled_run(poll_export_progress))()
+        else:
+            show_export_progress()
+
+def show_startup_profile():
+    report = startup_profile.report()
+    with st.expander("Startup Profile"):
+        st.markdown("**First paint per view**")
+        st.dataframe(pd.DataFrame([
+            {"View": view, "Render (s)": paint["render_seconds"], "Since start (s)": paint["since_start_seconds"],
+             "Modules loaded": ", ".join(paint["imports"])}
+            for view, paint in report["first_paint"].items()
+        ]), hide_index=True)
+        st.markdown("**Slowest imports**")
+        st.dataframe(pd.DataFrame([
+            {"Module": entry["module"], "Import (s)": entry["seconds"], "Loaded by": entry["view"] or "startup"}
+            for entry in report["imports"][:15]
+        ]), hide_index=True)
+
+def show_render_profile():
+    last_run = render_profiler.last_run()
+    with st.expander("Render Profile"):
+        if last_run is None:
+            st.markdown("No reruns profiled yet.")
+            return
+        st.markdown(f"**Last rerun** (#{last_run['run']}, release {last_run['release']})")
+        if last_run["concurrent"]:
+            st.caption("Overlapped another session's rerun, so allocations were not attributed.")
+        st.dataframe(pd.DataFrame([
+            {"Step": "  " * record["depth"] + record["step"], "Kind": record["kind"],
+             "Wall (ms)": record["wall_ms"], "Self (ms)": record["self_ms"],
+             "Allocated (KB)": record["allocated_kb"], "Peak (KB)": record["peak_kb"],
+             "Payload (KB)": record.get("payload_bytes", 0) / 1024}
+            for record in last_run["steps"]
+        ]), hide_index=True)
+        st.markdown(f"**Recent reruns** ({len(render_profiler.runs)})")
+        st.dataframe(pd.DataFrame(render_profiler.summary()), hide_index=True)
+        if render_profiler.background:
+            st.markdown(f"**Background steps** ({len(render_profiler.background)} runs, e.g. snapshot builds)")
+            st.dataframe(pd.DataFrame(render_profiler.summary(background=True)), hide_index=True)
+
+@profiled("data")
 def generate_future_innovations():
     return [
         {
@@ -195,7 +644,19 @@ def generate_future_innovations():
     ]
 
 # Main dashboard content
+def start_api():
+    # JSON API over the same metrics, when PROPERTYPULSE_API_PORT is set
+    api = get_metrics_api()
+    if api is None:
+        return
+    register_api(api)
+    api.start()
+
 def main():
+    # Shared frames follow the same data version as the view snapshots
+    get_shared_frames().version = snapshot_version
+    start_api()
+    
     # --- SIDEBAR ---
     with st.sidebar:
         st.image("https://via.placeholder.com/150x80?text=Columbus+Capital", width=150)
@@ -212,190 +673,210 @@ def main():
         st.markdown("### Future Focus")
         time_horizon = st.slider("Time Horizon (Years)", 1, 10, 5)
         
+        st.markdown("---")
+        show_ingestion_status()
+        show_cache_stats()
+        show_report_export(properties, time_horizon)
+        
         st.markdown("---")
         st.markdown("### About")
         st.markdown("PropertyPulse AI is a forward-looking dashboard demonstrating how AI can transform property management for Columbus Capital.")
         st.markdown("Created by Karan Narula")
     
     # --- MAIN CONTENT ---
-    if view_type == "Overview":
-        show_overview(selected_property)
-    elif view_type == "Maintenance":
-        show_maintenance(selected_property)
-    elif view_type == "Energy":
-        show_energy(selected_property)
-    elif view_type == "Tenant Experience":
-        show_tenant(selected_property)
-    elif view_type == "Financial Impact":
-        show_financial(selected_property)
-
-def show_overview(selected_property):
+    with startup_profile.view(view_type), render_profiler.step("main", "dispatch", view=view_type):
+        if view_type == "Overview":
+            show_overview(selected_property, time_horizon)
+        elif view_type == "Maintenance":
+            show_maintenance(selected_property, time_horizon)
+        elif view_type == "Energy":
+            show_energy(selected_property, time_horizon)
+        elif view_type == "Tenant Experience":
+            show_tenant(selected_property, time_horizon)
+        elif view_type == "Financial Impact":
+            show_financial(selected_property)
+    
+    if startup_profile.enabled:
+        with st.sidebar:
+            show_startup_profile()
+    if render_profiler.enabled:
+        with st.sidebar:
+            show_render_profile()
+
+@profiled("view")
+def show_portfolio_rollup(selected_property):
+    # Roll-up across every property in the store; only meaningful for "All Properties"
+    if selected_property != "All Properties":
+        return
+    totals = cached_data("portfolio_totals", selected_property, generate_portfolio_totals)
+    if totals is None:
+        return
+
+    portfolio = totals["portfolio"]
+    st.markdown('<h2 class="sub-header">Portfolio Roll-up</h2>', unsafe_allow_html=True)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Properties", f"{portfolio['properties']:,}")
+    col2.metric("Optimized Energy", f"{portfolio['optimized_kwh']:,.0f} kWh",
+                f"-{portfolio['savings_kwh']:,.0f} kWh", delta_color="inverse")
+    col3.metric("Energy Savings", f"{portfolio['savings_pct']:.1f}%")
+    col4.metric("Maintenance Issues", f"{portfolio['actual']:,}", f"{portfolio['urgent']:,} urgent",
+                delta_color="off")
+
+    st.dataframe(
+        totals["properties"].sort_values("savings_kwh", ascending=False),
+        use_container_width=True,
+        column_config={
+            "standard_kwh": st.column_config.NumberColumn("Standard (kWh)", format="%.0f"),
+            "optimized_kwh": st.column_config.NumberColumn("Optimized (kWh)", format="%.0f"),
+            "savings_kwh": st.column_config.NumberColumn("Savings (kWh)", format="%.0f"),
+            "savings_pct": st.column_config.NumberColumn("Savings %", format="%.1f%%"),
+        },
+    )
+
+def build_overview_maintenance_figure(maintenance_data):
+    import plotly.express as px
+    
+    fig = px.bar(maintenance_data, x="month", y=["predicted", "actual", "urgent"],
+                title="Maintenance Issues by Month",
+                labels={"value": "Number of Issues", "variable": "Type"},
+                color_discrete_sequence=["#8884d8", "#82ca9d", "#ff7300"])
+    
+    # Add a vertical line to separate past from future predictions
+    add_future_marker(fig, maintenance_data, "month", max(maintenance_data["predicted"]), "AI Predictions")
+    return fig
+
+def build_overview_energy_figure(energy_data):
+    import plotly.express as px
+    
+    energy_data = chart_points(energy_data, ["standard", "optimized"])
+    fig = px.line(energy_data, x="month", y=["standard", "optimized"],
+                 title="Energy Usage: Standard vs. AI-Optimized",
+                 labels={"value": "Energy (kWh)", "variable": "Type"},
+                 color_discrete_sequence=["#ff7300", "#00C49F"])
+    
+    # Add a vertical line to separate past from future predictions
+    add_future_marker(fig, energy_data, "month", max(energy_data["standard"]), "AI Projections")
+    return fig
+
+@profiled("data")
+def overview_snapshot(selected_property, time_horizon):
+    maintenance_data = generate_maintenance_data(selected_property, time_horizon)
+    energy_data = generate_energy_data(selected_property, time_horizon)
+    return {
+        "figures": {
+            "overview_maintenance": figure_spec("overview_maintenance", build_overview_maintenance_figure,
+                                                maintenance_data),
+            "overview_energy": figure_spec("overview_energy", build_overview_energy_figure, energy_data),
+        },
+    }
+
+@profiled("view")
+def show_overview(selected_property, time_horizon=5):
     st.markdown(f'<h1 class="main-header">PropertyPulse AI Dashboard: {selected_property}</h1>', unsafe_allow_html=True)
     
     # Top metrics
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<p class="metric-label">AI Health Score</p>', unsafe_allow_html=True)
-        st.markdown('<p class="metric-value">87%</p>', unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown(html_render.grid([
+        html_render.metric_card("AI Health Score", f"{HEALTH_SCORE}%"),
+        html_render.metric_card("Projected Annual Savings", f"${ANNUAL_COST_SAVINGS:,}"),
+        html_render.metric_card("Tenant Satisfaction", "89%", "+18% YoY with AI Optimization"),
+    ], columns=3), unsafe_allow_html=True)
     
-    with col2:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<p class="metric-label">Projected Annual Savings</p>', unsafe_allow_html=True)
-        st.markdown('<p class="metric-value">$247,500</p>', unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<p class="metric-label">Tenant Satisfaction</p>', unsafe_allow_html=True)
-        st.markdown('<p class="metric-value">89%</p>', unsafe_allow_html=True)
-        st.markdown('<p>+18% YoY with AI Optimization</p>', unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+    snapshot = view_snapshot("overview", selected_property, time_horizon)
     
     # Alerts
     st.markdown('<h2 class="sub-header">AI-Generated Alerts</h2>', unsafe_allow_html=True)
-    alerts = generate_alerts()
-    
-    for alert in alerts:
-        priority_class = f"alert-{alert['priority'].lower()}"
-        st.markdown(f"""
-        <div class="{priority_class}">
-            <strong>{alert['property']}:</strong> {alert['issue']}
-            <span style="float: right; font-weight: 600;">{alert['priority']}</span>
-        </div>
-        """, unsafe_allow_html=True)
+    feed_section("alerts", generate_alert_feed, selected_property, html_render.alert_item,
+                 "No equipment currently above the alert threshold.")
     
     # Charts
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown('<h2 class="sub-header">Predictive Maintenance</h2>', unsafe_allow_html=True)
-        maintenance_data = generate_maintenance_data()
-        
-        fig = px.bar(maintenance_data, x="month", y=["predicted", "actual", "urgent"],
-                    title="Maintenance Issues by Month",
-                    labels={"value": "Number of Issues", "variable": "Type"},
-                    color_discrete_sequence=["#8884d8", "#82ca9d", "#ff7300"])
-        
-        # Add a vertical line to separate past from future predictions
-        future_start_index = maintenance_data[maintenance_data["future"] == True].index[0]
-        future_start_month = maintenance_data.iloc[future_start_index]["month"]
-        
-        fig.add_vline(x=future_start_month, line_dash="dash", line_color="grey")
-        fig.add_annotation(x=future_start_month, y=max(maintenance_data["predicted"]), 
-                          text="AI Predictions", showarrow=True, arrowhead=1)
-        
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure("overview_maintenance", snapshot["figures"]["overview_maintenance"])
         st.markdown("AI prediction accuracy: 93% over last 12 months")
     
     with col2:
         st.markdown('<h2 class="sub-header">Energy Optimization</h2>', unsafe_allow_html=True)
-        energy_data = generate_energy_data()
-        
-        fig = px.line(energy_data, x="month", y=["standard", "optimized"],
-                     title="Energy Usage: Standard vs. AI-Optimized",
-                     labels={"value": "Energy (kWh)", "variable": "Type"},
-                     color_discrete_sequence=["#ff7300", "#00C49F"])
-        
-        # Add a vertical line to separate past from future predictions
-        future_start_index = energy_data[energy_data["future"] == True].index[0]
-        future_start_month = energy_data.iloc[future_start_index]["month"]
-        
-        fig.add_vline(x=future_start_month, line_dash="dash", line_color="grey")
-        fig.add_annotation(x=future_start_month, y=max(energy_data["standard"]), 
-                          text="AI Projections", showarrow=True, arrowhead=1)
-        
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure("overview_energy", snapshot["figures"]["overview_energy"])
         st.markdown("Projected annual savings: $125,000 (28% reduction)")
     
+    show_portfolio_rollup(selected_property)
+    
     # Future innovations
     st.markdown('<h2 class="sub-header">Future AI Innovations (2025-2035)</h2>', unsafe_allow_html=True)
     
     innovations = generate_future_innovations()
-    cols = st.columns(3)
-    
-    for i, innovation in enumerate(innovations):
-        col = cols[i % 3]
-        with col:
-            st.markdown(f"""
-            <div class="innovation-card">
-                <h3>{innovation['name']}</h3>
-                <p>{innovation['description']}</p>
-                <span class="innovation-year">Estimated {innovation['year']}</span>
-            </div>
-            """, unsafe_allow_html=True)
-
-def show_maintenance(selected_property):
+    st.markdown(html_render.grid(map(html_render.innovation_card, innovations), columns=3), unsafe_allow_html=True)
+
+def build_maintenance_figure(maintenance_data):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
+    # Create a more detailed maintenance visualization
+    fig = make_subplots(rows=2, cols=1, 
+                       subplot_titles=("Monthly Maintenance Issues", "AI Detection Efficiency"))
+    
+    # Bar chart of maintenance issues
+    fig.add_trace(
+        go.Bar(x=maintenance_data["month"], y=maintenance_data["predicted"], name="AI Predicted",
+              marker_color="#8884d8"),
+        row=1, col=1
+    )
+    
+    fig.add_trace(
+        go.Bar(x=maintenance_data["month"], y=maintenance_data["actual"], name="Actual",
+              marker_color="#82ca9d"),
+        row=1, col=1
+    )
+    
+    fig.add_trace(
+        go.Bar(x=maintenance_data["month"], y=maintenance_data["urgent"], name="Urgent",
+              marker_color="#ff7300"),
+        row=1, col=1
+    )
+    
+    # Line chart showing detection efficiency over time
+    months = maintenance_data["month"][:4]  # Only use past months
+    efficiency = [85, 89, 92, 95]  # Sample efficiency percentages
+    
+    fig.add_trace(
+        go.Scatter(x=months, y=efficiency, mode="lines+markers", name="AI Detection Efficiency",
+                  line=dict(color="#1E88E5", width=3)),
+        row=2, col=1
+    )
+    
+    fig.update_layout(height=600, title_text="AI-Powered Maintenance Analysis")
+    return fig
+
+@profiled("data")
+def maintenance_snapshot(selected_property, time_horizon):
+    maintenance_data = generate_maintenance_data(selected_property, time_horizon)
+    return {"figures": {"maintenance_analysis": figure_spec("maintenance_analysis", build_maintenance_figure,
+                                                            maintenance_data)}}
+
+@profiled("view")
+def render_maintenance_chart(selected_property, time_horizon):
+    snapshot = view_snapshot("maintenance", selected_property, time_horizon)
+    show_figure("maintenance_analysis", snapshot["figures"]["maintenance_analysis"])
+
+@profiled("view")
+def show_maintenance(selected_property, time_horizon=5):
     st.markdown(f'<h1 class="main-header">Predictive Maintenance: {selected_property}</h1>', unsafe_allow_html=True)
     
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        maintenance_data = generate_maintenance_data()
-        
-        # Create a more detailed maintenance visualization
-        fig = make_subplots(rows=2, cols=1, 
-                           subplot_titles=("Monthly Maintenance Issues", "AI Detection Efficiency"))
-        
-        # Bar chart of maintenance issues
-        fig.add_trace(
-            go.Bar(x=maintenance_data["month"], y=maintenance_data["predicted"], name="AI Predicted",
-                  marker_color="#8884d8"),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Bar(x=maintenance_data["month"], y=maintenance_data["actual"], name="Actual",
-                  marker_color="#82ca9d"),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Bar(x=maintenance_data["month"], y=maintenance_data["urgent"], name="Urgent",
-                  marker_color="#ff7300"),
-            row=1, col=1
-        )
-        
-        # Line chart showing detection efficiency over time
-        months = maintenance_data["month"][:4]  # Only use past months
-        efficiency = [85, 89, 92, 95]  # Sample efficiency percentages
-        
-        fig.add_trace(
-            go.Scatter(x=months, y=efficiency, mode="lines+markers", name="AI Detection Efficiency",
-                      line=dict(color="#1E88E5", width=3)),
-            row=2, col=1
-        )
-        
-        fig.update_layout(height=600, title_text="AI-Powered Maintenance Analysis")
-        st.plotly_chart(fig, use_container_width=True)
+        live_section(render_maintenance_chart, selected_property, time_horizon)
     
     with col2:
         st.markdown('<h2 class="sub-header">Maintenance Insights</h2>', unsafe_allow_html=True)
         
-        st.markdown("""
-        <div class="card">
-            <h3>Cost Reduction</h3>
-            <p class="metric-value">38%</p>
-            <p>Decrease in maintenance costs through AI prediction</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="card">
-            <h3>Emergency Repairs</h3>
-            <p class="metric-value">-74%</p>
-            <p>Reduction in emergency repair situations</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="card">
-            <h3>Equipment Lifespan</h3>
-            <p class="metric-value">+32%</p>
-            <p>Increase in average equipment lifespan</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(html_render.stack([
+            html_render.info_card("Cost Reduction", "38%", "Decrease in maintenance costs through AI prediction"),
+            html_render.info_card("Emergency Repairs", "-74%", "Reduction in emergency repair situations"),
+            html_render.info_card("Equipment Lifespan", "+32%", "Increase in average equipment lifespan"),
+        ]), unsafe_allow_html=True)
     
     st.markdown('<h2 class="sub-header">How AI Transforms Maintenance</h2>', unsafe_allow_html=True)
     st.markdown("""
@@ -406,123 +887,146 @@ def show_maintenance(selected_property):
     """)
     
     st.markdown('<h2 class="sub-header">Predicted Maintenance Timeline</h2>', unsafe_allow_html=True)
-    
-    # Create a custom timeline of upcoming maintenance
-    timeline_data = [
-        {"task": "HVAC Compressor Replacement", "property": "Los Altos Ranch Market", "due": "14 days", "severity": "High"},
-        {"task": "Parking Lot Lighting Upgrade", "property": "San Isidro Plaza", "due": "21 days", "severity": "Medium"},
-        {"task": "Elevator Annual Maintenance", "property": "Coronado Building", "due": "30 days", "severity": "Low"},
-        {"task": "Roof Inspection", "property": "Granada Square", "due": "45 days", "severity": "Medium"},
-        {"task": "Plumbing System Check", "property": "San Ignacio Apartments", "due": "60 days", "severity": "Low"}
-    ]
-    
-    for item in timeline_data:
-        severity_color = "tomato" if item["severity"] == "High" else "orange" if item["severity"] == "Medium" else "dodgerblue"
-        st.markdown(f"""
-        <div class="card" style="margin-bottom: 0.5rem; border-left: 4px solid {severity_color};">
-            <div style="display: flex; justify-content: space-between;">
-                <div>
-                    <h3>{item["task"]}</h3>
-                    <p>Location: {item["property"]}</p>
-                </div>
-                <div>
-                    <p style="font-weight: 600; color: {severity_color};">{item["severity"]}</p>
-                    <p>Due in: {item["due"]}</p>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    summary = generate_maintenance_schedule().summary()
+    st.caption(f"{summary['scheduled']:,} of {summary['tasks']:,} tasks assigned to {summary['technicians']} "
+               f"technicians over the next {summary['days']} days ({summary['utilization']:.0%} of capacity); "
+               f"{summary['late']:,} after their predicted failure, {summary['unscheduled']:,} beyond the horizon.")
+    feed_section("timeline", generate_maintenance_feed, selected_property, html_render.timeline_item,
+                 "No maintenance predicted for this property.")
 
-def show_energy(selected_property):
-    st.markdown(f'<h1 class="main-header">Energy Optimization: {selected_property}</h1>', unsafe_allow_html=True)
-    
+@profiled("data")
+def compute_energy_savings(energy_data):
+    # The first month is the pre-optimization baseline, so it is skipped
+    return savings_kernel(energy_data["standard"].to_numpy(), energy_data["optimized"].to_numpy(), skip=1)
+
+def build_energy_figure(energy_data, annual_saving):
+    import plotly.express as px
+    
+    energy_data = chart_points(energy_data, ["standard", "optimized"])
+    fig = px.line(energy_data, x="month", y=["standard", "optimized"],
+                 title="Energy Usage Optimization",
+                 labels={"value": "Energy (kWh)", "variable": "Type"},
+                 color_discrete_sequence=["#ff7300", "#00C49F"])
+    
+    # Add projected savings annotation
+    fig.add_annotation(
+        x=energy_data["month"].iloc[-1],
+        y=energy_data["optimized"].iloc[-1],
+        text=f"Projected Annual Savings: ${annual_saving:,.0f}",
+        showarrow=True,
+        arrowhead=1
+    )
+    return fig
+
+@profiled("data")
+def energy_snapshot(selected_property, time_horizon):
+    energy_data = generate_energy_data(selected_property, time_horizon)
+    savings = compute_energy_savings(energy_data)
+    return {
+        "savings": savings,
+        "figures": {"energy_optimization": figure_spec("energy_optimization", build_energy_figure, energy_data,
+                                                       savings["annual_saving"])},
+    }
+
+@profiled("view")
+def render_energy_usage(selected_property, time_horizon):
     col1, col2 = st.columns([3, 1])
     
     with col1:
-        energy_data = generate_energy_data()
-        
-        fig = px.line(energy_data, x="month", y=["standard", "optimized"],
-                     title="Energy Usage Optimization",
-                     labels={"value": "Energy (kWh)", "variable": "Type"},
-                     color_discrete_sequence=["#ff7300", "#00C49F"])
-        
-        # Add projected savings annotation
-        monthly_savings = []
-        for i, row in energy_data.iterrows():
-            if i > 0:  # Skip first month as there were no savings
-                monthly_savings.append(row["standard"] - row["optimized"])
-        
-        avg_monthly_saving = sum(monthly_savings) / len(monthly_savings)
-        annual_saving = avg_monthly_saving * 12
-        
-        fig.add_annotation(
-            x=energy_data["month"].iloc[-1],
-            y=energy_data["optimized"].iloc[-1],
-            text=f"Projected Annual Savings: ${annual_saving:,.0f}",
-            showarrow=True,
-            arrowhead=1
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        snapshot = view_snapshot("energy", selected_property, time_horizon)
+        savings = snapshot["savings"]
+        show_figure("energy_optimization", snapshot["figures"]["energy_optimization"])
     
     with col2:
         st.markdown('<h2 class="sub-header">Energy Stats</h2>', unsafe_allow_html=True)
         
-        # Calculate stats
-        total_reduction_pct = ((energy_data["standard"].sum() - energy_data["optimized"].sum()) / 
-                              energy_data["standard"].sum() * 100)
-        
-        st.markdown(f"""
-        <div class="card">
-            <h3>Energy Reduction</h3>
-            <p class="metric-value">{total_reduction_pct:.1f}%</p>
-            <p>Overall reduction in energy usage</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="card">
-            <h3>Carbon Offset</h3>
-            <p class="metric-value">162 tons</p>
-            <p>Annual CO₂ emissions reduction</p>
-        </div>
-        """, unsafe_allow_html=True)
+        total_reduction_pct = savings["total_reduction_pct"]
         
-        st.markdown("""
-        <div class="card">
-            <h3>ROI Timeline</h3>
-            <p class="metric-value">1.8 years</p>
-            <p>For AI energy system implementation</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(html_render.stack([
+            html_render.info_card("Energy Reduction", f"{total_reduction_pct:.1f}%", "Overall reduction in energy usage"),
+            html_render.info_card("Carbon Offset", "162 tons", "Annual CO₂ emissions reduction"),
+            html_render.info_card("ROI Timeline", "1.8 years", "For AI energy system implementation"),
+        ]), unsafe_allow_html=True)
+
+def build_meter_figure(readings, total_readings):
+    import plotly.express as px
+    
+    readings = chart_points(readings, ["standard", "optimized"])
+    fig = px.line(readings, x="timestamp", y=["standard", "optimized"],
+                 title=f"Meter Readings ({len(readings):,} of {total_readings:,} points shown)",
+                 labels={"value": "Energy (kWh)", "variable": "Type", "timestamp": ""},
+                 color_discrete_sequence=["#ff7300", "#00C49F"])
+    return fig
+
+@profiled("view")
+def show_meter_detail(selected_property):
+    months = meter_months(selected_property)
+    if not months:
+        return
+    
+    st.markdown('<h2 class="sub-header">Meter Detail</h2>', unsafe_allow_html=True)
+    first = pd.Period(months[0], freq="M").start_time.to_pydatetime()
+    last = (pd.Period(months[-1], freq="M") + 1).start_time.to_pydatetime()
+    # Narrowing the range re-reads only those partitions and spends the whole
+    # point budget on them, so detail reappears as the user zooms in.
+    start, end = st.slider("Time Range", min_value=first, max_value=last, value=(first, last),
+                           format="MMM D, YYYY", key=f"meter_range_{selected_property}")
+    if start >= end:
+        st.markdown("Select a wider time range to see meter readings.")
+        return
+    
+    view = f"meter_readings:{start:%Y%m%d%H%M}-{end:%Y%m%d%H%M}"
+    readings = cached_data(view, selected_property, generate_meter_readings, selected_property, start, end)
+    plot_chart(view, selected_property, build_meter_figure, readings, len(readings))
+
+def build_roi_surface_figure(optimization_level):
+    import plotly.graph_objects as go
+    
+    surface = roi_surface(optimization_level)
+    fig = go.Figure(go.Contour(
+        x=surface["property_size"], y=surface["monthly_energy_cost"], z=surface["roi_period"].round(2),
+        zmin=0, zmax=ROI_SURFACE_MAX_YEARS, colorscale="RdYlGn", reversescale=True,
+        contours=dict(start=0.5, end=ROI_SURFACE_MAX_YEARS, size=0.5, showlabels=True),
+        colorbar=dict(title="ROI (years)"),
+        hovertemplate="%{x:,.0f} sq ft, $%{y:,.0f}/month: %{z:.1f} years<extra></extra>",
+    ))
+    fig.update_layout(title=f"ROI Period with {optimization_level} AI Optimization",
+                      xaxis_title="Property Size (sq ft)", yaxis_title="Current Monthly Energy Cost ($)")
+    return fig
+
+@profiled("view")
+def show_roi_surface(optimization_level, property_size, current_energy_cost):
+    # The surface depends only on the level, so its spec is built once per
+    # level; moving the size and cost sliders just moves the marker.
+    key = cache_key(ALL_PROPERTIES, f"roi_surface:{optimization_level}", None, 0)
+    spec = figure_cache.get(key)
+    if spec is None:
+        spec = figure_cache.put(key, figure_spec("roi_surface", build_roi_surface_figure, optimization_level))
+    marker = {"type": "scatter", "x": [property_size], "y": [current_energy_cost], "mode": "markers",
+              "marker": {"color": "black", "size": 12, "symbol": "x"}, "name": "Your property",
+              "showlegend": False}
+    show_figure("roi_surface", {**spec, "data": spec["data"] + [marker]})
+
+@profiled("view")
+def show_energy(selected_property, time_horizon=5):
+    st.markdown(f'<h1 class="main-header">Energy Optimization: {selected_property}</h1>', unsafe_allow_html=True)
     
-    st.markdown('<h2 class="sub-header">AI Energy Optimization Technologies</h2>', unsafe_allow_html=True)
+    live_section(render_energy_usage, selected_property, time_horizon)
     
-    col1, col2, col3 = st.columns(3)
+    show_meter_detail(selected_property)
     
-    with col1:
-        st.markdown("""
-        <div class="card">
-            <h3>Predictive Climate Control</h3>
-            <p>AI adjusts HVAC settings based on weather forecasts, occupancy patterns, and tenant preferences, reducing energy waste by 22%.</p>
-        </div>
-        """, unsafe_allow_html=True)
+    show_portfolio_rollup(selected_property)
     
-    with col2:
-        st.markdown("""
-        <div class="card">
-            <h3>Smart Lighting Systems</h3>
-            <p>Automated lighting adjusts based on natural light availability and occupancy, with machine learning that adapts to usage patterns over time.</p>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown('<h2 class="sub-header">AI Energy Optimization Technologies</h2>', unsafe_allow_html=True)
     
-    with col3:
-        st.markdown("""
-        <div class="card">
-            <h3>Load Balancing & Demand Response</h3>
-            <p>AI shifts energy usage to off-peak hours and negotiates with utility providers for optimal rates based on predictive usage models.</p>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(html_render.grid([
+        html_render.info_card("Predictive Climate Control", None,
+                              "AI adjusts HVAC settings based on weather forecasts, occupancy patterns, and tenant preferences, reducing energy waste by 22%."),
+        html_render.info_card("Smart Lighting Systems", None,
+                              "Automated lighting adjusts based on natural light availability and occupancy, with machine learning that adapts to usage patterns over time."),
+        html_render.info_card("Load Balancing & Demand Response", None,
+                              "AI shifts energy usage to off-peak hours and negotiates with utility providers for optimal rates based on predictive usage models."),
+    ], columns=3), unsafe_allow_html=True)
     
     # Add an interactive element
     st.markdown('<h2 class="sub-header">Energy Savings Calculator</h2>', unsafe_allow_html=True)
@@ -532,130 +1036,50 @@ def show_energy(selected_property):
     with col1:
         property_size = st.slider("Property Size (sq ft)", 5000, 100000, 25000, 1000)
         current_energy_cost = st.slider("Current Monthly Energy Cost ($)", 1000, 50000, 15000, 500)
-        optimization_level = st.select_slider("AI Optimization Level", options=["Basic", "Standard", "Advanced"])
+        optimization_level = st.select_slider("AI Optimization Level", options=OPTIMIZATION_LEVELS)
     
     with col2:
         # Calculate estimated savings based on inputs
-        if optimization_level == "Basic":
-            savings_pct = 0.18
-        elif optimization_level == "Standard":
-            savings_pct = 0.25
-        else:
-            savings_pct = 0.32
-        
-        monthly_savings = current_energy_cost * savings_pct
-        annual_savings = monthly_savings * 12
+        estimate = calculator_estimate(property_size, current_energy_cost, optimization_level)
         
         st.markdown(f"""
         <div class="card">
             <h3>Estimated Results</h3>
-            <p class="metric-value">${annual_savings:,.0f}/year</p>
+            <p class="metric-value">${estimate['annual_savings']:,.0f}/year</p>
             <p>Projected savings with {optimization_level} AI optimization</p>
-            <p>Implementation cost: ${property_size * 1.8:,.0f}</p>
-            <p>ROI period: {(property_size * 1.8 / annual_savings):.1f} years</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-def show_tenant(selected_property):
-    st.markdown(f'<h1 class="main-header">Tenant Experience: {selected_property}</h1>', unsafe_allow_html=True)
-    
-    tenant_data = generate_tenant_satisfaction_data()
-    
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        fig = px.line(tenant_data, x="quarter", y="score",
-                     title="Tenant Satisfaction Score Trend",
-                     labels={"score": "Satisfaction Score (0-100)"},
-                     line_shape="spline")
-        
-        fig.update_traces(line=dict(color="#8884d8", width=3), mode="lines+markers", marker=dict(size=10))
-        
-        # Add a vertical line to separate past from future predictions
-        future_start_index = tenant_data[tenant_data["future"] == True].index[0]
-        future_start_quarter = tenant_data.iloc[future_start_index]["quarter"]
-        
-        fig.add_vline(x=future_start_quarter, line_dash="dash", line_color="grey")
-        fig.add_annotation(x=future_start_quarter, y=tenant_data["score"].max(), 
-                          text="AI Projection", showarrow=True, arrowhead=1)
-        
-        # Add benchmark lines
-        fig.add_shape(type="line", 
-                     x0=tenant_data["quarter"].iloc[0], y0=75, 
-                     x1=tenant_data["quarter"].iloc[-1], y1=75,
-                     line=dict(color="green", width=1, dash="dot"))
-        
-        fig.add_annotation(x=tenant_data["quarter"].iloc[0], y=75,
-                          text="Industry Average", showarrow=False,
-                          xanchor="left", yanchor="bottom")
-        
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        st.markdown('<h2 class="sub-header">Tenant Metrics</h2>', unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="card">
-            <h3>Renewal Rate</h3>
-            <p class="metric-value">94%</p>
-            <p>+12% after AI implementation</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="card">
-            <h3>Response Time</h3>
-            <p class="metric-value">1.2 hours</p>
-            <p>-68% with AI-enabled communication</p>
+            <p>Implementation cost: ${estimate['implementation_cost']:,.0f}</p>
+            <p>ROI period: {estimate['roi_period']:.1f} years</p>
         </div>
         """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="card">
-            <h3>Service Tickets</h3>
-            <p class="metric-value">-32%</p>
-            <p>Reduction in service requests</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown('<h2 class="sub-header">AI-Enhanced Tenant Experience</h2>', unsafe_allow_html=True)
     
-    col1, col2, col3 = st.columns(3)
+    show_roi_surface(optimization_level, property_size, current_energy_cost)
+
+def build_tenant_figure(tenant_data):
+    import plotly.express as px
     
-    with col1:
-        st.markdown("""
-        <div class="card">
-            <h3>24/7 AI Concierge</h3>
-            <p>Tenants interact with an AI assistant that handles requests, provides information, and coordinates services with human-like understanding.</p>
-        </div>
-        """, unsafe_allow_html=True)
+    fig = px.line(tenant_data, x="quarter", y="score",
+                 title="Tenant Satisfaction Score Trend",
+                 labels={"score": "Satisfaction Score (0-100)"},
+                 line_shape="spline")
     
-    with col2:
-        st.markdown("""
-        <div class="card">
-            <h3>Personalized Environments</h3>
-            <p>AI learns tenant preferences and automatically adjusts lighting, temperature, and amenity access based on individual profiles.</p>
-        </div>
-        """, unsafe_allow_html=True)
+    fig.update_traces(line=dict(color="#8884d8", width=3), mode="lines+markers", marker=dict(size=10))
     
-    with col3:
-        st.markdown("""
-        <div class="card">
-            <h3>Predictive Amenities</h3>
-            <p>The system anticipates community needs and proactively schedules events, services, and amenity availability.</p>
-        </div>
-        """, unsafe_allow_html=True)
+    # Add a vertical line to separate past from future predictions
+    add_future_marker(fig, tenant_data, "quarter", tenant_data["score"].max(), "AI Projection")
     
-    # Tenant feedback analysis
-    st.markdown('<h2 class="sub-header">AI Sentiment Analysis: Tenant Feedback</h2>', unsafe_allow_html=True)
+    # Add benchmark lines
+    fig.add_shape(type="line", 
+                 x0=tenant_data["quarter"].iloc[0], y0=75, 
+                 x1=tenant_data["quarter"].iloc[-1], y1=75,
+                 line=dict(color="green", width=1, dash="dot"))
     
-    # Create a sample sentiment analysis visualization
-    sentiment_data = pd.DataFrame({
-        "category": ["Maintenance", "Amenities", "Location", "Value", "Security", "Staff"],
-        "positive": [78, 85, 92, 68, 75, 88],
-        "neutral": [15, 10, 6, 22, 15, 9],
-        "negative": [7, 5, 2, 10, 10, 3]
-    })
+    fig.add_annotation(x=tenant_data["quarter"].iloc[0], y=75,
+                      text="Industry Average", showarrow=False,
+                      xanchor="left", yanchor="bottom")
+    return fig
+
+def build_sentiment_figure(sentiment_data):
+    import plotly.graph_objects as go
     
     fig = go.Figure()
     
@@ -690,83 +1114,72 @@ def show_tenant(selected_property):
         yaxis_title="Category",
         legend_title="Sentiment"
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    st.markdown("""
-    **AI Insights:** Sentiment analysis reveals strongest positive feedback for location and staff interactions. 
-    The system has identified value perception as an opportunity area and recommends targeted improvements to 
-    amenities that tenants rate most highly for their impact on perceived value.
-    """)
+    return fig
 
-def show_financial(selected_property):
-    st.markdown(f'<h1 class="main-header">Financial Impact: {selected_property}</h1>', unsafe_allow_html=True)
+@profiled("data")
+def tenant_snapshot(selected_property, time_horizon):
+    tenant_data = generate_tenant_satisfaction_data(selected_property, time_horizon)
+    sentiment_data = generate_sentiment_data(selected_property)
+    return {"figures": {
+        "tenant_satisfaction": figure_spec("tenant_satisfaction", build_tenant_figure, tenant_data),
+        "tenant_sentiment": figure_spec("tenant_sentiment", build_sentiment_figure, sentiment_data),
+    }}
+
+@profiled("view")
+def show_tenant(selected_property, time_horizon=5):
+    st.markdown(f'<h1 class="main-header">Tenant Experience: {selected_property}</h1>', unsafe_allow_html=True)
     
-    # Key financial metrics
-    col1, col2, col3 = st.columns(3)
+    snapshot = view_snapshot("tenant", selected_property, time_horizon)
+    
+    col1, col2 = st.columns([2, 1])
     
     with col1:
-        st.markdown("""
-        <div class="card">
-            <h3>Annual Cost Savings</h3>
-            <p class="metric-value">$247,500</p>
-            <p>Through AI-driven optimizations</p>
-        </div>
-        """, unsafe_allow_html=True)
+        show_figure("tenant_satisfaction", snapshot["figures"]["tenant_satisfaction"])
     
     with col2:
-        st.markdown("""
-        <div class="card">
-            <h3>5-Year Projection</h3>
-            <p class="metric-value">$1.24M</p>
-            <p>Cumulative savings with AI systems</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown('<h2 class="sub-header">Tenant Metrics</h2>', unsafe_allow_html=True)
+        
+        st.markdown(html_render.stack([
+            html_render.info_card("Renewal Rate", "94%", "+12% after AI implementation"),
+            html_render.info_card("Response Time", "1.2 hours", "-68% with AI-enabled communication"),
+            html_render.info_card("Service Tickets", "-32%", "Reduction in service requests"),
+        ]), unsafe_allow_html=True)
     
-    with col3:
-        st.markdown("""
-        <div class="card">
-            <h3>Property Value Impact</h3>
-            <p class="metric-value">+8.2%</p>
-            <p>Estimated increase in property values</p>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown('<h2 class="sub-header">AI-Enhanced Tenant Experience</h2>', unsafe_allow_html=True)
     
-    # Cost savings breakdown
-    st.markdown('<h2 class="sub-header">AI-Driven Cost Savings Breakdown</h2>', unsafe_allow_html=True)
+    st.markdown(html_render.grid([
+        html_render.info_card("24/7 AI Concierge", None,
+                              "Tenants interact with an AI assistant that handles requests, provides information, and coordinates services with human-like understanding."),
+        html_render.info_card("Personalized Environments", None,
+                              "AI learns tenant preferences and automatically adjusts lighting, temperature, and amenity access based on individual profiles."),
+        html_render.info_card("Predictive Amenities", None,
+                              "The system anticipates community needs and proactively schedules events, services, and amenity availability."),
+    ], columns=3), unsafe_allow_html=True)
+    
+    # Tenant feedback analysis
+    st.markdown('<h2 class="sub-header">AI Sentiment Analysis: Tenant Feedback</h2>', unsafe_allow_html=True)
     
-    cost_data = generate_cost_savings_data()
+    show_figure("tenant_sentiment", snapshot["figures"]["tenant_sentiment"])
+    
+    st.markdown("""
+    **AI Insights:** Sentiment analysis reveals strongest positive feedback for location and staff interactions. 
+    The system has identified value perception as an opportunity area and recommends targeted improvements to 
+    amenities that tenants rate most highly for their impact on perceived value.
+    """)
+
+def build_cost_savings_figure(cost_data):
+    import plotly.express as px
     
     fig = px.pie(cost_data, values="value", names="category",
                 title="Cost Savings Distribution",
                 color_discrete_sequence=px.colors.qualitative.Set3)
     
     fig.update_traces(textposition="inside", textinfo="percent+label")
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # ROI analysis
-    st.markdown('<h2 class="sub-header">AI Implementation ROI Analysis</h2>', unsafe_allow_html=True)
-    
-    # Create sample ROI data
-    years = list(range(2025, 2030))
-    investment = [350000, 75000, 50000, 50000, 25000]
-    returns = [247500, 320000, 382500, 420000, 475000]
-    cumulative_roi = [
-        (returns[0] - investment[0]) / investment[0] * 100
-    ]
-    
-    for i in range(1, len(years)):
-        total_investment = sum(investment[:i+1])
-        total_returns = sum(returns[:i+1])
-        cumulative_roi.append((total_returns - total_investment) / total_investment * 100)
-    
-    roi_data = pd.DataFrame({
-        "year": years,
-        "investment": investment,
-        "returns": returns,
-        "cumulative_roi": cumulative_roi
-    })
+    return fig
+
+def build_roi_figure(roi_data):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
     
     # Create a subplot with 2 y-axes
     fig = make_subplots(specs=[[{"secondary_y": True}]])
@@ -798,39 +1211,63 @@ def show_financial(selected_property):
     fig.update_xaxes(title_text="Year")
     fig.update_yaxes(title_text="Amount ($)", secondary_y=False)
     fig.update_yaxes(title_text="ROI (%)", secondary_y=True)
+    return fig
+
+@profiled("data")
+def financial_snapshot(selected_property, time_horizon=None):
+    cost_data = generate_cost_savings_data(selected_property)
+    roi_data = generate_roi_data()
+    return {
+        "roi_data": roi_data,
+        "figures": {
+            "cost_savings": figure_spec("cost_savings", build_cost_savings_figure, cost_data),
+            "roi_analysis": figure_spec("roi_analysis", build_roi_figure, roi_data),
+        },
+    }
+
+@profiled("view")
+def show_financial(selected_property):
+    st.markdown(f'<h1 class="main-header">Financial Impact: {selected_property}</h1>', unsafe_allow_html=True)
     
-    st.plotly_chart(fig, use_container_width=True)
+    snapshot = view_snapshot("financial", selected_property)
     
-    # AI value proposition
-    st.markdown('<h2 class="sub-header">AI Value Beyond Direct Savings</h2>', unsafe_allow_html=True)
+    # Key financial metrics
+    st.markdown(html_render.grid([
+        html_render.info_card("Annual Cost Savings", f"${ANNUAL_COST_SAVINGS:,}", "Through AI-driven optimizations"),
+        html_render.info_card("5-Year Projection", "$1.24M", "Cumulative savings with AI systems"),
+        html_render.info_card("Property Value Impact", "+8.2%", "Estimated increase in property values"),
+    ], columns=3), unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
+    # Cost savings breakdown
+    st.markdown('<h2 class="sub-header">AI-Driven Cost Savings Breakdown</h2>', unsafe_allow_html=True)
     
-    with col1:
-        st.markdown("""
-        <div class="card">
-            <h3>Tenant Premium</h3>
-            <p>Higher quality tenants willing to pay 5-7% premium for AI-enhanced properties with improved experience metrics.</p>
-        </div>
-        
-        <div class="card" style="margin-top: 1rem;">
-            <h3>Resale Value</h3>
-            <p>Properties with documented AI systems and efficiency metrics command higher valuations (average +8.2% in comparable markets).</p>
-        </div>
-        """, unsafe_allow_html=True)
+    show_figure("cost_savings", snapshot["figures"]["cost_savings"])
     
-    with col2:
-        st.markdown("""
-        <div class="card">
-            <h3>Financing Benefits</h3>
-            <p>Financial institutions offer improved terms for properties with AI management systems due to reduced risk profiles and improved cash flow visibility.</p>
-        </div>
-        
-        <div class="card" style="margin-top: 1rem;">
-            <h3>Brand Premium</h3>
-            <p>Columbus Capital's reputation as an innovation leader in property development creates marketing advantages and tenant preference.</p>
-        </div>
-        """, unsafe_allow_html=True)
+    # ROI analysis
+    st.markdown('<h2 class="sub-header">AI Implementation ROI Analysis</h2>', unsafe_allow_html=True)
+    
+    roi_data = snapshot["roi_data"]
+    show_figure("roi_analysis", snapshot["figures"]["roi_analysis"])
+    
+    break_even = roi_break_even(roi_data)
+    if break_even is not None:
+        year, month = break_even
+        st.markdown(f"Cumulative returns exceed cumulative investment in {calendar.month_name[month]} {year}.")
+    
+    # AI value proposition
+    st.markdown('<h2 class="sub-header">AI Value Beyond Direct Savings</h2>', unsafe_allow_html=True)
+    
+    # Row by row: Tenant Premium beside Financing Benefits, Resale Value beside Brand Premium
+    st.markdown(html_render.grid([
+        html_render.info_card("Tenant Premium", None,
+                              "Higher quality tenants willing to pay 5-7% premium for AI-enhanced properties with improved experience metrics."),
+        html_render.info_card("Financing Benefits", None,
+                              "Financial institutions offer improved terms for properties with AI management systems due to reduced risk profiles and improved cash flow visibility."),
+        html_render.info_card("Resale Value", None,
+                              "Properties with documented AI systems and efficiency metrics command higher valuations (average +8.2% in comparable markets)."),
+        html_render.info_card("Brand Premium", None,
+                              "Columbus Capital's reputation as an innovation leader in property development creates marketing advantages and tenant preference."),
+    ], columns=2), unsafe_allow_html=True)
     
     # Implementation cost calculator
     st.markdown('<h2 class="sub-header">AI Implementation Cost Calculator</h2>', unsafe_allow_html=True)
@@ -841,40 +1278,19 @@ def show_financial(selected_property):
         num_properties = st.slider("Number of Properties", 1, 20, 5)
         implementation_level = st.select_slider(
             "Implementation Level", 
-            options=["Basic (Monitoring)", "Standard (Monitoring + Automation)", "Advanced (Full AI Integration)"]
+            options=SCENARIO_LEVELS
         )
         existing_systems = st.selectbox(
             "Existing Building Management Systems",
-            options=["None/Minimal", "Standard", "Modern/Advanced"]
+            options=SCENARIO_EXISTING
         )
     
     with col2:
         # Calculate implementation costs
-        base_cost_per_property = {
-            "Basic (Monitoring)": 45000,
-            "Standard (Monitoring + Automation)": 75000,
-            "Advanced (Full AI Integration)": 120000
-        }
-        
-        existing_discount = {
-            "None/Minimal": 0,
-            "Standard": 0.15,
-            "Modern/Advanced": 0.30
-        }
-        
-        # Calculate totals
-        base_cost = base_cost_per_property[implementation_level] * num_properties
-        discount = base_cost * existing_discount[existing_systems]
-        total_cost = base_cost - discount
-        
-        annual_savings_per_property = {
-            "Basic (Monitoring)": 35000,
-            "Standard (Monitoring + Automation)": 55000,
-            "Advanced (Full AI Integration)": 85000
-        }
-        
-        annual_savings = annual_savings_per_property[implementation_level] * num_properties
-        roi_period = total_cost / annual_savings
+        costs = implementation_costs(num_properties, implementation_level, existing_systems)
+        total_cost = costs["total_cost"]
+        annual_savings = costs["annual_savings"]
+        roi_period = costs["roi_period"]
         
         st.markdown(f"""
         <div class="card">
@@ -892,7 +1308,141 @@ def show_financial(selected_property):
             st.info("This implementation has a solid ROI timeframe.")
         else:
             st.warning("Consider phased implementation to improve ROI timeframe.")
+    
+    show_scenario_sweep()
+
+@profiled("view")
+def show_scenario_sweep():
+    st.markdown('<h2 class="sub-header">Scenario Sweep</h2>', unsafe_allow_html=True)
+    st.markdown("Evaluate every calculator combination under uncertain cost and savings assumptions.")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    n_scenarios = col1.select_slider("Scenarios", options=[10_000, 100_000, 1_000_000], value=100_000,
+                                     format_func=lambda n: f"{n:,}")
+    cost_spread = col2.slider("Cost Uncertainty (±%)", 0, 50, 20) / 100
+    savings_spread = col3.slider("Savings Uncertainty (±%)", 0, 50, 25) / 100
+    discount_spread = col4.slider("Discount Uncertainty (±pts)", 0, 20, 10) / 100
+    
+    if not st.button("Run Scenario Sweep"):
+        return
+    
+    progress = st.progress(0.0, text="Starting workers...")
+    results = st.empty()
+    batch_size = max(n_scenarios // 40, 10_000)
+    for completed, total, summary in run_scenarios(n_scenarios, batch_size, cost_spread, savings_spread,
+                                                   discount_spread):
+        progress.progress(completed / total, text=f"{summary.count:,} of {n_scenarios:,} scenarios evaluated")
+        roi = summary.roi_percentiles()
+        net = summary.net_benefit_percentiles()
+        stats = summary.to_dict()
+        results.dataframe(
+            pd.DataFrame({
+                "Percentile": [f"P{p}" for p in roi],
+                "ROI Period (years)": [f"{v:.2f}" for v in roi.values()],
+                "5-Year Net Benefit": [f"${v:,.0f}" for v in net.values()],
+            }).set_index("Percentile"),
+            use_container_width=True,
+        )
+    st.markdown(f"{stats['share_roi_under_1_5_years']:.0%} of scenarios pay back within 1.5 years, "
+                f"{stats['share_roi_under_3_years']:.0%} within 3 years. "
+                f"Mean 5-year net benefit: ${stats['net_benefit_5y_mean']:,.0f}.")
+
+def register_snapshots(worker):
+    # Snapshot builder per view; the financial view does not depend on the horizon.
+    # Maintenance forecasts include this worker's live failure scores, so
+    # they are not loaded from other workers.
+    worker.register("overview", overview_snapshot, shared=False)
+    worker.register("maintenance", maintenance_snapshot, shared=False)
+    worker.register("energy", energy_snapshot)
+    worker.register("tenant", tenant_snapshot)
+    worker.register("financial", financial_snapshot, uses_horizon=False)
+
+@profiled("data")
+def export_roi_table(selected_property=None, time_horizon=None):
+    # Portfolio-wide, so exported once per pack
+    return generate_roi_data()
+
+@profiled("data")
+def export_cost_breakdown(selected_property, time_horizon=None):
+    cost_data = generate_cost_savings_data(selected_property)
+    return pd.DataFrame({
+        "category": cost_data["category"],
+        "share_pct": cost_data["value"].astype("float64"),
+    })
+
+@profiled("data")
+def export_energy_savings(selected_property, time_horizon):
+    energy_data = generate_energy_data(selected_property, time_horizon)
+    standard = energy_data["standard"].astype("float64")
+    optimized = energy_data["optimized"].astype("float64")
+    return pd.DataFrame({
+        "month": energy_data["month"],
+        "standard": standard,
+        "optimized": optimized,
+        "savings": standard - optimized,
+        "forecast": energy_data["future"],
+    })
+
+@profiled("data")
+def export_maintenance_timeline(selected_property, time_horizon=None):
+    # Every item the timeline would page through for this property
+    feed = generate_maintenance_feed()
+    items = feed.page(selected_property, page_size=max(len(feed), 1))["items"]
+    columns = ["property", "task", "priority", "due_days", "scheduled", "technician"]
+    return pd.DataFrame([{column: item[column] for column in columns} for item in items], columns=columns)
+
+def register_exports(exporter):
+    exporter.register("roi", export_roi_table, per_property=False)
+    exporter.register("cost_breakdown", export_cost_breakdown)
+    exporter.register("energy_savings", export_energy_savings)
+    exporter.register("maintenance_timeline", export_maintenance_timeline)
+
+@profiled("data")
+def overview_metrics(selected_property, time_horizon):
+    maintenance_data = generate_maintenance_data(selected_property, time_horizon)
+    tenant_data = generate_tenant_satisfaction_data(selected_property, time_horizon)
+    observed_scores = tenant_data.loc[~tenant_data["future"], "score"]
+    return {
+        "health_score": HEALTH_SCORE,
+        "projected_annual_savings": ANNUAL_COST_SAVINGS,
+        "tenant_satisfaction": float(observed_scores.iloc[-1]) if len(observed_scores) else None,
+        "alerts": generate_alert_feed().counts(selected_property),
+        "predicted_maintenance_next_year": int(maintenance_data.loc[maintenance_data["future"], "predicted"].head(12).sum()),
+    }
+
+@profiled("data")
+def energy_metrics(selected_property, time_horizon):
+    savings = compute_energy_savings(generate_energy_data(selected_property, time_horizon))
+    return {
+        "avg_saving_kwh": savings["avg_saving"],
+        "annual_saving_kwh": savings["annual_saving"],
+        "total_reduction_pct": savings["total_reduction_pct"],
+    }
+
+@profiled("data")
+def financial_metrics(selected_property, time_horizon=None):
+    cost_data = generate_cost_savings_data(selected_property)
+    roi_data = generate_roi_data()
+    break_even = roi_break_even(roi_data)
+    return {
+        "annual_cost_savings": ANNUAL_COST_SAVINGS,
+        "cost_savings_share_pct": dict(zip(cost_data["category"], cost_data["value"].astype("float64").tolist())),
+        "total_investment": int(roi_data["investment"].sum()),
+        "total_returns": int(roi_data["returns"].sum()),
+        "cumulative_roi_pct": float(roi_data["cumulative_roi"].iloc[-1]),
+        "break_even_year": break_even[0] if break_even else None,
+        "break_even_month": break_even[1] if break_even else None,
+    }
+
+def register_api(api):
+    # The API keys its caches by the same version as the view snapshots
+    api.version = snapshot_version
+    api.properties = generate_properties
+    api.register("overview", overview_metrics)
+    api.register("energy", energy_metrics)
+    api.register("financial", financial_metrics, uses_horizon=False)
 
 # Run the app
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with render_profiler.run("script", "run"):
+        main()
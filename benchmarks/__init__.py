@@ -0,0 +1 @@
+"""Headless benchmarks for the dashboard; run ``python -m benchmarks.run --help``."""
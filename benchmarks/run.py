@@ -0,0 +1,341 @@
+"""Headless benchmark harness for the dashboard.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --scales 12:60,1200:15 --repeats 10 --output results.json
+    git stash; python -m benchmarks.run --save-baseline; git stash pop
+    python -m benchmarks.run --compare
+
+A scale is ``properties:interval_minutes``. Each scale runs in its own worker
+process against a fresh telemetry store in a temporary directory, so
+process-wide caches and singletons start empty and peak RSS is per scale.
+The worker times the generate_* helpers, the aggregation, savings and ROI
+computations and the figure builders directly, then renders every view
+through Streamlit's AppTest, cold (caches, shared frames and view
+snapshots cleared) and warm (a plain rerun).
+
+Each case reports latency percentiles over ``--repeats`` timed calls and the
+peak traced allocation of one extra call.
+
+Latency depends on the machine, so no baseline is committed: record one on
+the machine that will compare against it, from the revision to compare
+with, using ``--save-baseline`` (written to ``benchmarks/baseline.json``
+unless a path is given). ``--compare`` then flags every case whose median
+latency or peak memory exceeds that baseline by more than ``--tolerance``
+and exits with 1. View renders go through Streamlit's script runner and
+vary far more between runs than the direct calls, so they get their own,
+looser ``--view-tolerance`` and ``--view-min-delta-ms``.
+"""
+import argparse
+import inspect
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+BASELINE_PATH = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+
+DEFAULT_SCALES = "12:1440,12:60,120:60,1200:1440"
+VIEWS = ["Overview", "Maintenance", "Energy", "Tenant Experience", "Financial Impact"]
+PERCENTILES = (50, 90, 99)
+
+
+def summarize(samples, peak_bytes):
+    samples_ms = np.asarray(samples) * 1000
+    stats = {f"p{p}_ms": float(np.percentile(samples_ms, p)) for p in PERCENTILES}
+    stats.update({
+        "min_ms": float(samples_ms.min()),
+        "mean_ms": float(samples_ms.mean()),
+        "samples": len(samples_ms),
+        "peak_kb": peak_bytes / 1024,
+    })
+    return stats
+
+
+def measure(func, repeats, warmup=1, setup=None):
+    """Latency stats over ``repeats`` calls plus the peak allocation of one traced call.
+
+    ``setup`` runs untimed before every call, e.g. to clear caches.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+
+    samples = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+
+    # Tracing slows the call down, so memory gets its own run
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return summarize(samples, peak)
+
+
+# --- Worker -----------------------------------------------------------------
+
+def direct_cases(n_properties, interval_minutes, months):
+    """(name, callable) pairs that call the app's computations without Streamlit."""
+    import app
+    from aggregation import get_aggregator
+    from roi import cumulative_roi
+    from savings import savings_kernel
+    from telemetry_store import ALL_PROPERTIES, get_store
+
+    store = get_store()
+    aggregator = get_aggregator()
+    readings_per_property = int(months * 30 * 24 * 60 / interval_minutes)
+    rng = np.random.default_rng(0)
+    standard = rng.uniform(40, 60, (n_properties, readings_per_property))
+    optimized = standard * rng.uniform(0.7, 1.0, standard.shape)
+    investment = np.zeros((n_properties, 120))
+    investment[:, 0] = rng.uniform(50_000, 150_000, n_properties)
+    returns = np.tile(rng.uniform(1_000, 5_000, (n_properties, 1)), (1, 120))
+
+    # Time the computations themselves rather than shared-frame lookups
+    generate = {name: inspect.unwrap(getattr(app, name)) for name in dir(app) if name.startswith("generate_")}
+
+    energy_data = app.generate_energy_data(ALL_PROPERTIES, 5)
+    maintenance_data = app.generate_maintenance_data(ALL_PROPERTIES, 5)
+    stored_months = store.months("energy", store.properties()[0])
+    start = np.datetime64(stored_months[0], "s")
+    end = np.datetime64(np.datetime64(stored_months[-1], "M") + 1, "s")
+    readings = app.generate_meter_readings(ALL_PROPERTIES, start, end)
+
+    return [
+        ("store.monthly[energy]", lambda: store.monthly("energy")),
+        ("aggregator.rebuild", aggregator.rebuild),
+        ("aggregator.property_totals", aggregator.property_totals),
+        ("generate_energy_data", lambda: generate["generate_energy_data"](ALL_PROPERTIES, 5)),
+        ("generate_maintenance_data", lambda: generate["generate_maintenance_data"](ALL_PROPERTIES, 5)),
+        ("generate_tenant_satisfaction_data", lambda: generate["generate_tenant_satisfaction_data"](ALL_PROPERTIES, 5)),
+        ("generate_meter_readings", lambda: generate["generate_meter_readings"](ALL_PROPERTIES, start, end)),
+        ("generate_roi_data", generate["generate_roi_data"]),
+        ("generate_portfolio_totals", generate["generate_portfolio_totals"]),
+        ("generate_alert_feed", generate["generate_alert_feed"]),
+        ("alert_feed.page", lambda: app.generate_alert_feed().page(ALL_PROPERTIES, page=2)),
+        ("savings_kernel[stacked]", lambda: savings_kernel(standard, optimized,
+                                                           periods_per_year=525_600 // interval_minutes)),
+        ("cumulative_roi[stacked]", lambda: cumulative_roi(investment, returns)),
+        ("build_energy_figure", lambda: app.build_energy_figure(energy_data, 0.0)),
+        ("build_maintenance_figure", lambda: app.build_maintenance_figure(maintenance_data)),
+        ("build_meter_figure", lambda: app.build_meter_figure(readings, len(readings))),
+    ]
+
+
+def view_cases():
+    """(name, callable, setup) triples rendering each view through AppTest."""
+    from streamlit.testing.v1 import AppTest
+
+    from cache import figure_cache, result_cache
+    from shared_data import get_shared_frames
+    from snapshots import get_snapshot_worker
+
+    def clear_caches():
+        result_cache.clear()
+        figure_cache.clear()
+        get_shared_frames().clear()
+        get_snapshot_worker().clear()
+
+    def check(at):
+        if at.exception:
+            raise RuntimeError("; ".join(e.message for e in at.exception))
+        return at
+
+    def open_view(view):
+        at = check(AppTest.from_file(APP_PATH, default_timeout=600).run())
+        clear_caches()
+        return next(w for w in at.radio if w.label == "View Type").set_value(view)
+
+    cases = []
+    for view in VIEWS:
+        # Cold: a new session with empty caches, timing only the view's render
+        pending = {}
+        cases.append((
+            f"view[{view}].cold",
+            lambda: check(pending["at"].run()),
+            lambda view=view: pending.update(at=open_view(view)),
+        ))
+        # Warm: rerun of a session that has already rendered the view
+        warm = check(open_view(view).run())
+        cases.append((f"view[{view}].warm", lambda warm=warm: check(warm.run()), None))
+    return cases
+
+
+def run_worker(n_properties, interval_minutes, months, repeats, include_views):
+    data_dir = os.environ["PROPERTYPULSE_DATA_DIR"] = tempfile.mkdtemp(prefix="propertypulse-bench-")
+    sys.path.insert(0, REPO_ROOT)
+    from synthetic import write_portfolio
+    from telemetry_store import get_store
+
+    try:
+        start = time.perf_counter()
+        rows = sum(write_portfolio(get_store(), n_properties, months, interval_minutes).values())
+        result = {
+            "properties": n_properties,
+            "interval_minutes": interval_minutes,
+            "months": months,
+            "rows": rows,
+            "populate_s": time.perf_counter() - start,
+            "cases": {},
+        }
+        for name, func in direct_cases(n_properties, interval_minutes, months):
+            result["cases"][name] = measure(func, repeats)
+        if include_views:
+            for name, func, setup in view_cases():
+                result["cases"][name] = measure(func, repeats, setup=setup)
+        result["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return result
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+# --- Driver -----------------------------------------------------------------
+
+def parse_scales(text):
+    scales = []
+    for item in text.split(","):
+        properties, _, interval = item.partition(":")
+        scales.append((int(properties), int(interval or 60)))
+    return scales
+
+
+def scale_label(n_properties, interval_minutes):
+    return f"{n_properties}p@{interval_minutes}m"
+
+
+def run_scale(n_properties, interval_minutes, args):
+    command = [
+        sys.executable, "-m", "benchmarks.run", "--worker",
+        "--scales", f"{n_properties}:{interval_minutes}",
+        "--months", str(args.months), "--repeats", str(args.repeats),
+    ]
+    if args.no_views:
+        command.append("--no-views")
+    completed = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr)
+        raise RuntimeError(f"Worker for {scale_label(n_properties, interval_minutes)} failed")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance, min_delta_ms=5.0, min_delta_kb=256.0,
+            view_tolerance=0.75, view_min_delta_ms=100.0):
+    """Cases whose median latency or peak memory regressed past the tolerance.
+
+    Changes under ``min_delta_ms``/``min_delta_kb`` are noise and never
+    count. View renders use ``view_tolerance`` and ``view_min_delta_ms``.
+    """
+    regressions = []
+    for scale, result in results.items():
+        for case, stats in result["cases"].items():
+            reference = baseline.get(scale, {}).get("cases", {}).get(case)
+            if reference is None:
+                continue
+            view = case.startswith("view[")
+            thresholds = {
+                "p50_ms": (view_tolerance if view else tolerance, view_min_delta_ms if view else min_delta_ms),
+                "peak_kb": (tolerance, min_delta_kb),
+            }
+            for metric, (allowed, min_delta) in thresholds.items():
+                if stats[metric] - reference[metric] < min_delta:
+                    continue
+                if reference[metric] > 0 and stats[metric] > reference[metric] * (1 + allowed):
+                    regressions.append((scale, case, metric, reference[metric], stats[metric]))
+    return regressions
+
+
+def print_report(results):
+    for scale, result in results.items():
+        print(f"\n== {scale}: {result['rows']:,} rows, populated in {result['populate_s']:.1f}s, "
+              f"max RSS {result['max_rss_mb']:,.0f} MB")
+        print(f"{'case':<42}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'peak KB':>12}")
+        for case, stats in result["cases"].items():
+            print(f"{case:<42}{stats['p50_ms']:>10.1f}{stats['p90_ms']:>10.1f}"
+                  f"{stats['p99_ms']:>10.1f}{stats['peak_kb']:>12,.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default=DEFAULT_SCALES,
+                        help="comma-separated properties:interval_minutes pairs (default: %(default)s)")
+    parser.add_argument("--months", type=int, default=6, help="months of readings per property")
+    parser.add_argument("--repeats", type=int, default=5, help="timed calls per case")
+    parser.add_argument("--no-views", action="store_true", help="skip the AppTest view renders")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", "--baseline", dest="baseline", nargs="?", const=BASELINE_PATH, metavar="PATH",
+                        help="flag cases slower than a results file saved earlier (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE_PATH, metavar="PATH",
+                        help="write the results as a new baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative slowdown or memory growth (default: %(default)s)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0,
+                        help="ignore median latency changes smaller than this (default: %(default)s)")
+    parser.add_argument("--view-tolerance", type=float, default=0.75,
+                        help="allowed relative slowdown of view renders (default: %(default)s)")
+    parser.add_argument("--view-min-delta-ms", type=float, default=100.0,
+                        help="ignore view render latency changes smaller than this (default: %(default)s)")
+    parser.add_argument("--min-delta-kb", type=float, default=256.0,
+                        help="ignore peak memory changes smaller than this (default: %(default)s)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        (n_properties, interval_minutes), = parse_scales(args.scales)
+        result = run_worker(n_properties, interval_minutes, args.months, args.repeats, not args.no_views)
+        print(json.dumps(result))
+        return 0
+
+    results = {}
+    for n_properties, interval_minutes in parse_scales(args.scales):
+        label = scale_label(n_properties, interval_minutes)
+        print(f"Running {label} ...", file=sys.stderr, flush=True)
+        results[label] = run_scale(n_properties, interval_minutes, args)
+    print_report(results)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        if not os.path.exists(args.baseline):
+            print(f"\nNo baseline at {args.baseline}; create one with --save-baseline.", file=sys.stderr)
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if not set(results) & set(baseline):
+            print(f"\nNo scale in common with {args.baseline} ({', '.join(baseline)}); nothing compared.",
+                  file=sys.stderr)
+            return 0
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms, args.min_delta_kb,
+                              args.view_tolerance, args.view_min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for scale, case, metric, before, after in regressions:
+                print(f"  {scale} {case} {metric}: {before:,.1f} -> {after:,.1f}")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""In-memory result cache for data generators and derived frames.
+
+Entries are keyed by ``(property, view, time_horizon, data_version)`` and
+evicted by TTL, by LRU order once ``max_entries`` or ``max_bytes`` is
+exceeded, and explicitly through ``invalidate``.
+
+A cache given a ``backend`` (the SQLite cache shared by app workers, see
+``cache_backend``) writes every stored value through to it under its
+``namespace`` and, on a local miss, looks there before reporting a miss.
+"""
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from cache_backend import get_shared_cache
+
+DEFAULT_TTL = float(os.environ.get("PROPERTYPULSE_CACHE_TTL", 600))
+DEFAULT_MAX_BYTES = int(float(os.environ.get("PROPERTYPULSE_CACHE_MAX_MB", 256)) * 1024 * 1024)
+DEFAULT_MAX_ENTRIES = int(os.environ.get("PROPERTYPULSE_CACHE_MAX_ENTRIES", 512))
+
+
+def cache_key(selected_property, view, time_horizon, data_version):
+    return (selected_property, view, time_horizon, data_version)
+
+
+def estimate_size(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES,
+                 backend=None, namespace=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self.namespace = namespace
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.data_version = None
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key, default=None, count=True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] < time.monotonic():
+                self._drop(key)
+                entry = None
+
+            if entry is None:
+                value = self._get_shared(key)
+                if value is _MISSING:
+                    if count:
+                        self.misses += 1
+                    return default
+                if count:
+                    self.hits += 1
+                    self.shared_hits += 1
+                return value
+
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[0]
+
+    def _get_shared(self, key):
+        # Another worker's result; kept locally without writing it back
+        if self.backend is None:
+            return _MISSING
+        value = self.backend.get((self.namespace, key), _MISSING)
+        if value is not _MISSING:
+            self._store(key, value, estimate_size(value))
+        return value
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        if self.backend is not None and size <= self.max_bytes:
+            self.backend.set((self.namespace, key), value)
+        self._store(key, value, size)
+        return value
+
+    def _store(self, key, value, size):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            # A value larger than the whole budget is returned but never stored.
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size, time.monotonic() + self.ttl)
+            self._bytes += size
+            self._evict()
+
+    def get_or_compute(self, key, builder, *args, **kwargs):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.put(key, builder(*args, **kwargs))
+        return value
+
+    def invalidate(self, selected_property=None, view=None, before_version=None):
+        """Drop entries matching every given filter; no filters clears the cache."""
+        with self._lock:
+            for key in list(self._entries):
+                entry_property, entry_view, _, entry_version = key
+                if selected_property is not None and entry_property != selected_property:
+                    continue
+                if view is not None and entry_view != view:
+                    continue
+                if before_version is not None and entry_version >= before_version:
+                    continue
+                self._drop(key)
+
+    def sync_version(self, data_version):
+        # Entries computed against older data can never be hit again; drop them.
+        with self._lock:
+            if data_version != self.data_version:
+                self.invalidate(before_version=data_version)
+                self.data_version = data_version
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "shared_hits": self.shared_hits,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+
+_MISSING = object()
+
+# Shared by every session served by this process, and by every worker
+# when a shared cache is configured
+result_cache = ResultCache(backend=get_shared_cache(), namespace="results")
+
+# Serialized Plotly figure specs, keyed like result_cache entries with the
+# chart name in the "view" slot
+figure_cache = ResultCache(max_entries=256, backend=get_shared_cache(), namespace="figures")
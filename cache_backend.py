@@ -0,0 +1,136 @@
+"""SQLite-backed cache shared by every app worker on the machine.
+
+When several Streamlit workers serve the dashboard (see ``serve.py``), each
+keeps its own in-memory result cache, figure cache and snapshots. Setting
+``PROPERTYPULSE_SHARED_CACHE`` to a file path adds this store behind them:
+a value one worker computes is pickled into the file, and any other worker
+that misses locally loads it instead of recomputing it.
+
+Keys carry the store's data version, as in-memory keys do, so an entry can
+only be found by a worker looking at the same data. Stale entries are never
+hit again; they age out by TTL or are trimmed, oldest first, once the file
+holds more than ``max_bytes`` of values.
+
+The database runs in WAL mode, so readers do not block the single writer.
+Each thread uses its own connection.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+SHARED_CACHE_PATH = os.environ.get("PROPERTYPULSE_SHARED_CACHE")
+SHARED_CACHE_TTL = float(os.environ.get("PROPERTYPULSE_SHARED_CACHE_TTL", 3600))
+SHARED_CACHE_MAX_BYTES = int(float(os.environ.get("PROPERTYPULSE_SHARED_CACHE_MAX_MB", 2048)) * 1024 * 1024)
+# Check the size budget after this many writes rather than on every one
+TRIM_EVERY = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+class SQLiteCache:
+    def __init__(self, path, ttl=SHARED_CACHE_TTL, max_bytes=SHARED_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().execute(SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _key(key):
+        # Keys are tuples of strings, numbers and None, whose repr is stable
+        return repr(key)
+
+    def get(self, key, default=None):
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (self._key(key), time.time())
+            ).fetchone()
+            value = pickle.loads(row[0]) if row is not None else None
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # A shared cache that cannot be read is a miss, never an error in the view
+            self.stats["errors"] += 1
+            row = None
+        if row is None:
+            self.stats["misses"] += 1
+            return default
+        self.stats["hits"] += 1
+        return value
+
+    def set(self, key, value):
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(blob) > self.max_bytes:
+                return
+            now = time.time()
+            self._connection().execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, stored_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (self._key(key), blob, len(blob), now, now + self.ttl),
+            )
+        except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError):
+            self.stats["errors"] += 1
+            return
+        self.stats["writes"] += 1
+        with self._lock:
+            self._writes += 1
+            trim = self._writes % TRIM_EVERY == 0
+        if trim:
+            self.trim()
+
+    def trim(self):
+        """Drop expired entries, then the oldest ones until the values fit ``max_bytes``."""
+        connection = self._connection()
+        try:
+            connection.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                # Walk from the oldest entry, keeping a running total of what is removed
+                excess, cutoff = total - self.max_bytes, None
+                for stored_at, size in connection.execute(
+                        "SELECT stored_at, size FROM entries ORDER BY stored_at").fetchall():
+                    excess -= size
+                    cutoff = stored_at
+                    if excess <= 0:
+                        break
+                connection.execute("DELETE FROM entries WHERE stored_at <= ?", (cutoff,))
+        except sqlite3.Error:
+            self.stats["errors"] += 1
+
+    def clear(self):
+        self._connection().execute("DELETE FROM entries")
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """Process-wide shared cache, or None unless ``PROPERTYPULSE_SHARED_CACHE`` names a file."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None and SHARED_CACHE_PATH:
+            _shared_cache = SQLiteCache(SHARED_CACHE_PATH)
+        return _shared_cache
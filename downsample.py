@@ -0,0 +1,93 @@
+"""Server-side downsampling for time-series charts.
+
+Reduces a series to a point budget that matches the chart's pixel width
+while keeping its visual shape:
+
+* ``lttb_indices`` — Largest-Triangle-Three-Buckets for a single series.
+* ``minmax_indices`` — keeps each bucket's minimum and maximum of every
+  series, so several lines sharing one x axis keep their peaks and troughs.
+"""
+import os
+
+import numpy as np
+
+POINT_BUDGET = int(os.environ.get("PROPERTYPULSE_CHART_POINTS", 1000))
+
+
+def _bucket_bounds(n, n_buckets, first=0):
+    edges = np.linspace(first, n, n_buckets + 1).astype("int64")
+    return edges[:-1], edges[1:]
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the points Largest-Triangle-Three-Buckets keeps."""
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # First and last points are fixed; the rest is split into n_out - 2 buckets.
+    starts, stops = _bucket_bounds(n - 1, n_out - 2, first=1)
+    selected = np.empty(n_out, dtype="int64")
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i, (start, stop) in enumerate(zip(starts, stops)):
+        if i + 1 < len(starts):
+            next_x = x[starts[i + 1]:stops[i + 1]].mean()
+            next_y = y[starts[i + 1]:stops[i + 1]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Twice the triangle area formed with the previous pick and the next bucket's mean
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax_indices(values, n_buckets):
+    """Indices of every series' min and max per bucket; ``values`` is (n, series)."""
+    values = np.asarray(values, dtype="float64")
+    if values.ndim == 1:
+        values = values[:, None]
+    n = len(values)
+    if n == 0:
+        return np.arange(0)
+    n_buckets = max(1, min(n_buckets, n))
+
+    # Equal-width buckets, the last one padded, so each series reshapes to
+    # (buckets, width) and its extremes come from one argmin/argmax pass.
+    width = -(-n // n_buckets)
+    n_buckets = -(-n // width)
+    offsets = np.arange(n_buckets) * width
+    padding = n_buckets * width - n
+    picks = [np.array([0, n - 1])]
+    for column in values.T:
+        low = np.concatenate([column, np.full(padding, np.inf)]).reshape(n_buckets, width)
+        high = np.concatenate([column, np.full(padding, -np.inf)]).reshape(n_buckets, width)
+        picks.extend([offsets + low.argmin(axis=1), offsets + high.argmax(axis=1)])
+    return np.unique(np.concatenate(picks))
+
+
+def downsample_frame(data, y_columns, max_points=POINT_BUDGET, keep=None):
+    """Rows of ``data`` worth plotting within ``max_points``.
+
+    One series uses LTTB on row position; several use min/max bucketing so
+    all of them keep their extremes. Row positions in ``keep`` (e.g. the first
+    forecast row) are always retained.
+    """
+    n = len(data)
+    if n <= max_points:
+        return data
+
+    if len(y_columns) == 1:
+        rows = lttb_indices(np.arange(n), data[y_columns[0]].to_numpy(), max_points)
+    else:
+        rows = minmax_indices(data[y_columns].to_numpy(), max(1, max_points // (2 * len(y_columns))))
+    if keep is not None:
+        rows = np.union1d(rows, np.asarray(keep, dtype="int64"))
+    return data.iloc[rows]
@@ -0,0 +1,432 @@
+"""Bulk export of portfolio report packs.
+
+A pack covers any set of properties. Each registered section (ROI table,
+cost breakdown, energy savings, maintenance timeline) becomes one table in
+CSV and/or Parquet (when pyarrow is installed), and each property gets a one-page static report as PDF
+and/or PNG.
+
+Jobs run in the background so no session waits for them. A job's own
+thread hands properties to a thread pool, which builds their section frames
+through the same data helpers the views use. The job thread appends each
+property's frames to the open tables as they arrive. Parquet is written one
+row group per ``ROW_GROUP_ROWS`` rows and CSV is appended a chunk at a time,
+so a pack's tables are never held in memory whole. At most ``max_workers``
+x 2 properties are in flight. Reports are drawn with matplotlib in a
+spawn-based process pool, so rendering scales with cores rather than the
+GIL. Progress is read from the job while it runs, and the finished pack is
+zipped next to its directory.
+"""
+import importlib.util
+import itertools
+import json
+import math
+import os
+import re
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import get_context
+
+import numpy as np
+
+from telemetry_store import DATA_DIR
+
+EXPORT_DIR = os.environ.get("PROPERTYPULSE_EXPORT_DIR", os.path.join(os.path.dirname(DATA_DIR), "exports"))
+EXPORT_WORKERS = int(os.environ.get("PROPERTYPULSE_EXPORT_WORKERS", min(os.cpu_count() or 1, 8)))
+# Parquet rows buffered before a row group is written
+ROW_GROUP_ROWS = 65536
+# Finished jobs kept for progress lookups
+MAX_JOBS = 16
+
+TABLE_FORMATS = ["parquet", "csv"]
+REPORT_FORMATS = ["pdf", "png"]
+FORMATS = TABLE_FORMATS + REPORT_FORMATS
+DEFAULT_FORMATS = ["csv", "pdf"]
+# Parquet needs pyarrow, which is optional; without it tables are written as CSV
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+REPORT_SIZE = (11, 8.5)
+REPORT_DPI = 100
+REPORT_TIMELINE_ROWS = 12
+
+
+def _slug(name):
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(name)).strip("_").lower() or "property"
+
+
+# --- Tables -----------------------------------------------------------------
+
+class TableWriter:
+    """One section's table in each requested format, appended a frame at a time."""
+
+    def __init__(self, path, formats, row_group_rows=ROW_GROUP_ROWS):
+        self.path = path
+        self.formats = [fmt for fmt in formats if fmt in TABLE_FORMATS]
+        self.row_group_rows = row_group_rows
+        self.rows = 0
+        self._buffer = []
+        self._buffered = 0
+        self._parquet = None
+        self._schema = None
+        self._csv = None
+
+    def write(self, frame):
+        if frame is None or frame.empty:
+            return
+        self.rows += len(frame)
+        if "csv" in self.formats:
+            if self._csv is None:
+                self._csv = open(f"{self.path}.csv", "w", newline="", encoding="utf-8")
+                frame.to_csv(self._csv, index=False)
+            else:
+                frame.to_csv(self._csv, index=False, header=False)
+        if "parquet" in self.formats:
+            self._buffer.append(frame)
+            self._buffered += len(frame)
+            if self._buffered >= self.row_group_rows:
+                self._flush_parquet()
+
+    def _flush_parquet(self):
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._buffer:
+            return
+        frame = pd.concat(self._buffer, ignore_index=True)
+        self._buffer, self._buffered = [], 0
+        # Later chunks are cast to the first chunk's schema, e.g. sample integers to store floats
+        table = pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False)
+        if self._parquet is None:
+            self._schema = table.schema
+            self._parquet = pq.ParquetWriter(f"{self.path}.parquet", self._schema)
+        self._parquet.write_table(table)
+
+    def close(self):
+        """Flush and close; returns the files written."""
+        files = []
+        if self._csv is not None:
+            self._csv.close()
+            files.append(f"{self.path}.csv")
+        if "parquet" in self.formats:
+            self._flush_parquet()
+            if self._parquet is not None:
+                self._parquet.close()
+                files.append(f"{self.path}.parquet")
+        return files
+
+
+# --- Reports ----------------------------------------------------------------
+
+def plot_energy_savings(ax, data):
+    x = range(len(data))
+    ax.plot(x, data["standard"], color="#ff7300", label="Standard")
+    ax.plot(x, data["optimized"], color="#00C49F", label="Optimized")
+    forecast = np.flatnonzero(data["forecast"].to_numpy())
+    if len(forecast):
+        ax.axvline(forecast[0], color="grey", linestyle="--", linewidth=1)
+    step = max(len(data) // 6, 1)
+    ax.set_xticks(list(x)[::step], data["month"].iloc[::step], rotation=30, ha="right", fontsize=7)
+    ax.set_ylabel("Energy (kWh)")
+    ax.set_title(f"Energy Usage Optimization ({data['savings'].sum():,.0f} kWh saved)")
+    ax.legend(fontsize=7)
+
+
+def plot_cost_breakdown(ax, data):
+    ax.pie(data["share_pct"], labels=data["category"], autopct="%1.0f%%", textprops={"fontsize": 7})
+    ax.set_title("Cost Savings Distribution")
+
+
+def plot_roi(ax, data):
+    width = 0.4
+    years = data["year"].to_numpy()
+    ax.bar(years - width / 2, data["investment"], width, color="#E57373", label="Investment")
+    ax.bar(years + width / 2, data["returns"], width, color="#81C784", label="Returns")
+    ax.set_ylabel("Amount ($)")
+    ax.legend(fontsize=7, loc="upper left")
+    roi_axis = ax.twinx()
+    roi_axis.plot(years, data["cumulative_roi"], color="#5C6BC0", marker="o")
+    roi_axis.set_ylabel("ROI (%)")
+    ax.set_title("AI Technology Investment ROI Analysis")
+
+
+def plot_maintenance_timeline(ax, data):
+    ax.axis("off")
+    ax.set_title(f"Predicted Maintenance ({len(data):,} items)")
+    if data.empty:
+        ax.text(0.5, 0.5, "No maintenance predicted", ha="center", va="center")
+        return
+    rows = data.head(REPORT_TIMELINE_ROWS)
+    table = ax.table(cellText=rows[["task", "priority", "due_days"]].astype(str).values.tolist(),
+                     colLabels=["Task", "Priority", "Due (days)"], colWidths=[0.6, 0.2, 0.2],
+                     loc="upper center", cellLoc="left")
+    table.auto_set_font_size(False)
+    table.set_fontsize(7)
+
+
+REPORT_PLOTS = {
+    "energy_savings": plot_energy_savings,
+    "cost_breakdown": plot_cost_breakdown,
+    "roi": plot_roi,
+    "maintenance_timeline": plot_maintenance_timeline,
+}
+
+
+def render_report(path, title, frames, formats):
+    """Draw one property's report page and save it in each report format.
+
+    Runs in a worker process; uses the object-oriented Figure API, never
+    pyplot, so no GUI backend or global figure state is involved.
+    """
+    from matplotlib.figure import Figure
+
+    sections = [section for section in frames if section in REPORT_PLOTS]
+    fig = Figure(figsize=REPORT_SIZE)
+    columns = 2 if len(sections) > 1 else 1
+    rows = max(math.ceil(len(sections) / columns), 1)
+    axes = fig.subplots(rows, columns, squeeze=False).flatten()
+    for ax, section in zip(axes, sections):
+        REPORT_PLOTS[section](ax, frames[section])
+    for ax in axes[len(sections):]:
+        ax.axis("off")
+    fig.suptitle(title, fontsize=14)
+    fig.tight_layout(rect=(0, 0, 1, 0.95))
+
+    files = []
+    for fmt in formats:
+        fig.savefig(f"{path}.{fmt}", format=fmt, dpi=REPORT_DPI)
+        files.append(f"{path}.{fmt}")
+    return files
+
+
+# --- Jobs -------------------------------------------------------------------
+
+class ExportJob:
+    def __init__(self, job_id, properties, sections, formats, time_horizon, directory):
+        self.id = job_id
+        self.properties = list(properties)
+        self.sections = list(sections)
+        self.formats = list(formats)
+        self.time_horizon = time_horizon
+        self.directory = directory
+        self.archive = None
+        self.status = "queued"
+        self.completed = 0
+        self.rows = {}
+        self.files = []
+        self.errors = []
+        self.started_at = None
+        self.finished_at = None
+        self._cancelled = threading.Event()
+
+    @property
+    def total(self):
+        return len(self.properties)
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def progress(self):
+        elapsed = ((self.finished_at or time.time()) - self.started_at) if self.started_at else 0.0
+        return {
+            "id": self.id,
+            "status": self.status,
+            "completed": self.completed,
+            "total": self.total,
+            "fraction": self.completed / self.total if self.total else 1.0,
+            "elapsed": elapsed,
+            "rows": dict(self.rows),
+            "files": len(self.files),
+            "errors": list(self.errors),
+            "archive": self.archive,
+        }
+
+
+class Exporter:
+    def __init__(self, directory=EXPORT_DIR, max_workers=EXPORT_WORKERS):
+        self.directory = directory
+        self.max_workers = max(max_workers, 1)
+        self._builders = {}
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="export")
+        self._ids = itertools.count(1)
+
+    def register(self, section, builder, per_property=True):
+        """``builder(selected_property, time_horizon)`` returns the section's frame.
+
+        A section that is not per property (e.g. the portfolio ROI table) is
+        built once per job and shown on every property's report.
+        """
+        self._builders[section] = (builder, per_property)
+
+    @property
+    def sections(self):
+        return list(self._builders)
+
+    def submit(self, properties, sections=None, formats=DEFAULT_FORMATS, time_horizon=5):
+        sections = [s for s in (sections or self.sections) if s in self._builders]
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"unknown export formats: {sorted(unknown)}")
+        errors = []
+        if "parquet" in formats and not PARQUET_AVAILABLE:
+            formats = list(dict.fromkeys("csv" if fmt == "parquet" else fmt for fmt in formats))
+            errors.append("parquet: pyarrow is not installed, tables were written as CSV instead")
+        job_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{next(self._ids)}"
+        job = ExportJob(job_id, properties, sections, formats, time_horizon, os.path.join(self.directory, job_id))
+        job.errors.extend(errors)
+        with self._lock:
+            self._jobs[job_id] = job
+            for old in [j for j in self._jobs.values() if j.done][:-MAX_JOBS]:
+                self._jobs.pop(old.id)
+        threading.Thread(target=self._run, args=(job,), name=f"export-{job_id}", daemon=True).start()
+        return job
+
+    def job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _property_frames(self, job, property_name):
+        frames = {}
+        for section in job.sections:
+            builder, per_property = self._builders[section]
+            if per_property:
+                frame = builder(property_name, job.time_horizon)
+                if "property" not in frame:
+                    frame.insert(0, "property", property_name)
+                frames[section] = frame
+        return frames
+
+    def _run(self, job):
+        job.status = "running"
+        job.started_at = time.time()
+        report_formats = [fmt for fmt in job.formats if fmt in REPORT_FORMATS]
+        try:
+            os.makedirs(os.path.join(job.directory, "reports"), exist_ok=True)
+            writers = {section: TableWriter(os.path.join(job.directory, section), job.formats)
+                       for section in job.sections}
+            # Portfolio-wide sections are built and written once
+            shared = {}
+            for section in job.sections:
+                builder, per_property = self._builders[section]
+                if not per_property:
+                    shared[section] = builder(None, job.time_horizon)
+                    writers[section].write(shared[section])
+
+            renderer = (ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context("spawn"))
+                        if report_formats else None)
+            try:
+                self._export_properties(job, writers, shared, renderer, report_formats)
+            finally:
+                if renderer is not None:
+                    renderer.shutdown(cancel_futures=True)
+            for section, writer in writers.items():
+                job.files.extend(writer.close())
+                job.rows[section] = writer.rows
+            self._write_manifest(job)
+            job.archive = self._archive(job)
+            job.status = "cancelled" if job._cancelled.is_set() else "done"
+        except Exception as exc:
+            job.errors.append(f"export: {exc!r}")
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _export_properties(self, job, writers, shared, renderer, report_formats):
+        window = self.max_workers * 2
+        building = deque()  # (index, property, future) in submission order
+        rendering = {}  # future -> property
+        properties = iter(enumerate(job.properties))
+
+        def finish_renders(block):
+            if not rendering:
+                return
+            done, _ = wait(list(rendering), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = rendering.pop(future)
+                try:
+                    job.files.extend(future.result())
+                except Exception as exc:
+                    job.errors.append(f"{name}: report: {exc!r}")
+                job.completed += 1
+
+        while not job._cancelled.is_set():
+            # Keep the pool busy without holding more than `window` properties' frames
+            while len(building) < window:
+                item = next(properties, None)
+                if item is None:
+                    break
+                index, name = item
+                building.append((index, name, self._pool.submit(self._property_frames, job, name)))
+            if not building:
+                break
+
+            index, name, future = building.popleft()
+            try:
+                frames = future.result()
+            except Exception as exc:
+                job.errors.append(f"{name}: {exc!r}")
+                job.completed += 1
+                continue
+            for section, frame in frames.items():
+                writers[section].write(frame)
+
+            if renderer is None:
+                job.completed += 1
+                continue
+            while len(rendering) >= window:
+                finish_renders(block=True)
+            path = os.path.join(job.directory, "reports", f"{index + 1:04d}_{_slug(name)}")
+            report = {section: frames.get(section, shared.get(section)) for section in job.sections}
+            rendering[renderer.submit(render_report, path, name, report, report_formats)] = name
+            finish_renders(block=False)
+
+        for _, _, future in building:
+            future.cancel()
+        while rendering and not job._cancelled.is_set():
+            finish_renders(block=True)
+
+    def _write_manifest(self, job):
+        path = os.path.join(job.directory, "manifest.json")
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({
+                "id": job.id,
+                "properties": job.properties,
+                "sections": job.sections,
+                "formats": job.formats,
+                "time_horizon": job.time_horizon,
+                "rows": job.rows,
+                "files": [os.path.relpath(f, job.directory) for f in job.files],
+                "errors": job.errors,
+            }, handle, indent=2)
+        job.files.append(path)
+
+    def _archive(self, job):
+        # Parquet, PDF and PNG are compressed already; only text files are deflated
+        path = f"{job.directory}.zip"
+        with zipfile.ZipFile(path, "w") as archive:
+            for file in job.files:
+                compression = zipfile.ZIP_DEFLATED if file.endswith((".csv", ".json")) else zipfile.ZIP_STORED
+                archive.write(file, os.path.join(job.id, os.path.relpath(file, job.directory)),
+                              compress_type=compression)
+        return path
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    """Process-wide exporter; views register section builders on it."""
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = Exporter()
+        return _exporter
@@ -0,0 +1,108 @@
+"""Paginated feeds over alerts and predicted maintenance.
+
+A ``FeedIndex`` keeps one row per item as column arrays, sorted by priority
+and then by due date. Property and priority filters are resolved against
+precomputed ranges of that order: each property has its rows in feed
+order, and within them each priority is one contiguous run. A page
+therefore costs the same whether the feed holds ten items or a hundred
+thousand. Only the rows on the requested page are turned into item dicts,
+through the ``describe`` callback the index was built with.
+"""
+import math
+
+import numpy as np
+
+from telemetry_store import ALL_PROPERTIES
+
+PRIORITIES = ["High", "Medium", "Low"]
+PAGE_SIZE = 10
+
+
+class FeedIndex:
+    def __init__(self, property_codes, property_names, priority_ranks, due_days, keys, describe, scoped=True):
+        """Rows are given as parallel arrays; ``describe(keys)`` returns their item dicts.
+
+        ``priority_ranks`` index ``PRIORITIES``. Rows with equal priority and
+        due date keep the order they were given in. An unscoped feed (e.g.
+        sample data) shows every item whichever property is asked for.
+        """
+        property_codes = np.asarray(property_codes, dtype="int64")
+        ranks = np.asarray(priority_ranks, dtype="int64")
+        due_days = np.asarray(due_days, dtype="int64")
+        order = np.lexsort((due_days, ranks))
+
+        self.property_names = list(property_names)
+        self.keys = np.asarray(keys)[order]
+        self.describe = describe
+        self.scoped = scoped
+        self._ranks = ranks[order]
+        self._groups = {ALL_PROPERTIES: self._group(np.arange(len(order)))}
+        codes = property_codes[order]
+        by_property = np.argsort(codes, kind="stable")
+        boundaries = np.flatnonzero(np.diff(codes[by_property])) + 1
+        for positions in np.split(by_property, boundaries) if len(by_property) else []:
+            self._groups[self.property_names[codes[positions[0]]]] = self._group(positions)
+
+    @classmethod
+    def from_items(cls, items, scoped=True):
+        """Index a list of item dicts with "property", "priority" and "due_days" keys."""
+        names = list(dict.fromkeys(item["property"] for item in items))
+        return cls(
+            [names.index(item["property"]) for item in items],
+            names,
+            [PRIORITIES.index(item["priority"]) for item in items],
+            [item["due_days"] for item in items],
+            np.arange(len(items)),
+            lambda keys: [items[k] for k in keys],
+            scoped,
+        )
+
+    def _group(self, positions):
+        # Feed positions of one property, plus where each priority's run starts
+        starts = np.searchsorted(self._ranks[positions], np.arange(len(PRIORITIES) + 1))
+        return positions, starts
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _lookup(self, property_name):
+        return self._groups.get(property_name if self.scoped else ALL_PROPERTIES)
+
+    def counts(self, property_name=ALL_PROPERTIES):
+        """Items per priority for one property."""
+        group = self._lookup(property_name)
+        if group is None:
+            return dict.fromkeys(PRIORITIES, 0)
+        starts = group[1]
+        return {name: int(starts[i + 1] - starts[i]) for i, name in enumerate(PRIORITIES)}
+
+    def page(self, property_name=ALL_PROPERTIES, priorities=None, page=1, page_size=PAGE_SIZE):
+        """One page of items, with the filtered total and page count.
+
+        ``page`` is 1-based and clamped to the pages available.
+        """
+        group = self._lookup(property_name)
+        selected = PRIORITIES if priorities is None else priorities
+        if group is None:
+            runs = []
+        else:
+            positions, starts = group
+            runs = [(positions, starts[i], starts[i + 1]) for i, name in enumerate(PRIORITIES) if name in selected]
+        total = int(sum(end - start for _, start, end in runs))
+        pages = max(math.ceil(total / page_size), 1)
+        page = min(max(page, 1), pages)
+
+        # Walk the selected runs to the page's offset and take up to page_size rows
+        skip, wanted, rows = (page - 1) * page_size, page_size, []
+        for positions, start, end in runs:
+            if skip >= end - start:
+                skip -= end - start
+                continue
+            take = positions[start + skip:min(end, start + skip + wanted)]
+            rows.append(take)
+            wanted -= len(take)
+            skip = 0
+            if not wanted:
+                break
+        keys = self.keys[np.concatenate(rows)] if rows else self.keys[:0]
+        return {"items": self.describe(keys), "total": total, "page": page, "pages": pages}
@@ -0,0 +1,120 @@
+"""Lazily evaluated forecasts for the dashboard's "future" rows.
+
+Each series is fitted once with Holt's damped-trend exponential smoothing.
+After that, the forecast is just the fitted level and trend projected
+forward. ``LazyForecast`` only generates as many periods as have been
+requested so far and keeps them, so moving the Time Horizon slider down
+slices existing values and moving it up extends them from where they
+stopped.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Smoothing settings per kind of series
+SETTINGS = {
+    "energy": {"alpha": 0.5, "beta": 0.2, "damping": 0.7, "floor": 0.0},
+    "maintenance": {"alpha": 0.5, "beta": 0.2, "damping": 0.8, "floor": 0.0},
+    "tenant_satisfaction": {"alpha": 0.6, "beta": 0.4, "damping": 0.6, "floor": 0.0, "ceiling": 100.0},
+}
+
+
+def fit_holt(history, alpha, beta):
+    """Final level and trend of Holt's linear smoothing over ``history``."""
+    history = np.asarray(history, dtype="float64")
+    if len(history) == 0:
+        return 0.0, 0.0
+    level = history[0]
+    # Start from the average step so one noisy first step does not set the trend
+    trend = (history[-1] - history[0]) / (len(history) - 1) if len(history) > 1 else 0.0
+    for value in history[1:]:
+        previous_level = level
+        level = alpha * value + (1 - alpha) * (level + trend)
+        trend = beta * (level - previous_level) + (1 - beta) * trend
+    return level, trend
+
+
+class LazyForecast:
+    def __init__(self, history, alpha=0.5, beta=0.3, damping=0.9, floor=None, ceiling=None):
+        self.level, self.trend = fit_holt(history, alpha, beta)
+        self.damping = damping
+        self.floor = floor
+        self.ceiling = ceiling
+        self._values = np.empty(0)
+
+    def __len__(self):
+        return len(self._values)
+
+    def take(self, periods):
+        """First ``periods`` forecast values, generating only the missing tail."""
+        have = len(self._values)
+        if periods > have:
+            steps = np.arange(have + 1, periods + 1)
+            # Damped trend: h steps ahead adds trend * (phi + phi^2 + ... + phi^h)
+            if self.damping == 1:
+                damped = steps.astype("float64")
+            else:
+                damped = self.damping * (1 - self.damping ** steps) / (1 - self.damping)
+            tail = self.level + self.trend * damped
+            if self.floor is not None or self.ceiling is not None:
+                tail = np.clip(tail, self.floor, self.ceiling)
+            self._values = np.concatenate([self._values, tail])
+        return self._values[:periods]
+
+
+class ForecastPipeline:
+    """Process-wide registry of lazy forecasts keyed by series identity.
+
+    Keys should include the data version of the history so a forecast is
+    refitted when new readings arrive.
+    """
+
+    def __init__(self, max_series=4096):
+        self.max_series = max_series
+        self._forecasts = {}
+        self._lock = threading.Lock()
+
+    def forecast(self, key, history, periods, **settings):
+        with self._lock:
+            forecast = self._forecasts.get(key)
+            if forecast is None:
+                if len(self._forecasts) >= self.max_series:
+                    # Dicts keep insertion order; drop the oldest series.
+                    self._forecasts.pop(next(iter(self._forecasts)))
+                forecast = self._forecasts[key] = LazyForecast(history, **settings)
+            return forecast.take(periods)
+
+    def generated_periods(self, key):
+        with self._lock:
+            forecast = self._forecasts.get(key)
+            return len(forecast) if forecast is not None else 0
+
+
+def forecast_frame(history, kind, key, periods, columns, period_column="period", pipeline=None):
+    """Append ``periods`` forecast rows after ``history``.
+
+    ``history`` must have a pandas Period column; the new rows continue its
+    frequency, carry forecasts for ``columns`` and are flagged ``future``.
+    Other numeric columns are zero in the future rows.
+    """
+    pipeline = pipeline or forecast_pipeline
+    history = history.assign(future=False)
+    if periods <= 0 or history.empty:
+        return history
+
+    last = history[period_column].iloc[-1]
+    future = pd.DataFrame({period_column: pd.period_range(last + 1, periods=periods, freq=last.freq)})
+    for column in history.columns:
+        if column in columns:
+            values = pipeline.forecast(key + (column,), history[column].to_numpy(), periods, **SETTINGS[kind])
+            if history[column].dtype.kind in "iu":
+                values = np.rint(values)
+            future[column] = values.astype(history[column].dtype)
+        elif column not in (period_column, "future"):
+            future[column] = np.zeros(periods, dtype=history[column].dtype) if history[column].dtype.kind in "iuf" else None
+    future["future"] = True
+    return pd.concat([history, future[history.columns]], ignore_index=True)
+
+
+forecast_pipeline = ForecastPipeline()
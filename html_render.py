@@ -0,0 +1,105 @@
+"""HTML for the dashboard's metric cards, alert lists and timelines.
+
+Every card or list item is rendered from a template compiled once at import,
+with every value HTML-escaped. A view joins a whole group (a row of cards,
+all alerts, the maintenance timeline) into one markup string and writes it
+with a single ``st.markdown`` call, so the group is one element and one
+delta message however many items it holds.
+
+Markup is emitted on one line: Markdown ends an HTML block at a blank line
+and treats indented lines as code, so multi-line templates would break up.
+"""
+import html
+from string import Template
+
+# Lists longer than this scroll inside a fixed-height box
+SCROLL_AFTER = 8
+
+PRIORITY_CLASSES = {"High": "alert-high", "Medium": "alert-medium", "Low": "alert-low"}
+SEVERITY_COLORS = {"High": "tomato", "Medium": "orange", "Low": "dodgerblue"}
+
+METRIC_CARD = Template('<div class="card"><p class="metric-label">$label</p>'
+                       '<p class="metric-value">$value</p>$notes</div>')
+INFO_CARD = Template('<div class="card"><h3>$title</h3>$value$notes</div>')
+ALERT = Template('<div class="$css_class"><strong>$property:</strong> $issue'
+                 '<span style="float: right; font-weight: 600;">$priority</span></div>')
+TIMELINE_ITEM = Template(
+    '<div class="card" style="margin-bottom: 0.5rem; border-left: 4px solid $color;">'
+    '<div style="display: flex; justify-content: space-between;">'
+    '<div><h3>$task</h3><p>Location: $property</p>$schedule</div>'
+    '<div><p style="font-weight: 600; color: $color;">$severity</p><p>Due in: $due</p></div>'
+    '</div></div>'
+)
+INNOVATION_CARD = Template('<div class="innovation-card"><h3>$name</h3><p>$description</p>'
+                           '<span class="innovation-year">Estimated $year</span></div>')
+GRID = Template('<div class="card-grid" style="grid-template-columns: repeat($columns, minmax(0, 1fr));">'
+                '$items</div>')
+STACK = Template('<div class="$css_class">$items</div>')
+
+
+def escape(value):
+    return html.escape(str(value))
+
+
+def _paragraphs(notes):
+    return "".join(f"<p>{escape(note)}</p>" for note in notes)
+
+
+def metric_card(label, value, *notes):
+    return METRIC_CARD.substitute(label=escape(label), value=escape(value), notes=_paragraphs(notes))
+
+
+def info_card(title, value=None, *notes):
+    """Card with a heading, an optional large value and any number of note lines."""
+    value = "" if value is None else f'<p class="metric-value">{escape(value)}</p>'
+    return INFO_CARD.substitute(title=escape(title), value=value, notes=_paragraphs(notes))
+
+
+def alert_item(alert):
+    return ALERT.substitute(
+        css_class=PRIORITY_CLASSES.get(alert["priority"], "alert-low"),
+        property=escape(alert["property"]),
+        issue=escape(alert["issue"]),
+        priority=escape(alert["priority"]),
+    )
+
+
+def _schedule_line(item):
+    # Technician assignment from the maintenance scheduler, when the item has one
+    if "technician" not in item:
+        return ""
+    if item["technician"] is None:
+        return "<p>Scheduled: not within the planning horizon</p>"
+    late = " (after predicted failure)" if item["late"] else ""
+    return f'<p>Scheduled: {escape(item["scheduled"])} · {escape(item["technician"])}{late}</p>'
+
+
+def timeline_item(item):
+    return TIMELINE_ITEM.substitute(
+        color=SEVERITY_COLORS.get(item["priority"], "dodgerblue"),
+        task=escape(item["task"]),
+        property=escape(item["property"]),
+        schedule=_schedule_line(item),
+        severity=escape(item["priority"]),
+        due=f'{int(item["due_days"]):,} days',
+    )
+
+
+def innovation_card(innovation):
+    return INNOVATION_CARD.substitute(
+        name=escape(innovation["name"]),
+        description=escape(innovation["description"]),
+        year=escape(innovation["year"]),
+    )
+
+
+def grid(items, columns):
+    """Cards side by side, ``columns`` per row, as one block."""
+    return GRID.substitute(columns=int(columns), items="".join(items))
+
+
+def stack(items, scroll_after=SCROLL_AFTER):
+    """Items one below the other as one block; long lists scroll."""
+    items = list(items)
+    css_class = "card-stack scroll-list" if len(items) > scroll_after else "card-stack"
+    return STACK.substitute(css_class=css_class, items="".join(items))
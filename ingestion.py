@@ -0,0 +1,344 @@
+"""Streaming ingestion of meter and sensor readings into the telemetry store.
+
+Sources push newline-delimited JSON readings such as::
+
+    {"dataset": "energy", "property": "Whole Foods", "timestamp": "2025-05-01T00:15:00",
+     "meter_id": 3, "standard": 12.5, "optimized": 10.1}
+
+onto a bounded queue. A single consumer thread copies them into fixed-size
+per-(dataset, property) NumPy buffers, and when a buffer fills or the flush
+interval passes, sums it into time buckets and appends the buckets to the
+store. Everything runs on daemon threads, so the Streamlit script thread
+never waits on a source or on disk.
+"""
+import fnmatch
+import json
+import logging
+import os
+import queue
+import socketserver
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from telemetry_store import SCHEMAS, get_store
+
+BUFFER_SIZE = int(os.environ.get("PROPERTYPULSE_INGEST_BUFFER", 4096))
+FLUSH_INTERVAL = float(os.environ.get("PROPERTYPULSE_INGEST_FLUSH_SECONDS", 5))
+BUCKET_SECONDS = int(os.environ.get("PROPERTYPULSE_INGEST_BUCKET_SECONDS", 15 * 60))
+
+logger = logging.getLogger(__name__)
+
+# Column identifying the device a reading came from, per dataset
+ID_COLUMNS = {
+    "energy": "meter_id",
+    "maintenance": "equipment_id",
+    "sensors": "equipment_id",
+    "tenant_surveys": "unit_id",
+    "cost_lines": "category_id",
+}
+
+# Consumption, event counts and costs add up within a bucket; sensor channels
+# and survey scores are averaged
+MEAN_DATASETS = {"sensors", "tenant_surveys"}
+
+
+# --- Sources -----------------------------------------------------------------
+
+class QueueBroker:
+    """In-process publish/subscribe broker standing in for MQTT.
+
+    Topics are slash-separated strings; subscriptions accept shell-style
+    wildcards, e.g. ``"buildings/*/energy"``.
+    """
+
+    def __init__(self):
+        self._subscriptions = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, pattern, callback):
+        with self._lock:
+            self._subscriptions.append((pattern, callback))
+
+    def publish(self, topic, payload):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for pattern, callback in subscriptions:
+            if fnmatch.fnmatchcase(topic, pattern):
+                callback(payload)
+
+
+class BrokerSource:
+    def __init__(self, broker, pattern="#"):
+        self.broker = broker
+        self.pattern = "*" if pattern == "#" else pattern
+
+    def start(self, emit, stop_event):
+        self.broker.subscribe(self.pattern, emit)
+
+
+class FileTailSource:
+    """Follows a file like ``tail -f``, emitting each complete line."""
+
+    def __init__(self, path, poll_interval=0.5, from_start=False):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.from_start = from_start
+
+    def start(self, emit, stop_event):
+        thread = threading.Thread(target=self._run, args=(emit, stop_event), name="ingest-tail", daemon=True)
+        thread.start()
+
+    def _run(self, emit, stop_event):
+        while not os.path.exists(self.path):
+            if stop_event.wait(self.poll_interval):
+                return
+
+        with open(self.path) as f:
+            if not self.from_start:
+                f.seek(0, os.SEEK_END)
+            partial = ""
+            while not stop_event.is_set():
+                chunk = f.readline()
+                if not chunk:
+                    stop_event.wait(self.poll_interval)
+                    continue
+                partial += chunk
+                if partial.endswith("\n"):
+                    emit(partial)
+                    partial = ""
+
+
+class SocketSource:
+    """Accepts TCP connections on a local port and emits each line received."""
+
+    def __init__(self, host="127.0.0.1", port=7878):
+        self.host = host
+        self.port = port
+        self.server = None
+
+    def start(self, emit, stop_event):
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if stop_event.is_set():
+                        break
+                    emit(line.decode("utf-8", errors="replace"))
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="ingest-socket", daemon=True).start()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+# --- Buffering and downsampling -------------------------------------------------
+
+class ReadingBuffer:
+    """Fixed-capacity columnar buffer for one (dataset, property)."""
+
+    def __init__(self, dataset, capacity=BUFFER_SIZE):
+        self.dataset = dataset
+        self.capacity = capacity
+        self.columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in SCHEMAS[dataset].items()}
+        self.size = 0
+        self.first_added = None
+
+    @property
+    def full(self):
+        return self.size >= self.capacity
+
+    def add(self, reading):
+        if self.size == 0:
+            self.first_added = time.monotonic()
+        for name, column in self.columns.items():
+            column[self.size] = reading[name]
+        self.size += 1
+
+    def drain(self):
+        rows = {name: column[:self.size].copy() for name, column in self.columns.items()}
+        self.size = 0
+        self.first_added = None
+        return rows
+
+
+def downsample(dataset, columns, bucket_seconds=BUCKET_SECONDS):
+    """Sum (or, for sensor channels, average) readings into fixed time buckets per device."""
+    id_column = ID_COLUMNS[dataset]
+    timestamps = columns["timestamp"].astype("datetime64[s]").astype("int64")
+    buckets = timestamps // bucket_seconds * bucket_seconds
+    keys = np.stack([buckets, columns[id_column].astype("int64")], axis=1)
+    unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    result = {
+        "timestamp": unique_keys[:, 0].astype("datetime64[s]"),
+        id_column: unique_keys[:, 1],
+    }
+    counts = np.bincount(inverse, minlength=len(unique_keys))
+    for name in SCHEMAS[dataset]:
+        if name not in result:
+            result[name] = np.bincount(inverse, weights=columns[name], minlength=len(unique_keys))
+            if dataset in MEAN_DATASETS:
+                result[name] /= counts
+    return result
+
+
+# --- Pipeline ----------------------------------------------------------------
+
+class IngestionPipeline:
+    def __init__(self, store, sources, buffer_size=BUFFER_SIZE, flush_interval=FLUSH_INTERVAL,
+                 bucket_seconds=BUCKET_SECONDS, queue_size=100_000):
+        self.store = store
+        self.sources = list(sources)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.bucket_seconds = bucket_seconds
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._buffers = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = defaultdict(int)
+        self.last_flush = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ingest-consumer", daemon=True)
+        self._thread.start()
+        for source in self.sources:
+            source.start(self.emit, self._stop)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for source in self.sources:
+            if hasattr(source, "stop"):
+                source.stop()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def emit(self, message):
+        # Called from source threads; drops (and counts) readings when the
+        # consumer is too far behind rather than blocking the source.
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def _parse(self, message):
+        reading = json.loads(message) if isinstance(message, (str, bytes)) else dict(message)
+        if not isinstance(reading, dict):
+            raise ValueError(f"Reading is not a JSON object: {message!r:.80}")
+        dataset = reading.pop("dataset", "energy")
+        if dataset not in SCHEMAS:
+            raise ValueError(f"Unknown dataset: {dataset}")
+        property_name = reading.pop("property")
+        reading["timestamp"] = np.datetime64(reading["timestamp"], "s")
+        if np.isnat(reading["timestamp"]):
+            raise ValueError("Reading has no timestamp")
+        return dataset, property_name, reading
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                message = self._queue.get(timeout=min(self.flush_interval, 0.5))
+            except queue.Empty:
+                message = None
+
+            if message is not None and not (isinstance(message, str) and not message.strip()):
+                self._consume(message)
+            self._flush_due()
+
+    def _consume(self, message):
+        try:
+            dataset, property_name, reading = self._parse(message)
+            key = (dataset, property_name)
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = ReadingBuffer(dataset, self.buffer_size)
+            buffer.add(reading)
+        except (KeyError, ValueError, TypeError) as e:
+            self.stats["rejected"] += 1
+            self.stats["last_error"] = str(e)
+            return
+
+        self.stats["received"] += 1
+        if buffer.full:
+            self._flush_buffer(key, buffer)
+
+    def _flush_due(self):
+        now = time.monotonic()
+        for key, buffer in list(self._buffers.items()):
+            if buffer.size and now - buffer.first_added >= self.flush_interval:
+                self._flush_buffer(key, buffer)
+
+    def _flush_buffer(self, key, buffer):
+        # A batch the store refuses is counted and dropped; the consumer
+        # thread keeps going with the next one.
+        dataset, property_name = key
+        rows = buffer.drain()
+        try:
+            bucketed = downsample(dataset, rows, self.bucket_seconds)
+            self.store.append(dataset, property_name, bucketed)
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.stats["lost"] += len(rows["timestamp"])
+            self.stats["last_error"] = str(e)
+            logger.exception("Failed to write %d %s readings for %s", len(rows["timestamp"]), dataset, property_name)
+            return
+        self.stats["flushed"] += len(rows["timestamp"])
+        self.stats["buckets_written"] += len(bucketed["timestamp"])
+        self.last_flush = time.time()
+
+    def flush(self):
+        for key, buffer in list(self._buffers.items()):
+            if buffer.size:
+                self._flush_buffer(key, buffer)
+
+
+# Process-wide stand-in broker; publishers call broker.publish(topic, payload)
+broker = QueueBroker()
+
+
+def sources_from_env():
+    sources = []
+    topic = os.environ.get("PROPERTYPULSE_INGEST_TOPIC")
+    if topic:
+        sources.append(BrokerSource(broker, topic))
+    socket_address = os.environ.get("PROPERTYPULSE_INGEST_SOCKET")
+    if socket_address:
+        host, _, port = socket_address.rpartition(":")
+        sources.append(SocketSource(host or "127.0.0.1", int(port)))
+    tail_path = os.environ.get("PROPERTYPULSE_INGEST_FILE")
+    if tail_path:
+        sources.append(FileTailSource(tail_path))
+    return sources
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline():
+    """Process-wide pipeline built from the environment, or None if no source is configured."""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            sources = sources_from_env()
+            if not sources:
+                return None
+            _pipeline = IngestionPipeline(get_store(), sources).start()
+        return _pipeline
@@ -0,0 +1,370 @@
+"""Incremental predictive-maintenance scoring over rolling sensor windows.
+
+Each piece of equipment keeps a ring buffer of its last ``WINDOW`` sensor
+buckets. New readings overwrite the oldest slots and mark the equipment
+dirty, so an update only touches the window, never the history behind it.
+``score_pending`` scores dirty equipment in fixed-size batches with a
+scikit-learn classifier until its latency budget is used up; whatever is
+left stays dirty for the next call.
+"""
+import threading
+import time
+
+import numpy as np
+
+from feeds import FeedIndex
+from telemetry_store import ALL_PROPERTIES, get_store
+
+CHANNELS = ["temperature", "vibration", "power"]
+WINDOW = 96  # one day of 15-minute buckets
+MIN_READINGS = 8
+BATCH_SIZE = 4096
+BUDGET_SECONDS = 0.25
+
+EQUIPMENT_TYPES = [
+    "HVAC Compressor", "Chiller", "Elevator", "Boiler",
+    "Air Handler", "Water Pump", "Lighting Controller", "Rooftop Unit",
+]
+
+# Minimum failure probability for each alert priority, highest first
+PRIORITY_THRESHOLDS = (("High", 0.8), ("Medium", 0.5), ("Low", 0.3))
+# What the maintenance timeline schedules for each priority
+MAINTENANCE_ACTIONS = {"High": "Replacement", "Medium": "Repair", "Low": "Inspection"}
+
+
+def equipment_label(equipment_id):
+    return f"{EQUIPMENT_TYPES[equipment_id % len(EQUIPMENT_TYPES)]} #{equipment_id}"
+
+
+def priority_ranks(scores):
+    """Index into PRIORITY_THRESHOLDS of the highest priority each score reaches."""
+    thresholds = np.array([threshold for _, threshold in PRIORITY_THRESHOLDS])
+    return np.argmax(np.asarray(scores)[:, None] >= thresholds[None, :], axis=1)
+
+
+def due_days(scores):
+    """Days until the predicted failure: the likelier it is, the sooner."""
+    return np.clip(np.round(45 * (1 - np.asarray(scores))), 1, 60).astype("int64")
+
+
+def window_features(windows):
+    """Features for windows of shape (n, W, channels), oldest reading first.
+
+    Unfilled slots are NaN. Per channel: mean, standard deviation, deviation
+    of the latest reading from the mean and the least-squares change over the
+    window.
+    """
+    valid = ~np.isnan(windows)
+    n_valid = np.maximum(valid.sum(axis=1), 1)
+    filled = np.where(valid, windows, 0.0)
+
+    mean = filled.sum(axis=1) / n_valid
+    centered = np.where(valid, windows - mean[:, None, :], 0.0)
+    std = np.sqrt((centered ** 2).sum(axis=1) / n_valid)
+
+    last = windows[:, -1, :]
+    last = np.where(np.isnan(last), mean, last)
+
+    x = np.arange(windows.shape[1], dtype="float64")[None, :, None]
+    x_mean = (x * valid).sum(axis=1) / n_valid
+    x_centered = np.where(valid, x - x_mean[:, None, :], 0.0)
+    denominator = (x_centered ** 2).sum(axis=1)
+    slope = np.divide((x_centered * centered).sum(axis=1), denominator,
+                      out=np.zeros_like(denominator), where=denominator > 0)
+
+    return np.concatenate([mean, std, last - mean, slope * windows.shape[1]], axis=1)
+
+
+def synthetic_training_windows(n=4000, window=WINDOW, failure_rate=0.3, seed=7):
+    """Healthy equipment is stationary noise; failing equipment drifts upward."""
+    rng = np.random.default_rng(seed)
+    baseline = np.column_stack([rng.normal(70, 5, n), rng.normal(2, 0.5, n), rng.normal(15, 3, n)])
+    noise_scale = np.array([1.5, 0.2, 1.0])
+    windows = baseline[:, None, :] + rng.normal(0, 1, (n, window, len(CHANNELS))) * noise_scale
+
+    labels = rng.random(n) < failure_rate
+    ramp = np.linspace(0, 1, window)[None, :, None] ** rng.uniform(1, 3, (n, 1, 1))
+    drift = np.column_stack([rng.uniform(5, 20, n), rng.uniform(1, 4, n), rng.uniform(2, 6, n)])
+    windows[labels] += ramp[labels] * drift[labels][:, None, :]
+    return windows, labels.astype(int)
+
+
+def train_default_model(seed=7):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    windows, labels = synthetic_training_windows(seed=seed)
+    model = make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+    model.fit(window_features(windows), labels)
+    return model
+
+
+class MaintenanceScoringEngine:
+    def __init__(self, model, window=WINDOW, batch_size=BATCH_SIZE, budget_seconds=BUDGET_SECONDS):
+        self.model = model
+        self.window = window
+        self.batch_size = batch_size
+        self.budget_seconds = budget_seconds
+        self._lock = threading.RLock()
+        self._index = {}  # (property, equipment_id) -> row
+        self._property_names = []
+        self._size = 0
+        self._windows = self._head = self._count = None
+        self._property_code = self._equipment_id = self._dirty = self.scores = None
+        self.scored_version = 0  # bumped whenever scores change
+        self._feed = None  # (scored_version, FeedIndex)
+        self._store_version = None  # store version the windows reflect
+        self._allocate(1024)
+
+    def _allocate(self, capacity):
+        def grow(old, fill, shape=(), dtype="float64"):
+            new = np.full((capacity,) + shape, fill, dtype=dtype)
+            if old is not None:
+                new[:len(old)] = old
+            return new
+
+        self._windows = grow(self._windows, np.nan, (self.window, len(CHANNELS)), "float32")
+        self._head = grow(self._head, 0, dtype="int64")
+        self._count = grow(self._count, 0, dtype="int64")
+        self._property_code = grow(self._property_code, -1, dtype="int32")
+        self._equipment_id = grow(self._equipment_id, -1, dtype="int64")
+        self._dirty = grow(self._dirty, False, dtype="bool")
+        self.scores = grow(self.scores, np.nan)
+
+    def __len__(self):
+        return self._size
+
+    # --- Updates ------------------------------------------------------------
+
+    def _rows(self, property_name, equipment_ids):
+        if property_name not in self._property_names:
+            self._property_names.append(property_name)
+        code = self._property_names.index(property_name)
+
+        unique_ids, inverse = np.unique(equipment_ids, return_inverse=True)
+        unique_rows = np.empty(len(unique_ids), dtype="int64")
+        for i, equipment_id in enumerate(unique_ids.tolist()):
+            row = self._index.get((property_name, equipment_id))
+            if row is None:
+                if self._size == len(self._head):
+                    self._allocate(2 * len(self._head))
+                row = self._index[(property_name, equipment_id)] = self._size
+                self._property_code[row] = code
+                self._equipment_id[row] = equipment_id
+                self._size += 1
+            unique_rows[i] = row
+        return unique_rows[inverse.reshape(-1)]
+
+    def update(self, property_name, columns):
+        """Push sensor readings for one property into the rolling windows."""
+        if len(columns["timestamp"]) == 0:
+            return
+        with self._lock:
+            rows = self._rows(property_name, np.asarray(columns["equipment_id"]))
+            values = np.column_stack([np.asarray(columns[c], dtype="float32") for c in CHANNELS])
+
+            order = np.lexsort((np.asarray(columns["timestamp"]), rows))
+            rows, values = rows[order], values[order]
+
+            # Rank of each reading within its equipment's run; only the last
+            # `window` readings of a run can survive in the ring buffer.
+            starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+            lengths = np.diff(np.r_[starts, len(rows)])
+            rank = np.arange(len(rows)) - np.repeat(starts, lengths)
+            keep = rank >= np.repeat(lengths, lengths) - self.window
+            rows, values, rank = rows[keep], values[keep], rank[keep]
+
+            # Each round writes at most one reading per equipment, so the
+            # fancy-indexed writes never collide.
+            by_rank = np.argsort(rank, kind="stable")
+            boundaries = np.flatnonzero(np.diff(rank[by_rank])) + 1
+            for chunk in np.split(by_rank, boundaries):
+                chunk_rows = rows[chunk]
+                self._windows[chunk_rows, self._head[chunk_rows]] = values[chunk]
+                self._head[chunk_rows] = (self._head[chunk_rows] + 1) % self.window
+                self._count[chunk_rows] = np.minimum(self._count[chunk_rows] + 1, self.window)
+
+            self._dirty[np.unique(rows)] = True
+
+    def _ordered_windows(self, rows):
+        # Oldest reading first: unroll each ring buffer from its head
+        offsets = (self._head[rows, None] + np.arange(self.window)[None, :]) % self.window
+        return np.take_along_axis(self._windows[rows], offsets[:, :, None], axis=1).astype("float64")
+
+    # --- Scoring ------------------------------------------------------------
+
+    def score_pending(self, budget_seconds=None):
+        """Score dirty equipment in batches until the budget runs out.
+
+        Returns the number of equipment items scored.
+        """
+        budget = self.budget_seconds if budget_seconds is None else budget_seconds
+        deadline = time.perf_counter() + budget
+        scored = 0
+        with self._lock:
+            size = self._size
+            pending = np.flatnonzero(self._dirty[:size] & (self._count[:size] >= MIN_READINGS))
+            for start in range(0, len(pending), self.batch_size):
+                if start and time.perf_counter() > deadline:
+                    break
+                rows = pending[start:start + self.batch_size]
+                features = window_features(self._ordered_windows(rows))
+                self.scores[rows] = self.model.predict_proba(features)[:, 1]
+                self._dirty[rows] = False
+                scored += len(rows)
+            if scored:
+                self.scored_version += 1
+        return scored
+
+    def pending(self):
+        with self._lock:
+            return int(self._dirty[:self._size].sum())
+
+    def _property_mask(self, property_name):
+        size = self._size
+        if property_name in (None, ALL_PROPERTIES):
+            return np.ones(size, dtype=bool)
+        if property_name not in self._property_names:
+            return np.zeros(size, dtype=bool)
+        return self._property_code[:size] == self._property_names.index(property_name)
+
+    def expected_failures(self, property_name=ALL_PROPERTIES):
+        with self._lock:
+            return float(np.nansum(self.scores[:self._size][self._property_mask(property_name)]))
+
+    def _alert_rows(self, property_name=ALL_PROPERTIES):
+        # Rows above the lowest alert threshold, riskiest first
+        scores = self.scores[:self._size]
+        mask = self._property_mask(property_name) & (np.nan_to_num(scores) >= PRIORITY_THRESHOLDS[-1][1])
+        rows = np.flatnonzero(mask)
+        return rows[np.argsort(-scores[rows], kind="stable")]
+
+    def alerts(self, property_name=ALL_PROPERTIES, limit=None):
+        """Scored equipment above the lowest alert threshold, riskiest first."""
+        with self._lock:
+            rows = self._alert_rows(property_name)
+            return self.describe(rows if limit is None else rows[:limit])
+
+    def describe(self, rows):
+        """Alert dicts for engine rows, in the order given."""
+        with self._lock:
+            rows = np.asarray(rows, dtype="int64")
+            features = window_features(self._ordered_windows(rows)) if len(rows) else np.empty((0, 4 * len(CHANNELS)))
+            n = len(CHANNELS)
+            # The channel whose latest reading sits furthest above its window mean
+            deviation = features[:, 2 * n:3 * n] / np.maximum(features[:, n:2 * n], 1e-6)
+            drivers = np.argmax(deviation, axis=1) if len(rows) else []
+            scores = self.scores[rows]
+            priorities = priority_ranks(scores)
+            days = due_days(scores)
+
+            alerts = []
+            for row, driver, score, rank, due in zip(rows.tolist(), drivers, scores.tolist(), priorities.tolist(),
+                                                      days.tolist()):
+                priority = PRIORITY_THRESHOLDS[rank][0]
+                equipment = equipment_label(int(self._equipment_id[row]))
+                alerts.append({
+                    "property": self._property_names[self._property_code[row]],
+                    "issue": f"{equipment} predicted failure within {due} days ({CHANNELS[driver]} trending up)",
+                    "task": f"{equipment} {MAINTENANCE_ACTIONS[priority]}",
+                    "priority": priority,
+                    "score": score,
+                    "due_days": due,
+                    "equipment_id": int(self._equipment_id[row]),
+                })
+            return alerts
+
+    def alert_feed(self):
+        """Every alert across the portfolio as a FeedIndex, rebuilt only after scores change."""
+        with self._lock:
+            if self._feed is None or self._feed[0] != self.scored_version:
+                rows = self._alert_rows()
+                scores = self.scores[rows]
+                index = FeedIndex(self._property_code[rows], self._property_names, priority_ranks(scores),
+                                  due_days(scores), rows, self.describe)
+                self._feed = (self.scored_version, index)
+            return self._feed[1]
+
+    def maintenance_tasks(self):
+        """Every alert as task columns for the maintenance scheduler, keyed by engine row."""
+        with self._lock:
+            rows = self._alert_rows()
+            scores = self.scores[rows]
+            return {
+                "key": rows,
+                "property": self._property_code[rows],
+                "property_names": list(self._property_names),
+                "equipment": [EQUIPMENT_TYPES[i] for i in (self._equipment_id[rows] % len(EQUIPMENT_TYPES)).tolist()],
+                "priority": priority_ranks(scores),
+                "due_days": due_days(scores),
+            }
+
+    # --- Store wiring -------------------------------------------------------
+
+    def attach(self, store):
+        """Follow sensor appends to ``store`` and warm up from its latest month."""
+        def on_write(dataset, property_name, columns, version):
+            with self._lock:
+                if version <= self._store_version:
+                    return  # already read by catch_up
+                # Writes from other processes since the last one seen here
+                self._read_back(store, version - 1)
+                if dataset == "sensors" and property_name is not None:
+                    self.update(property_name, columns)
+                self._store_version = version
+
+        with self._lock:
+            self._store_version = store.version
+            store.add_listener(on_write)
+            for property_name in store.properties():
+                months = store.months("sensors", property_name)
+                if months:
+                    self.update(property_name,
+                                store.read("sensors", property_name, start=np.datetime64(months[-1], "s")))
+        return self
+
+    def catch_up(self, store):
+        """Push readings other processes appended to ``store`` since the windows were last updated.
+
+        Listeners only hear about writes made in this process. When the
+        store's version has moved past what they reported, the sensor
+        readings written by the versions in between are read back from the
+        store. Returns the number of readings pushed.
+        """
+        version = store.version
+        if version <= self._store_version:
+            return 0
+        with self._lock:
+            return self._read_back(store, version)
+
+    def _read_back(self, store, version):
+        # Push the sensor readings written after _store_version up to ``version``
+        if version <= self._store_version:
+            return 0
+        pushed = 0
+        for property_name in store.properties():
+            columns = store.read_since("sensors", property_name, self._store_version, version)
+            self.update(property_name, columns)
+            pushed += len(columns["timestamp"])
+        self._store_version = version
+        return pushed
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Process-wide engine, created once the store holds sensor readings."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            store = get_store()
+            if not store.has_data("sensors"):
+                return None
+            _engine = MaintenanceScoringEngine(train_default_model()).attach(store)
+        engine = _engine
+    # Only one app worker ingests; the others pick its readings up from the store
+    engine.catch_up(get_store())
+    return engine
@@ -0,0 +1,289 @@
+"""Opt-in profiling for the dashboard.
+
+Startup: set ``PROPERTYPULSE_PROFILE_STARTUP=1`` to record, for the lifetime
+of the process:
+
+* how long each module took to import the first time (including its own
+  dependencies), and which view's first render triggered it, and
+* how long each view took to paint the first time, both on its own and
+  counted from the first script run.
+
+The report is shown in the sidebar and, when ``PROPERTYPULSE_STARTUP_REPORT``
+names a file, written there as JSON after every first paint.
+
+Reruns: set ``PROPERTYPULSE_PROFILE_RENDER=1`` to record wall time,
+allocations and payload bytes for every step of every rerun and fragment
+rerun (dispatch, views, data generation, figure building, serialization
+and charts), and wall time for steps run by background threads. The last
+runs are shown in a sidebar debug panel and, when
+``PROPERTYPULSE_PROFILE_LOG`` names a file, appended there as JSON lines
+tagged with ``PROPERTYPULSE_RELEASE``.
+"""
+import builtins
+import contextvars
+import functools
+import itertools
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+STARTUP_PROFILING = os.environ.get("PROPERTYPULSE_PROFILE_STARTUP", "") not in ("", "0")
+STARTUP_REPORT = os.environ.get("PROPERTYPULSE_STARTUP_REPORT")
+
+
+class StartupProfile:
+    def __init__(self, enabled=False, report_path=None):
+        self.enabled = enabled
+        self.report_path = report_path
+        self.started = time.perf_counter()
+        self.imports = {}  # module -> {"seconds", "view"}
+        self.first_paint = {}  # view -> {"render_seconds", "since_start_seconds", "imports"}
+        self._view = None
+        self._lock = threading.Lock()
+
+    def record_import(self, name, seconds):
+        with self._lock:
+            if name not in self.imports:
+                self.imports[name] = {"seconds": seconds, "view": self._view}
+
+    @contextmanager
+    def view(self, name):
+        """Time ``name``'s first render; later renders pass straight through."""
+        if not self.enabled or name in self.first_paint:
+            yield
+            return
+        self._view = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._view = None
+            with self._lock:
+                self.first_paint[name] = {
+                    "render_seconds": end - start,
+                    "since_start_seconds": end - self.started,
+                    "imports": sorted(m for m, entry in self.imports.items() if entry["view"] == name),
+                }
+            self.write()
+
+    def report(self):
+        with self._lock:
+            imports = sorted(self.imports.items(), key=lambda item: -item[1]["seconds"])
+            return {
+                "imports": [{"module": name, **entry} for name, entry in imports],
+                "first_paint": dict(self.first_paint),
+            }
+
+    def write(self):
+        if self.report_path:
+            with open(self.report_path, "w") as f:
+                json.dump(self.report(), f, indent=2)
+
+
+startup_profile = StartupProfile(STARTUP_PROFILING, STARTUP_REPORT)
+
+_original_import = builtins.__import__
+_import_state = threading.local()
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # Only the outermost import of a module not loaded yet is timed, so each
+    # entry includes the cost of everything it pulled in.
+    if level or name in sys.modules or getattr(_import_state, "active", False):
+        return _original_import(name, globals, locals, fromlist, level)
+    _import_state.active = True
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _import_state.active = False
+        startup_profile.record_import(name, time.perf_counter() - start)
+
+
+def profile_startup():
+    """Start timing imports when startup profiling is enabled; safe to call on every rerun."""
+    if startup_profile.enabled and builtins.__import__ is not _timed_import:
+        builtins.__import__ = _timed_import
+
+
+# --- Render profiling -------------------------------------------------------
+
+RENDER_PROFILING = os.environ.get("PROPERTYPULSE_PROFILE_RENDER", "") not in ("", "0")
+RENDER_LOG = os.environ.get("PROPERTYPULSE_PROFILE_LOG")
+RELEASE = os.environ.get("PROPERTYPULSE_RELEASE", "dev")
+
+# State of the run the current script run or fragment rerun is recording.
+# Threads started by the app (snapshot workers, the scheduler) do not
+# inherit it, so their steps are recognised as background work.
+_current_run = contextvars.ContextVar("render_run", default=None)
+
+
+class RenderProfiler:
+    """Wall time, allocations and payload size per step of a rerun.
+
+    A run is one script run or fragment rerun, opened with ``run`` in the
+    script thread; steps inside it nest, and every step records its depth,
+    total and self time (total minus its child steps). Steps taken outside
+    a run, such as snapshot builds on worker threads, are kept apart as
+    background runs labelled with their thread, so they never show up as
+    the last rerun. Allocations come from ``tracemalloc``, which is started
+    on the first step and slows everything it traces, so profiling is
+    opt-in. Its peak is process-wide: a run that overlapped another
+    session's run gets no allocation figures rather than mixed ones, and
+    background steps are timed only. Finished runs are kept in memory for
+    the debug panel and appended to ``log_path`` as JSON lines.
+    """
+
+    def __init__(self, enabled=False, log_path=None, release=RELEASE, history=50):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.release = release
+        self.runs = deque(maxlen=history)
+        self.background = deque(maxlen=history)
+        self._local = threading.local()  # background steps, per thread
+        self._active = []  # state of every run in progress
+        self._lock = threading.Lock()
+        self._run_ids = itertools.count(1)
+
+    def _state(self):
+        state = _current_run.get()
+        if state is not None:
+            return state
+        if not hasattr(self._local, "state"):
+            self._local.state = {"stack": [], "records": [], "background": True, "concurrent": False}
+        return self._local.state
+
+    @contextmanager
+    def run(self, name, kind, **fields):
+        """Profile a script run or fragment rerun as one run; inside a run it is an ordinary step."""
+        if not self.enabled or _current_run.get() is not None:
+            with self.step(name, kind, **fields) as record:
+                yield record
+            return
+        state = {"stack": [], "records": [], "background": False, "concurrent": False}
+        with self._lock:
+            for other in self._active:
+                other["concurrent"] = state["concurrent"] = True
+            self._active.append(state)
+        token = _current_run.set(state)
+        try:
+            with self.step(name, kind, **fields) as record:
+                yield record
+        finally:
+            _current_run.reset(token)
+            with self._lock:
+                self._active.remove(state)
+
+    @contextmanager
+    def step(self, name, kind, **fields):
+        """Profile the enclosed block; callers may add fields (e.g. ``payload_bytes``) to the yielded record."""
+        if not self.enabled:
+            yield {}
+            return
+        state = self._state()
+        stack = state["stack"]
+        traced = not state["background"]
+        if traced:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if stack:
+                # Fold the parent's peak so far in before resetting it for this step
+                stack[-1]["_peak"] = max(stack[-1]["_peak"], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0] if traced else 0
+        record = {"step": name, "kind": kind, "depth": len(stack), **fields,
+                  "_start": time.perf_counter(), "_memory": current, "_peak": current, "_children": 0.0}
+        stack.append(record)
+        state["records"].append(record)
+        try:
+            yield record
+        finally:
+            end = time.perf_counter()
+            current, peak = tracemalloc.get_traced_memory() if traced else (0, 0)
+            stack.pop()
+            peak = max(record.pop("_peak"), peak)
+            wall = end - record.pop("_start")
+            start_memory = record.pop("_memory")
+            record.update({
+                "wall_ms": wall * 1000,
+                "self_ms": (wall - record.pop("_children")) * 1000,
+                "allocated_kb": (current - start_memory) / 1024 if traced else None,
+                "peak_kb": (peak - start_memory) / 1024 if traced else None,
+            })
+            if stack:
+                stack[-1]["_children"] += wall
+                if traced:
+                    stack[-1]["_peak"] = max(stack[-1]["_peak"], peak)
+                    tracemalloc.reset_peak()
+            else:
+                self._finish_run(state)
+
+    def _finish_run(self, state):
+        records, state["records"] = state["records"], []
+        if state["concurrent"]:
+            for record in records:
+                record["allocated_kb"] = record["peak_kb"] = None
+        run = {"run": next(self._run_ids), "time": time.time(), "release": self.release,
+               "concurrent": state["concurrent"], "steps": records}
+        if state["background"]:
+            run["thread"] = threading.current_thread().name
+        with self._lock:
+            (self.background if state["background"] else self.runs).append(run)
+            if self.log_path:
+                with open(self.log_path, "a") as f:
+                    for record in run["steps"]:
+                        f.write(json.dumps({"run": run["run"], "time": run["time"], "release": run["release"],
+                                            "thread": run.get("thread"), **record}) + "\n")
+
+    def last_run(self):
+        with self._lock:
+            return self.runs[-1] if self.runs else None
+
+    def summary(self, background=False):
+        """Median and worst wall time per step over the kept runs (or background runs)."""
+        by_step = {}
+        with self._lock:
+            for run in self.background if background else self.runs:
+                for record in run["steps"]:
+                    by_step.setdefault((record["kind"], record["step"]), []).append(record["wall_ms"])
+        return [
+            {"kind": kind, "step": step, "calls": len(times),
+             "median_ms": statistics.median(times), "max_ms": max(times)}
+            for (kind, step), times in sorted(by_step.items(), key=lambda item: -max(item[1]))
+        ]
+
+
+render_profiler = RenderProfiler(RENDER_PROFILING, RENDER_LOG)
+
+
+def profiled(kind):
+    """Decorator recording every call as a ``kind`` step; a no-op unless render profiling is on."""
+    def decorate(func):
+        if not render_profiler.enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with render_profiler.step(func.__name__, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def profiled_run(func):
+    """Decorator recording each call outside a run as a run of its own, e.g. fragment reruns."""
+    if not render_profiler.enabled:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with render_profiler.run(func.__name__, "fragment"):
+            return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,47 @@
+"""Cumulative ROI from prefix sums.
+
+All functions work along the last axis, so a single series of shape
+``(periods,)`` and a stack of series (per property, per implementation
+level, ...) of shape ``(..., periods)`` go through the same NumPy calls.
+"""
+import numpy as np
+
+
+def cumulative_roi(investment, returns):
+    """Cumulative investment, returns, ROI percent and break-even point.
+
+    Investment for a period is treated as paid at its start and returns as
+    accruing evenly through it, so ``break_even_period`` is fractional: 2.5
+    means halfway through the third period. Series that never break even
+    get ``break_even_index`` -1 and ``break_even_period`` NaN.
+    """
+    investment = np.asarray(investment, dtype="float64")
+    returns = np.asarray(returns, dtype="float64")
+    if investment.shape != returns.shape:
+        raise ValueError(f"investment and returns shapes differ: {investment.shape} vs {returns.shape}")
+
+    cumulative_investment = np.cumsum(investment, axis=-1)
+    cumulative_returns = np.cumsum(returns, axis=-1)
+    net = cumulative_returns - cumulative_investment
+    cumulative_roi_pct = np.divide(net * 100, cumulative_investment, out=np.zeros_like(net),
+                                   where=cumulative_investment != 0)
+
+    # Net position at the start of each period, after that period's investment
+    net_at_start = net - returns
+    reached = net >= 0
+    broke_even = reached.any(axis=-1)
+    first = np.argmax(reached, axis=-1)
+
+    start = np.take_along_axis(net_at_start, first[..., None], axis=-1)[..., 0]
+    period_returns = np.take_along_axis(returns, first[..., None], axis=-1)[..., 0]
+    fraction = np.divide(-start, period_returns, out=np.zeros_like(start), where=period_returns > 0)
+    break_even_period = np.where(broke_even, first + np.clip(fraction, 0, 1), np.nan)
+
+    return {
+        "cumulative_investment": cumulative_investment,
+        "cumulative_returns": cumulative_returns,
+        "net": net,
+        "cumulative_roi": cumulative_roi_pct,
+        "break_even_index": np.where(broke_even, first, -1),
+        "break_even_period": break_even_period,
+    }
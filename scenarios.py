@@ -0,0 +1,193 @@
+"""Batch scenario engine for the Implementation Cost Calculator.
+
+Sweeps every (num_properties, implementation_level, existing_systems)
+combination of the calculator together with Monte-Carlo variations of its
+cost, discount and savings assumptions. Each batch is evaluated in one
+vectorized NumPy pass inside a process pool and reduced to fixed-bin
+histograms. Histograms from different batches can be merged, so percentile
+summaries stream back as batches complete without ever holding the raw
+scenarios.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+import numpy as np
+
+BASE_COST_PER_PROPERTY = {
+    "Basic (Monitoring)": 45000,
+    "Standard (Monitoring + Automation)": 75000,
+    "Advanced (Full AI Integration)": 120000
+}
+
+EXISTING_DISCOUNT = {
+    "None/Minimal": 0,
+    "Standard": 0.15,
+    "Modern/Advanced": 0.30
+}
+
+ANNUAL_SAVINGS_PER_PROPERTY = {
+    "Basic (Monitoring)": 35000,
+    "Standard (Monitoring + Automation)": 55000,
+    "Advanced (Full AI Integration)": 85000
+}
+
+PROPERTY_COUNTS = np.arange(1, 21)
+LEVELS = list(BASE_COST_PER_PROPERTY)
+EXISTING = list(EXISTING_DISCOUNT)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+HISTOGRAM_BINS = 400
+
+
+def implementation_costs(num_properties, implementation_level, existing_systems):
+    """Total cost, annual savings, ROI period and 5-year net benefit for one choice."""
+    base_cost = BASE_COST_PER_PROPERTY[implementation_level] * num_properties
+    total_cost = base_cost - base_cost * EXISTING_DISCOUNT[existing_systems]
+    annual_savings = ANNUAL_SAVINGS_PER_PROPERTY[implementation_level] * num_properties
+    return {
+        "total_cost": total_cost,
+        "annual_savings": annual_savings,
+        "roi_period": total_cost / annual_savings,
+        "net_benefit_5y": annual_savings * 5 - total_cost,
+    }
+
+
+def histogram_edges(cost_spread, savings_spread, discount_spread):
+    """Fixed bin edges covering every reachable ROI period and 5-year net benefit."""
+    cost = np.array(list(BASE_COST_PER_PROPERTY.values()), dtype="float64")
+    savings = np.array(list(ANNUAL_SAVINGS_PER_PROPERTY.values()), dtype="float64")
+    max_discount = min(max(EXISTING_DISCOUNT.values()) + discount_spread, 0.95)
+
+    max_cost = cost.max() * (1 + cost_spread)
+    min_cost = cost.min() * (1 - cost_spread) * (1 - max_discount)
+    max_savings = savings.max() * (1 + savings_spread)
+    min_savings = savings.min() * (1 - savings_spread)
+
+    roi_max = max_cost / min_savings
+    roi_min = min_cost / max_savings
+    n_max = PROPERTY_COUNTS.max()
+    net_max = (max_savings * 5 - min_cost) * n_max
+    net_min = min(0.0, (min_savings * 5 - max_cost) * n_max)
+    return (
+        np.linspace(roi_min, roi_max, HISTOGRAM_BINS + 1),
+        np.linspace(net_min, net_max, HISTOGRAM_BINS + 1),
+    )
+
+
+def evaluate_batch(start, stop, seed, cost_spread, savings_spread, discount_spread):
+    """Evaluate scenarios [start, stop) and reduce them to histogram counts.
+
+    Scenario ``i`` uses grid combination ``i % grid_size``, so every batch
+    covers the grid evenly, and draws its own triangular variation of each
+    assumption around the calculator's value.
+    """
+    rng = np.random.default_rng([seed, start])
+    n = stop - start
+
+    grid_shape = (len(PROPERTY_COUNTS), len(LEVELS), len(EXISTING))
+    combo = np.arange(start, stop) % int(np.prod(grid_shape))
+    count_idx, level_idx, existing_idx = np.unravel_index(combo, grid_shape)
+
+    num_properties = PROPERTY_COUNTS[count_idx]
+    base_cost = np.array(list(BASE_COST_PER_PROPERTY.values()), dtype="float64")[level_idx]
+    savings = np.array(list(ANNUAL_SAVINGS_PER_PROPERTY.values()), dtype="float64")[level_idx]
+    discount = np.array(list(EXISTING_DISCOUNT.values()), dtype="float64")[existing_idx]
+
+    def vary(spread):
+        if spread <= 0:
+            return np.ones(n)
+        return rng.triangular(1 - spread, 1, 1 + spread, n)
+
+    discount = np.clip(discount + (vary(discount_spread) - 1), 0, 0.95)
+    total_cost = base_cost * vary(cost_spread) * num_properties * (1 - discount)
+    annual_savings = savings * vary(savings_spread) * num_properties
+
+    roi_period = total_cost / annual_savings
+    net_benefit = annual_savings * 5 - total_cost
+
+    roi_edges, net_edges = histogram_edges(cost_spread, savings_spread, discount_spread)
+    return {
+        "count": n,
+        "roi_hist": np.histogram(roi_period, bins=roi_edges)[0],
+        "net_hist": np.histogram(net_benefit, bins=net_edges)[0],
+        "roi_under_1_5": int((roi_period < 1.5).sum()),
+        "roi_under_3": int((roi_period < 3).sum()),
+        "net_sum": float(net_benefit.sum()),
+    }
+
+
+def histogram_percentiles(counts, edges, percentiles=PERCENTILES):
+    """Percentiles from binned counts, interpolating linearly inside a bin."""
+    cumulative = np.cumsum(counts)
+    total = cumulative[-1]
+    if total == 0:
+        return {p: float("nan") for p in percentiles}
+    result = {}
+    for p in percentiles:
+        target = total * p / 100
+        i = int(np.searchsorted(cumulative, target, side="left"))
+        i = min(i, len(counts) - 1)
+        before = cumulative[i - 1] if i else 0
+        fraction = (target - before) / counts[i] if counts[i] else 0.0
+        result[p] = float(edges[i] + fraction * (edges[i + 1] - edges[i]))
+    return result
+
+
+class ScenarioSummary:
+    """Running totals merged from batch results."""
+
+    def __init__(self, cost_spread, savings_spread, discount_spread):
+        self.roi_edges, self.net_edges = histogram_edges(cost_spread, savings_spread, discount_spread)
+        self.roi_hist = np.zeros(HISTOGRAM_BINS, dtype="int64")
+        self.net_hist = np.zeros(HISTOGRAM_BINS, dtype="int64")
+        self.count = 0
+        self.roi_under_1_5 = 0
+        self.roi_under_3 = 0
+        self.net_sum = 0.0
+
+    def merge(self, batch):
+        self.roi_hist += batch["roi_hist"]
+        self.net_hist += batch["net_hist"]
+        self.count += batch["count"]
+        self.roi_under_1_5 += batch["roi_under_1_5"]
+        self.roi_under_3 += batch["roi_under_3"]
+        self.net_sum += batch["net_sum"]
+
+    def roi_percentiles(self):
+        return histogram_percentiles(self.roi_hist, self.roi_edges)
+
+    def net_benefit_percentiles(self):
+        return histogram_percentiles(self.net_hist, self.net_edges)
+
+    def to_dict(self):
+        count = max(self.count, 1)
+        return {
+            "scenarios": self.count,
+            "roi_period_percentiles": self.roi_percentiles(),
+            "net_benefit_5y_percentiles": self.net_benefit_percentiles(),
+            "net_benefit_5y_mean": self.net_sum / count,
+            "share_roi_under_1_5_years": self.roi_under_1_5 / count,
+            "share_roi_under_3_years": self.roi_under_3 / count,
+        }
+
+
+def run_scenarios(n_scenarios=1_000_000, batch_size=50_000, cost_spread=0.2, savings_spread=0.25,
+                  discount_spread=0.1, seed=0, max_workers=None):
+    """Yield ``(completed, total, summary)`` each time a batch finishes.
+
+    Batches run in a spawn-based process pool so the calling process's
+    threads (e.g. Streamlit's) are never forked.
+    """
+    summary = ScenarioSummary(cost_spread, savings_spread, discount_spread)
+    bounds = [(start, min(start + batch_size, n_scenarios)) for start in range(0, n_scenarios, batch_size)]
+    max_workers = max_workers or min(len(bounds), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context("spawn")) as pool:
+        futures = [
+            pool.submit(evaluate_batch, start, stop, seed, cost_spread, savings_spread, discount_spread)
+            for start, stop in bounds
+        ]
+        for completed, future in enumerate(as_completed(futures), start=1):
+            summary.merge(future.result())
+            yield completed, len(futures), summary
@@ -0,0 +1,329 @@
+"""Technician scheduling for predicted maintenance.
+
+Every predicted task is assigned a technician and a start slot within the
+planning horizon. Constraints:
+
+* skill: only technicians trained in the equipment's trade take the task;
+* capacity: a technician works one task at a time and at most
+  ``TECH_SLOTS_PER_DAY`` slots a day; a task's slots fall on one day;
+* tenant disruption: repairs and replacements take equipment out of
+  service, so they run only in off-peak slots (before or after business
+  hours, or at weekends), and a property hosts at most one at a time.
+
+The solver is a greedy list scheduler. Tasks are taken earliest due date
+first, then by priority, and each goes to the earliest feasible slot, with
+the least-loaded qualified technician. Occupancy is kept as boolean
+(technician x slot) and (property x slot) arrays, so each placement is a
+handful of vectorized operations and thousands of tasks are planned in a
+fraction of a second.
+
+A placement depends only on the tasks placed before it. When tasks change,
+only tasks from the first affected position onwards are removed and placed
+again; the rest of the plan is kept. A change to one low-priority task
+therefore re-plans a few tasks, and the result always equals a full re-solve.
+"""
+import bisect
+import datetime
+import os
+import threading
+import time
+
+import numpy as np
+
+from feeds import PRIORITIES, FeedIndex
+
+SCHEDULE_DAYS = int(os.environ.get("PROPERTYPULSE_SCHEDULE_DAYS", 60))
+TECHNICIANS = int(os.environ.get("PROPERTYPULSE_TECHNICIANS", 24))
+
+SLOT_TIMES = ["06:00", "10:00", "14:00", "18:00"]
+# Before and after business hours; every slot of a weekend is off-peak
+OFF_PEAK_SLOTS = {0, 3}
+TECH_SLOTS_PER_DAY = 3
+
+TRADES = ["HVAC", "Electrical", "Plumbing", "Elevator"]
+TRADE_BY_EQUIPMENT = {
+    "HVAC Compressor": "HVAC",
+    "Chiller": "HVAC",
+    "Elevator": "Elevator",
+    "Boiler": "Plumbing",
+    "Air Handler": "HVAC",
+    "Water Pump": "Plumbing",
+    "Lighting Controller": "Electrical",
+    "Rooftop Unit": "HVAC",
+}
+# Slots each priority's action takes, and which actions disrupt tenants
+TASK_SLOTS = {"High": 2, "Medium": 1, "Low": 1}
+DISRUPTIVE_PRIORITIES = {"High", "Medium"}
+# Trades hired per eight technicians; every third technician is cross-trained
+ROSTER_MIX = ["HVAC", "HVAC", "Electrical", "HVAC", "Plumbing", "HVAC", "Elevator", "Electrical"]
+
+
+def default_roster(count=TECHNICIANS):
+    """``count`` technicians as (name, trades) pairs."""
+    roster = []
+    for i in range(count):
+        trades = [ROSTER_MIX[i % len(ROSTER_MIX)]]
+        if i % 3 == 2:
+            trades.append(TRADES[(TRADES.index(trades[0]) + 1) % len(TRADES)])
+        roster.append((f"Tech {i + 1:02d} ({'/'.join(trades)})", tuple(trades)))
+    return roster
+
+
+def tasks_from_items(items):
+    """Scheduler task columns for item dicts with "property", "equipment", "priority" and "due_days"."""
+    names = list(dict.fromkeys(item["property"] for item in items))
+    return {
+        "key": np.arange(len(items)),
+        "property": np.array([names.index(item["property"]) for item in items], dtype="int64"),
+        "property_names": names,
+        "equipment": [item["equipment"] for item in items],
+        "priority": np.array([PRIORITIES.index(item["priority"]) for item in items], dtype="int64"),
+        "due_days": np.array([item["due_days"] for item in items], dtype="int64"),
+    }
+
+
+def _windows(free, length):
+    # free[..., s] for windows of `length` consecutive slots starting at s
+    if length == 1:
+        return free
+    window = free.copy()
+    for offset in range(1, length):
+        window[..., :-offset] &= free[..., offset:]
+        window[..., -offset:] = False
+    return window
+
+
+class MaintenanceScheduler:
+    def __init__(self, roster=None, days=SCHEDULE_DAYS, start_date=None):
+        """Without a ``start_date`` the plan starts today and moves with the date."""
+        self.roster = roster or default_roster()
+        self.days = days
+        self.slots = days * len(SLOT_TIMES)
+        self._follow_today = start_date is None
+        self._lock = threading.RLock()
+        self._skilled = {
+            trade: np.array([i for i, (_, trades) in enumerate(self.roster) if trade in trades], dtype="int64")
+            for trade in TRADES
+        }
+        self.stats = {"plans": 0, "replans": 0, "replanned_tasks": 0, "last_seconds": 0.0}
+        self._describe = None
+        self._calendar(start_date or datetime.date.today())
+        self._reset()
+
+    def _calendar(self, start_date):
+        days = self.days
+        self.start_date = start_date
+        slot = np.arange(self.slots)
+        self._slot_day = slot // len(SLOT_TIMES)
+        weekend = np.array([(self.start_date + datetime.timedelta(days=d)).weekday() >= 5 for d in range(days)])
+        off_peak = np.isin(slot % len(SLOT_TIMES), list(OFF_PEAK_SLOTS)) | weekend[self._slot_day]
+        # Valid start slots per (length, disruptive): the task ends the day it starts
+        self._starts = {}
+        for length in set(TASK_SLOTS.values()):
+            same_day = slot % len(SLOT_TIMES) + length <= len(SLOT_TIMES)
+            self._starts[length, False] = same_day
+            self._starts[length, True] = same_day & _windows(off_peak, length)
+
+    def _reset(self):
+        self._busy = np.zeros((len(self.roster), self.slots), dtype=bool)
+        self._day_load = np.zeros((len(self.roster), self.days), dtype="int64")
+        self._load = np.zeros(len(self.roster), dtype="int64")
+        self._disrupted = np.zeros((0, self.slots), dtype=bool)
+        self._property_names = []
+        self._property_codes = {}
+        self._tasks = {}  # key -> (property code, trade, length, disruptive, due day, priority rank)
+        self._order = []  # (due day, priority rank, key), in placement order
+        self._assigned = {}  # key -> (technician, start slot)
+        self._synced = None
+        self._version = 0
+        self._feed = None  # ((version, scoped), FeedIndex)
+
+    # --- Tasks --------------------------------------------------------------
+
+    def _property_code(self, name):
+        code = self._property_codes.get(name)
+        if code is None:
+            code = self._property_codes[name] = len(self._property_names)
+            self._property_names.append(name)
+            self._disrupted = np.vstack([self._disrupted, np.zeros((1, self.slots), dtype=bool)])
+        return code
+
+    def _specs(self, tasks):
+        names = tasks["property_names"]
+        specs = {}
+        for key, code, equipment, rank, due in zip(np.asarray(tasks["key"]).tolist(),
+                                                   np.asarray(tasks["property"]).tolist(), tasks["equipment"],
+                                                   np.asarray(tasks["priority"]).tolist(),
+                                                   np.asarray(tasks["due_days"]).tolist()):
+            priority = PRIORITIES[rank]
+            specs[key] = (self._property_code(names[code]), TRADE_BY_EQUIPMENT[equipment], TASK_SLOTS[priority],
+                          priority in DISRUPTIVE_PRIORITIES, due, rank)
+        return specs
+
+    def sync(self, tasks, describe=None, version=None):
+        """Bring the plan in line with ``tasks``, re-planning only what their changes affect.
+
+        ``tasks`` holds parallel "key", "property", "equipment", "priority"
+        and "due_days" columns plus "property_names"; ``describe(keys)``
+        returns item dicts for the timeline. A ``version`` equal to the last
+        one synced skips the comparison altogether.
+        """
+        with self._lock:
+            if describe is not None:
+                self._describe = describe
+            if self._follow_today and datetime.date.today() != self.start_date:
+                # A new day shifts every slot; plan again from scratch
+                self._calendar(datetime.date.today())
+                self._reset()
+            elif version is not None and version == self._synced:
+                return 0
+            specs = self._specs(tasks)
+            changed = {key: spec for key, spec in specs.items() if self._tasks.get(key) != spec}
+            removed = [key for key in self._tasks if key not in specs]
+            replanned = self._apply(changed, removed)
+            self._synced = version
+            return replanned
+
+    def update(self, key, property_name, equipment, priority, due_days):
+        """Add or change one task; returns how many tasks were re-planned."""
+        with self._lock:
+            spec = (self._property_code(property_name), TRADE_BY_EQUIPMENT[equipment], TASK_SLOTS[priority],
+                    priority in DISRUPTIVE_PRIORITIES, int(due_days), PRIORITIES.index(priority))
+            return self._apply({key: spec} if self._tasks.get(key) != spec else {}, [])
+
+    def remove(self, key):
+        with self._lock:
+            return self._apply({}, [key] if key in self._tasks else [])
+
+    # --- Planning -----------------------------------------------------------
+
+    @staticmethod
+    def _sort_key(key, spec):
+        return (spec[4], spec[5], key)
+
+    def _apply(self, changed, removed):
+        if not changed and not removed:
+            return 0
+        started = time.perf_counter()
+        # Everything ahead of the first affected position keeps its placement
+        affected = [self._sort_key(key, spec) for key, spec in changed.items()]
+        affected += [self._sort_key(key, self._tasks[key]) for key in list(changed) + removed if key in self._tasks]
+        first = bisect.bisect_left(self._order, min(affected))
+        for _, _, key in self._order[first:]:
+            self._unassign(key)
+
+        for key in removed:
+            self._order.pop(bisect.bisect_left(self._order, self._sort_key(key, self._tasks.pop(key))))
+        for key, spec in changed.items():
+            if key in self._tasks:
+                self._order.pop(bisect.bisect_left(self._order, self._sort_key(key, self._tasks[key])))
+            self._tasks[key] = spec
+            bisect.insort(self._order, self._sort_key(key, spec))
+
+        for _, _, key in self._order[first:]:
+            self._place(key)
+        replanned = len(self._order) - first
+        self.stats["plans" if first == 0 else "replans"] += 1
+        self.stats["replanned_tasks"] += replanned
+        self.stats["last_seconds"] = time.perf_counter() - started
+        self._version += 1
+        return replanned
+
+    def _place(self, key):
+        code, trade, length, disruptive, _, _ = self._tasks[key]
+        candidates = self._skilled[trade]
+        if not len(candidates):
+            return
+        free = ~self._busy[candidates]
+        free &= (self._day_load[candidates] + length <= TECH_SLOTS_PER_DAY)[:, self._slot_day]
+        free = _windows(free, length)
+        starts = self._starts[length, disruptive]
+        if disruptive:
+            starts = starts & _windows(~self._disrupted[code], length)
+        feasible = free & starts
+        any_free = feasible.any(axis=0)
+        if not any_free.any():
+            return
+        start = int(np.argmax(any_free))
+        technicians = candidates[feasible[:, start]]
+        technician = int(technicians[np.argmin(self._load[technicians])])
+
+        self._assigned[key] = (technician, start)
+        self._mark(key, True)
+
+    def _unassign(self, key):
+        if key in self._assigned:
+            self._mark(key, False)
+            del self._assigned[key]
+
+    def _mark(self, key, value):
+        code, _, length, disruptive, _, _ = self._tasks[key]
+        technician, start = self._assigned[key]
+        change = length if value else -length
+        self._busy[technician, start:start + length] = value
+        self._day_load[technician, self._slot_day[start]] += change
+        self._load[technician] += change
+        if disruptive:
+            self._disrupted[code, start:start + length] = value
+
+    # --- Results ------------------------------------------------------------
+
+    def assignment(self, key):
+        """Technician, start and lateness for one task; None fields when it does not fit the horizon."""
+        with self._lock:
+            placed = self._assigned.get(key)
+            if placed is None:
+                return {"technician": None, "scheduled": None, "scheduled_day": None, "late": None}
+            technician, start = placed
+            day = int(self._slot_day[start])
+            date = self.start_date + datetime.timedelta(days=day)
+            return {
+                "technician": self.roster[technician][0],
+                "scheduled": f"{date:%a %d %b} {SLOT_TIMES[start % len(SLOT_TIMES)]}",
+                "scheduled_day": day,
+                "late": day > self._tasks[key][4],
+            }
+
+    def summary(self):
+        with self._lock:
+            late = sum(1 for key, (_, start) in self._assigned.items() if self._slot_day[start] > self._tasks[key][4])
+            capacity = len(self.roster) * self.days * TECH_SLOTS_PER_DAY
+            return {
+                "tasks": len(self._tasks),
+                "scheduled": len(self._assigned),
+                "unscheduled": len(self._tasks) - len(self._assigned),
+                "late": late,
+                "technicians": len(self.roster),
+                "days": self.days,
+                "utilization": float(self._load.sum()) / capacity if capacity else 0.0,
+            }
+
+    def feed(self, scoped=True):
+        """The timeline as a FeedIndex: by priority, then by scheduled start, unscheduled tasks last."""
+        with self._lock:
+            if self._feed is None or self._feed[0] != (self._version, scoped):
+                keys = [key for _, _, key in self._order]
+                specs = [self._tasks[key] for key in keys]
+                starts = [self._assigned[key][1] if key in self._assigned else self.slots + spec[4]
+                          for key, spec in zip(keys, specs)]
+                index = FeedIndex([spec[0] for spec in specs], self._property_names, [spec[5] for spec in specs],
+                                  starts, keys, self._items, scoped=scoped)
+                self._feed = ((self._version, scoped), index)
+            return self._feed[1]
+
+    def _items(self, keys):
+        items = self._describe(keys) if self._describe is not None else [{} for _ in keys]
+        return [{**item, **self.assignment(key)} for key, item in zip(np.asarray(keys).tolist(), items)]
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Process-wide scheduler for the scoring engine's predicted tasks."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = MaintenanceScheduler()
+        return _scheduler
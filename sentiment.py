@@ -0,0 +1,276 @@
+"""Batched tenant sentiment analysis behind the Tenant view's sentiment chart.
+
+Feedback is read from a JSON-lines file, one ``{"property", "category",
+"text"}`` object per line, and classified locally with a TF-IDF plus
+logistic-regression model trained on a built-in seed corpus. Nothing leaves
+the process.
+
+Documents are classified in vectorized batches and their labels cached by
+content hash, so repeated texts are scored once. Per (property, category)
+label counts are kept as running totals: new lines appended to the file are
+read from where the last read stopped and only they are classified and
+added. A daemon thread does this every ``REFRESH_SECONDS``, so readers of
+the counts never wait on the file or the model.
+"""
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from telemetry_store import ALL_PROPERTIES, DATA_DIR
+
+FEEDBACK_FILE = os.environ.get(
+    "PROPERTYPULSE_FEEDBACK_FILE",
+    os.path.join(os.path.dirname(DATA_DIR), "feedback.jsonl"),
+)
+
+LABELS = ["negative", "neutral", "positive"]
+CATEGORIES = ["Maintenance", "Amenities", "Location", "Value", "Security", "Staff"]
+BATCH_SIZE = 2048
+MAX_CACHED_DOCUMENTS = 1_000_000
+REFRESH_SECONDS = float(os.environ.get("PROPERTYPULSE_FEEDBACK_REFRESH_SECONDS", 5))
+
+# Seed corpus building blocks: what tenants talk about per category and how
+CATEGORY_TERMS = {
+    "Maintenance": ["repair request", "maintenance team", "work order", "leak repair", "HVAC service"],
+    "Amenities": ["gym", "pool", "lounge", "package room", "parking garage"],
+    "Location": ["neighborhood", "location", "commute", "nearby shops", "transit access"],
+    "Value": ["rent", "pricing", "fees", "lease renewal offer", "value for money"],
+    "Security": ["security", "door access", "lighting at night", "building entry", "camera coverage"],
+    "Staff": ["staff", "property manager", "leasing office", "concierge", "front desk"],
+}
+SENTIMENT_TEMPLATES = {
+    "positive": [
+        "The {term} is excellent", "Really happy with the {term}", "Great experience with the {term}",
+        "The {term} was fast and friendly", "Love the {term} here", "The {term} exceeded my expectations",
+    ],
+    "neutral": [
+        "The {term} is okay", "Nothing special about the {term}", "The {term} is average",
+        "The {term} is fine I suppose", "No strong opinion on the {term}", "The {term} is about as expected",
+    ],
+    "negative": [
+        "The {term} is terrible", "Very disappointed with the {term}",
+        "The {term} took forever and nobody followed up", "Unhappy with the {term}",
+        "The {term} is broken again", "Worst {term} I have dealt with",
+    ],
+}
+
+
+def seed_corpus():
+    """(texts, labels) covering every category term in every sentiment template."""
+    texts, labels = [], []
+    for label, templates in SENTIMENT_TEMPLATES.items():
+        for terms in CATEGORY_TERMS.values():
+            for template, term in itertools.product(templates, terms):
+                texts.append(template.format(term=term))
+                labels.append(LABELS.index(label))
+    return texts, np.array(labels)
+
+
+def train_default_model():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+
+    texts, labels = seed_corpus()
+    model = make_pipeline(
+        TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, lowercase=True),
+        LogisticRegression(max_iter=1000),
+    )
+    model.fit(texts, labels)
+    return model
+
+
+def _valid_record(record):
+    return (isinstance(record, dict) and isinstance(record.get("text"), str)
+            and isinstance(record.get("property"), str) and isinstance(record.get("category", ""), (str, type(None))))
+
+
+def content_hash(text):
+    return hashlib.blake2b(" ".join(text.lower().split()).encode("utf-8"), digest_size=16).digest()
+
+
+class SentimentPipeline:
+    def __init__(self, model, path=FEEDBACK_FILE, batch_size=BATCH_SIZE, max_cached=MAX_CACHED_DOCUMENTS):
+        self.model = model
+        self.path = path
+        self.batch_size = batch_size
+        self.max_cached = max_cached
+        self._generation = 0  # bumped when the feedback file is replaced
+        self._lock = threading.RLock()  # guards labels, counts and stats
+        self._refresh_lock = threading.Lock()  # serializes refresh()
+        self._labels = OrderedDict()  # content hash -> label index
+        self._counts = {}  # (property, category) -> counts per label
+        self._offset = 0
+        self._thread = None
+        self.stats = {"documents": 0, "classified": 0, "cache_hits": 0, "rejected": 0, "last_error": None}
+
+    @property
+    def version(self):
+        # Derived from what has been read rather than counted per batch, so
+        # app workers that have read the same feedback agree on the version
+        with self._lock:
+            return (self._generation, self.stats["documents"])
+
+    # --- Classification -----------------------------------------------------
+
+    def classify(self, texts):
+        """Label index per text; only texts not seen before reach the model.
+
+        The model runs without holding the lock, so readers of the counts
+        do not wait for it.
+        """
+        hashes = [content_hash(text) for text in texts]
+        known, missing = {}, {}
+        with self._lock:
+            for digest, text in zip(hashes, texts):
+                if digest in self._labels:
+                    self._labels.move_to_end(digest)
+                    known[digest] = self._labels[digest]
+                else:
+                    missing.setdefault(digest, text)
+            self.stats["cache_hits"] += len(hashes) - len(missing)
+
+        pending = list(missing.items())
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            predicted = self.model.predict([text for _, text in batch])
+            known.update(zip((digest for digest, _ in batch), predicted.tolist()))
+
+        with self._lock:
+            for digest, _ in pending:
+                self._labels[digest] = known[digest]
+            self.stats["classified"] += len(pending)
+            while len(self._labels) > self.max_cached:
+                self._labels.popitem(last=False)
+        return np.array([known[digest] for digest in hashes], dtype="int64")
+
+    # --- Aggregates ---------------------------------------------------------
+
+    def add(self, records):
+        """Classify feedback records and fold them into the running counts.
+
+        Records that are not objects with string ``text`` and ``property``
+        (and ``category``, when given) are counted as rejected and skipped.
+        """
+        valid = [r for r in records if _valid_record(r)]
+        with self._lock:
+            self.stats["rejected"] += len(records) - len(valid)
+        records = [r for r in valid if r["text"] and r["property"]]
+        if not records:
+            return 0
+        labels = self.classify([r["text"] for r in records])
+        keys = [(r["property"], r.get("category") or "General") for r in records]
+        with self._lock:
+            unique_keys = list(dict.fromkeys(keys))
+            key_index = {key: i for i, key in enumerate(unique_keys)}
+            codes = np.array([key_index[key] for key in keys]) * len(LABELS) + labels
+            counts = np.bincount(codes, minlength=len(unique_keys) * len(LABELS)).reshape(-1, len(LABELS))
+            for key, row in zip(unique_keys, counts):
+                self._counts[key] = self._counts.get(key, 0) + row
+            self.stats["documents"] += len(records)
+        return len(records)
+
+    def refresh(self):
+        """Read and add feedback appended to the file since the last refresh.
+
+        Refreshes run one at a time. The file is read and classified without
+        holding the lock that readers of the counts take.
+        """
+        with self._refresh_lock:
+            if not os.path.exists(self.path):
+                return 0
+            if os.path.getsize(self.path) < self._offset:
+                # The file was replaced or truncated: start over
+                with self._lock:
+                    self._counts, self._offset = {}, 0
+                    self._generation += 1
+
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+            # Leave a partially written last line for the next refresh
+            complete = data[:data.rfind(b"\n") + 1]
+
+            records, rejected = [], 0
+            for line in complete.splitlines():
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    rejected += 1
+            added = self.add(records)
+            with self._lock:
+                self._offset += len(complete)
+                self.stats["rejected"] += rejected
+            return added
+
+    def start(self, interval=REFRESH_SECONDS):
+        """Refresh from the file every ``interval`` seconds on a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(interval,), name="sentiment-refresh",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.refresh()
+            except Exception as exc:
+                self.stats["last_error"] = repr(exc)
+
+    def has_data(self, property_name=ALL_PROPERTIES):
+        with self._lock:
+            if property_name in (None, ALL_PROPERTIES):
+                return bool(self._counts)
+            return any(prop == property_name for prop, _ in self._counts)
+
+    def aggregates(self, property_name=ALL_PROPERTIES):
+        """Percent positive/neutral/negative per category, in the chart's layout."""
+        with self._lock:
+            totals = {}
+            for (prop, category), counts in self._counts.items():
+                if property_name in (None, ALL_PROPERTIES) or prop == property_name:
+                    totals[category] = totals.get(category, 0) + counts
+
+        order = [c for c in CATEGORIES if c in totals] + sorted(set(totals) - set(CATEGORIES))
+        counts = np.array([totals[c] for c in order], dtype="float64").reshape(-1, len(LABELS))
+        shares = np.round(counts / np.maximum(counts.sum(axis=1, keepdims=True), 1) * 100).astype(int)
+        return pd.DataFrame({
+            "category": order,
+            "positive": shares[:, LABELS.index("positive")],
+            "neutral": shares[:, LABELS.index("neutral")],
+            "negative": shares[:, LABELS.index("negative")],
+        })
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_sentiment_pipeline():
+    """Process-wide pipeline, created once the feedback file exists.
+
+    The file is read once when the pipeline is created; after that a
+    background thread follows it.
+    """
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            if not os.path.exists(FEEDBACK_FILE):
+                return None
+            pipeline = SentimentPipeline(train_default_model())
+            try:
+                pipeline.refresh()
+            except Exception as exc:
+                # Kept anyway: the background refresh retries the file
+                pipeline.stats["last_error"] = repr(exc)
+            _pipeline = pipeline.start()
+        return _pipeline
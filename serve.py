@@ -0,0 +1,158 @@
+"""Run several dashboard workers behind one local port.
+
+    python serve.py
+    python serve.py --workers 8 --port 8501 --cache-path /var/cache/propertypulse.sqlite
+
+Each worker is a separate ``streamlit run app.py`` process on its own
+loopback port, so reruns from different users run on different cores. All
+workers share one SQLite cache (see ``cache_backend.py``): result frames,
+figure specs and view snapshots computed by one worker are loaded by the
+others instead of being recomputed.
+
+The balancer in front of them is a plain TCP proxy. A Streamlit session
+lives in its websocket and the worker that opened it, and the files it
+serves (downloads, media) are only known to that worker, so every
+connection from a client has to reach the same worker. Clients are pinned
+to one worker by a hash of their address and only move to the next worker
+when their own cannot be reached. Workers that exit are restarted.
+
+Pinning by address balances users, not connections: everyone behind one
+NAT or reverse proxy shares a worker. Put such deployments behind a proxy
+that keeps sessions sticky by cookie and points at the worker ports
+directly instead.
+
+Live ingestion (``PROPERTYPULSE_INGEST_*``) runs in the first worker only,
+so each reading is written to the store once; the others read the new
+readings back from the store when its version moves on. The metrics API (``PROPERTYPULSE_API_PORT``,
+see ``api.py``) likewise listens in the first worker only.
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import subprocess
+import sys
+import time
+
+from telemetry_store import DATA_DIR
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+# Services that must run once per machine: live ingestion and the metrics API port
+FIRST_WORKER_VARIABLES = ("PROPERTYPULSE_INGEST_TOPIC", "PROPERTYPULSE_INGEST_SOCKET", "PROPERTYPULSE_INGEST_FILE",
+                          "PROPERTYPULSE_API_PORT")
+# How often dead workers are looked for, and how long to wait between restarts of one worker
+MONITOR_INTERVAL = 2.0
+RESTART_BACKOFF = 5.0
+COPY_BUFFER = 64 * 1024
+
+
+class Worker:
+    def __init__(self, index, port, env):
+        self.index = index
+        self.port = port
+        self.env = env
+        self.process = None
+        self.started_at = 0.0
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", APP_PATH,
+             "--server.port", str(self.port),
+             "--server.address", "127.0.0.1",
+             "--server.headless", "true"],
+            env=self.env,
+        )
+        self.started_at = time.monotonic()
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self):
+        if self.alive():
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def worker_env(index, cache_path):
+    env = dict(os.environ, PROPERTYPULSE_SHARED_CACHE=cache_path)
+    if index:
+        for name in FIRST_WORKER_VARIABLES:
+            env.pop(name, None)
+    return env
+
+
+def pick_order(client_host, count):
+    """Worker indexes to try for a client: its own first, then the rest in turn.
+
+    Every client behind one address maps to the same worker.
+    """
+    first = int.from_bytes(hashlib.blake2b(client_host.encode(), digest_size=4).digest(), "big") % count
+    return [(first + i) % count for i in range(count)]
+
+
+async def _copy(reader, writer):
+    try:
+        while data := await reader.read(COPY_BUFFER):
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _proxy(workers, client_reader, client_writer):
+    client_host = (client_writer.get_extra_info("peername") or ("",))[0]
+    for index in pick_order(client_host, len(workers)):
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", workers[index].port)
+        except OSError:
+            continue
+        await asyncio.gather(_copy(client_reader, upstream_writer), _copy(upstream_reader, client_writer))
+        return
+    client_writer.close()
+
+
+async def _monitor(workers):
+    while True:
+        await asyncio.sleep(MONITOR_INTERVAL)
+        for worker in workers:
+            if not worker.alive() and time.monotonic() - worker.started_at >= RESTART_BACKOFF:
+                print(f"worker {worker.index} on port {worker.port} exited, restarting", file=sys.stderr)
+                worker.start()
+
+
+async def serve(workers, host, port):
+    server = await asyncio.start_server(lambda r, w: _proxy(workers, r, w), host, port)
+    print(f"serving {len(workers)} workers on http://{host}:{port}", file=sys.stderr)
+    async with server:
+        await asyncio.gather(server.serve_forever(), _monitor(workers))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8501)
+    parser.add_argument("--worker-port", type=int, default=8600, help="port of the first worker; the rest follow")
+    parser.add_argument("--cache-path", default=os.environ.get(
+        "PROPERTYPULSE_SHARED_CACHE", os.path.join(os.path.dirname(DATA_DIR), "shared_cache.sqlite")))
+    args = parser.parse_args(argv)
+
+    workers = [Worker(i, args.worker_port + i, worker_env(i, args.cache_path)) for i in range(max(args.workers, 1))]
+    for worker in workers:
+        worker.start()
+    try:
+        asyncio.run(serve(workers, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for worker in workers:
+            worker.stop()
+
+
+if __name__ == "__main__":
+    main()
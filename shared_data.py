@@ -0,0 +1,183 @@
+"""Read-only DataFrames shared by every session served by this process.
+
+Frames returned by the generate_* accessors are built once per (accessor,
+arguments, data version) and kept here. Every caller gets a shallow copy
+that references the shared column buffers, so sessions and snapshot
+builders asking for the same data do not each hold a copy. Pandas'
+copy-on-write (switched on at import on pandas 2) makes those copies
+read-only in effect: a caller that edits its frame gets private copies of
+the columns it touches, and the shared frame never changes.
+
+Each handed-out copy counts as a reference until it is garbage collected.
+A frame is only evicted while nothing references it: once the data
+version moves on, or in LRU order when the registry is over
+``max_bytes``. Frames that are still referenced count toward the budget
+but stay until their last reference goes away.
+"""
+import functools
+import inspect
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+import pandas as pd
+
+from cache import estimate_size
+from telemetry_store import get_store
+
+SHARED_MAX_BYTES = int(float(os.environ.get("PROPERTYPULSE_SHARED_MAX_MB", 512)) * 1024 * 1024)
+
+# Shallow copies only protect the shared frames under copy-on-write, which
+# pandas 3 always uses and pandas 2 needs switched on
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+
+class SharedFrames:
+    def __init__(self, version=None, max_bytes=SHARED_MAX_BYTES):
+        self.version = version or (lambda: 0)
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (name, args, version) -> {"frame", "bytes", "refs"}
+        self._building = {}  # key -> lock held while the frame is built
+        self._bytes = 0
+        self._current = None  # data version seen by the last lookup
+        # Reentrant: references are released from finalizers, which can run
+        # during garbage collection on a thread that already holds the lock
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, name, builder, *args):
+        """A reference to the shared frame ``builder(*args)``, built on first use.
+
+        Results that are not DataFrames are returned as built and not shared.
+        """
+        version = self.version()
+        key = (name, args, version)
+        with self._lock:
+            if version != self._current:
+                self._current = version
+                self._drop_stale()
+            entry = self._entries.get(key)
+            if entry is None:
+                build_lock = self._building.setdefault(key, threading.Lock())
+
+        if entry is None:
+            # Concurrent callers of the same key wait for one build
+            with build_lock:
+                with self._lock:
+                    entry = self._entries.get(key)
+                if entry is None:
+                    # The build lock is only released once the entry is
+                    # stored, so a caller arriving in between finds it
+                    try:
+                        frame = builder(*args)
+                        if not isinstance(frame, pd.DataFrame):
+                            return frame
+                        entry = self._store(key, frame)
+                    finally:
+                        with self._lock:
+                            self._building.pop(key, None)
+                else:
+                    self.hits += 1
+        else:
+            self.hits += 1
+        return self._reference(key, entry)
+
+    def _store(self, key, frame):
+        entry = {"frame": frame, "bytes": estimate_size(frame), "refs": 0}
+        with self._lock:
+            replaced = self._entries.get(key)
+            if replaced is not None:
+                self._bytes -= replaced["bytes"]
+            self._entries[key] = entry
+            self._bytes += entry["bytes"]
+            self.misses += 1
+        return entry
+
+    def _reference(self, key, entry):
+        with self._lock:
+            view = entry["frame"].copy(deep=False)
+            entry["refs"] += 1
+            self._entries.move_to_end(key)
+            weakref.finalize(view, self._release, key, entry)
+            self._evict()
+        return view
+
+    def _release(self, key, entry):
+        with self._lock:
+            entry["refs"] -= 1
+            if self._entries.get(key) is not entry:
+                return  # already dropped, or cleared and rebuilt since
+            if entry["refs"] == 0 and key[2] != self._current:
+                self._drop(key)
+            else:
+                self._evict()
+
+    def _drop(self, key):
+        self._bytes -= self._entries.pop(key)["bytes"]
+
+    def _drop_stale(self):
+        for key in [k for k, entry in self._entries.items() if k[2] != self._current and entry["refs"] == 0]:
+            self._drop(key)
+
+    def _evict(self):
+        if self._bytes <= self.max_bytes:
+            return
+        for key in [k for k, entry in self._entries.items() if entry["refs"] == 0]:
+            self._drop(key)
+            self.evictions += 1
+            if self._bytes <= self.max_bytes:
+                break
+
+    def clear(self):
+        """Forget every frame; references already handed out stay valid."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "referenced": sum(1 for entry in self._entries.values() if entry["refs"]),
+                "references": sum(entry["refs"] for entry in self._entries.values()),
+                "bytes": self._bytes,
+            }
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_frames():
+    """Process-wide registry, versioned by the telemetry store until the app sets ``version``."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            store = get_store()
+            _shared = SharedFrames(version=lambda: store.version)
+        return _shared
+
+
+def shared(func):
+    """Serve ``func``'s DataFrame results from the process-wide registry.
+
+    Arguments are bound with their defaults, so ``f(x)`` and ``f(x, 5)``
+    share a frame when 5 is the default.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return get_shared_frames().get(func.__qualname__, func, *bound.args)
+    return wrapper
@@ -0,0 +1,195 @@
+"""Precomputed view snapshots served without blocking the script thread.
+
+A snapshot is everything a view needs from computation (frames, metrics,
+serialized figure specs) for one (view, property, horizon), together with
+the data version it was computed from. Views register a builder per view;
+``get`` returns the latest snapshot straight away and, when the data has
+moved on since, queues a recompute on a shared thread pool. Only a key that
+has never been computed makes its first caller wait.
+
+A scheduler thread recomputes stale snapshots of recently requested keys
+when the store reports a write and every ``interval`` seconds, so work is
+shared by every session instead of repeated per rerun. With a ``backend``
+(the SQLite cache shared by app workers) a snapshot another worker already
+computed for the same data version is loaded instead of rebuilt, except
+for views registered with ``shared=False`` whose values depend on state
+kept in this process.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cache_backend import get_shared_cache
+from telemetry_store import get_store
+
+SNAPSHOT_INTERVAL = float(os.environ.get("PROPERTYPULSE_SNAPSHOT_INTERVAL", 30))
+SNAPSHOT_WORKERS = int(os.environ.get("PROPERTYPULSE_SNAPSHOT_WORKERS", 2))
+# Keys nobody has asked for in this long stop being refreshed and are dropped
+SNAPSHOT_IDLE_SECONDS = float(os.environ.get("PROPERTYPULSE_SNAPSHOT_IDLE_SECONDS", 900))
+
+
+class SnapshotWorker:
+    def __init__(self, version=None, interval=SNAPSHOT_INTERVAL, max_workers=SNAPSHOT_WORKERS,
+                 idle_seconds=SNAPSHOT_IDLE_SECONDS, backend=None):
+        self.version = version or (lambda: 0)
+        self.backend = backend
+        self.interval = interval
+        self.idle_seconds = idle_seconds
+        self._builders = {}
+        self._snapshots = {}  # (view, property, horizon) -> snapshot dict
+        self._requested = {}  # key -> last time a view asked for it
+        self._pending = {}  # key -> future of an in-flight compute
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="snapshot")
+        self._wake = threading.Event()
+        self._thread = None
+        self.stats = {"computed": 0, "shared": 0, "served": 0, "served_stale": 0, "errors": 0, "last_error": None}
+
+    def register(self, view, builder, uses_horizon=True, shared=True):
+        """``builder(selected_property, time_horizon)`` returns the view's snapshot value.
+
+        Views that ignore the horizon share one snapshot across all horizons.
+        Views built from state local to this process, such as the scoring
+        engine's windows, pass ``shared=False`` to stay out of the backend.
+        """
+        self._builders[view] = (builder, uses_horizon, shared)
+
+    def _key(self, view, selected_property, time_horizon):
+        return (view, selected_property, time_horizon if self._builders[view][1] else None)
+
+    # --- Computing ----------------------------------------------------------
+
+    def _compute(self, key):
+        view, selected_property, time_horizon = key
+        # Read the version first so a write landing mid-compute leaves the result stale
+        version = self.version()
+        backend = self.backend if self._builders[view][2] else None
+        shared_key = ("snapshot", key, version)
+        snapshot = backend.get(shared_key) if backend is not None else None
+        if snapshot is not None:
+            with self._lock:
+                self._snapshots[key] = snapshot
+                self._pending.pop(key, None)
+                self.stats["shared"] += 1
+            return snapshot
+
+        start = time.perf_counter()
+        try:
+            value = self._builders[view][0](selected_property, time_horizon)
+        except Exception as exc:
+            with self._lock:
+                self._pending.pop(key, None)
+                self.stats["errors"] += 1
+                self.stats["last_error"] = f"{view}: {exc!r}"
+            raise
+        snapshot = {
+            "value": value,
+            "version": version,
+            "computed_at": time.time(),
+            "seconds": time.perf_counter() - start,
+        }
+        if backend is not None:
+            backend.set(shared_key, snapshot)
+        with self._lock:
+            self._snapshots[key] = snapshot
+            self._pending.pop(key, None)
+            self.stats["computed"] += 1
+        return snapshot
+
+    def submit(self, key):
+        """Queue a recompute of ``key`` unless one is already running; returns its future."""
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = self._pool.submit(self._compute, key)
+            return future
+
+    def get(self, view, selected_property, time_horizon=None):
+        """Latest snapshot for the key; waits only if it was never computed."""
+        key = self._key(view, selected_property, time_horizon)
+        with self._lock:
+            self._requested[key] = time.time()
+            snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            snapshot = self.submit(key).result()
+        elif snapshot["version"] != self.version():
+            self.submit(key)
+            self.stats["served_stale"] += 1
+        self.stats["served"] += 1
+        return snapshot
+
+    def is_current(self, snapshot):
+        return snapshot["version"] == self.version()
+
+    def prefetch(self, selected_property, time_horizon=None, views=None):
+        """Queue snapshots that were never computed, e.g. a property's other views.
+
+        Prefetched keys idle out like any other unless a view asks for them.
+        """
+        now = time.time()
+        for view in views or list(self._builders):
+            key = self._key(view, selected_property, time_horizon)
+            with self._lock:
+                if key in self._snapshots:
+                    continue
+                self._requested.setdefault(key, now)
+            self.submit(key)
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+            self._requested.clear()
+
+    # --- Scheduling ---------------------------------------------------------
+
+    def refresh(self):
+        """Recompute every active stale snapshot and forget idle keys."""
+        version = self.version()
+        cutoff = time.time() - self.idle_seconds
+        with self._lock:
+            for key in [k for k, seen in self._requested.items() if seen < cutoff]:
+                self._requested.pop(key)
+                self._snapshots.pop(key, None)
+            stale = [
+                key for key in self._requested
+                if key not in self._snapshots or self._snapshots[key]["version"] != version
+            ]
+        for key in stale:
+            self.submit(key)
+        return len(stale)
+
+    def data_changed(self, *args):
+        """Store listener: wake the scheduler instead of waiting for the next tick."""
+        self._wake.set()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="snapshot-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.refresh()
+            except Exception as exc:
+                self.stats["last_error"] = repr(exc)
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_snapshot_worker():
+    """Process-wide worker, following store writes; views register builders on it."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            store = get_store()
+            _worker = SnapshotWorker(version=lambda: store.version, backend=get_shared_cache())
+            store.add_listener(_worker.data_changed)
+            _worker.start()
+        return _worker
@@ -0,0 +1,228 @@
+"""Deterministic synthetic portfolios for load testing.
+
+    python synthetic.py --properties 2000 --months 12 --interval 15 --data-dir /tmp/portfolio
+
+Writes every dataset the views read (per-meter energy, maintenance events,
+sensor buckets, tenant surveys and cost lines) into a telemetry store, and
+optionally free-text tenant feedback into the sentiment pipeline's file. Each
+property is generated from its own seed (``seed`` plus its index) and
+appended before the next one is generated, so the output does not depend
+on how the run is split up and memory stays bounded by one property however
+large the portfolio gets.
+
+The first properties take the demo portfolio's names, so the sidebar's
+properties resolve to generated data; the rest are numbered.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from sentiment import CATEGORY_TERMS, FEEDBACK_FILE, LABELS, SENTIMENT_TEMPLATES
+from telemetry_store import COST_CATEGORIES, DEMO_PROPERTIES, TelemetryStore, get_store
+
+# kWh per meter per hour for a mid-size property, before size and profile factors
+BASE_LOAD_KWH = 30.0
+SENSOR_DAYS = 3
+# Share of the realized savings each cost category accounts for
+COST_CATEGORY_WEIGHTS = np.array([0.32, 0.45, 0.15, 0.08])
+FEEDBACK_OPENERS = ["", "Honestly, ", "This month ", "Overall ", "As a long-time tenant, "]
+FEEDBACK_CLOSERS = ["", ".", "!", " overall.", " this quarter."]
+
+
+def property_names(n_properties):
+    extra = [f"Portfolio Property {i:05d}" for i in range(len(DEMO_PROPERTIES), n_properties)]
+    return (DEMO_PROPERTIES + extra)[:n_properties]
+
+
+def _hour_of_day(timestamps):
+    return (timestamps.astype("int64") // 3600) % 24
+
+
+def energy_readings(rng, timestamps, meters, size, go_live):
+    """Per-meter consumption with daily, weekly and seasonal shape.
+
+    Optimized usage tracks standard usage until ``go_live``, then ramps down
+    to the property's savings rate over three months.
+    """
+    hours = _hour_of_day(timestamps)
+    weekday = (timestamps.astype("datetime64[D]").astype("int64") + 3) % 7  # Monday is 0
+    day_of_year = (timestamps - timestamps.astype("datetime64[Y]")).astype("timedelta64[D]").astype("int64")
+    interval_hours = float(np.median(np.diff(timestamps).astype("int64"))) / 3600 if len(timestamps) > 1 else 1.0
+
+    profile = (1 + 0.45 * np.sin((hours - 7) / 24 * 2 * np.pi)) * np.where(weekday < 5, 1.0, 0.75)
+    seasonal = 1 + 0.25 * np.cos((day_of_year - 200) / 365 * 2 * np.pi)
+    meter_scale = rng.lognormal(0, 0.3, meters)
+
+    standard = (BASE_LOAD_KWH * size * interval_hours * profile * seasonal)[None, :] * meter_scale[:, None]
+    standard *= rng.normal(1, 0.04, standard.shape)
+    savings_rate = rng.uniform(0.12, 0.32)
+    ramp = np.clip((timestamps - go_live).astype("int64") / (90 * 86400), 0, 1)
+    optimized = standard * (1 - savings_rate * ramp)[None, :]
+
+    return {
+        "timestamp": np.tile(timestamps, meters),
+        "meter_id": np.repeat(np.arange(meters), len(timestamps)),
+        "standard": np.maximum(standard, 0).ravel(),
+        "optimized": np.maximum(optimized, 0).ravel(),
+    }
+
+
+def maintenance_events(rng, days, equipment, size):
+    """Daily maintenance counts per piece of equipment that had any work."""
+    rate = 0.02 * size
+    actual = rng.poisson(rate, (len(days), equipment))
+    day_idx, equipment_id = np.nonzero(actual)
+    actual = actual[day_idx, equipment_id]
+    predicted = np.maximum(actual + rng.integers(-1, 2, len(actual)), 0)
+    return {
+        "timestamp": days[day_idx],
+        "equipment_id": equipment_id,
+        "predicted": predicted,
+        "actual": actual,
+        "urgent": rng.binomial(actual, 0.2),
+    }
+
+
+def sensor_buckets(rng, timestamps, equipment):
+    """15-minute sensor averages; about one in ten machines drifts toward failure."""
+    n = len(timestamps)
+    failing = np.repeat(rng.random(equipment) < 0.1, n)
+    ramp = np.tile(np.linspace(0, 1, n), equipment) ** 2 * failing
+    baseline = np.repeat(rng.normal([70, 2, 15], [5, 0.5, 3], (equipment, 3)), n, axis=0)
+    noise = rng.normal(0, 1, (n * equipment, 3)) * [1.5, 0.2, 1.0]
+    values = baseline + noise + ramp[:, None] * rng.uniform([5, 1, 2], [20, 4, 6], (n * equipment, 3))
+    return {
+        "timestamp": np.tile(timestamps, equipment),
+        "equipment_id": np.repeat(np.arange(equipment), n),
+        "temperature": values[:, 0],
+        "vibration": values[:, 1],
+        "power": values[:, 2],
+    }
+
+
+def tenant_surveys(rng, start, end, units, go_live):
+    """Survey responses spread over the period; scores improve after go-live."""
+    responses = rng.binomial(units, 0.3 * (end - start).astype("timedelta64[D]").astype("int64") / 91)
+    offsets = rng.integers(0, (end - start).astype("int64"), responses)
+    timestamps = np.sort(start + offsets.astype("timedelta64[s]"))
+    lift = 12 * np.clip((timestamps - go_live).astype("int64") / (365 * 86400), 0, 1)
+    return {
+        "timestamp": timestamps,
+        "unit_id": rng.integers(0, units, responses),
+        "score": np.clip(rng.normal(74 + lift, 9), 0, 100),
+    }
+
+
+def cost_lines(rng, months, size, go_live):
+    """One savings line per category per month once the property is live."""
+    live = months[months >= go_live.astype("datetime64[M]")]
+    categories = len(COST_CATEGORIES)
+    amounts = 9000 * size * COST_CATEGORY_WEIGHTS[None, :] * rng.lognormal(0, 0.2, (len(live), categories))
+    return {
+        "timestamp": np.repeat(live.astype("datetime64[s]"), categories),
+        "category_id": np.tile(np.arange(categories), len(live)),
+        "amount": amounts.ravel(),
+    }
+
+
+def generate_property(index, start, end, interval_minutes=15, seed=0):
+    """All datasets for one property, as ``{dataset: columns}``."""
+    rng = np.random.default_rng([seed, index])
+    size = rng.lognormal(0, 0.5)
+    meters = int(rng.integers(2, 7))
+    equipment = int(np.clip(rng.poisson(8 * size), 2, 60))
+    units = int(np.clip(rng.poisson(120 * size), 10, 2000))
+    go_live = start + np.timedelta64(int(rng.integers(0, 120)), "D")
+
+    timestamps = np.arange(start, end, np.timedelta64(interval_minutes, "m")).astype("datetime64[s]")
+    days = np.arange(start.astype("datetime64[D]"), end.astype("datetime64[D]")).astype("datetime64[s]")
+    months = np.arange(start.astype("datetime64[M]"), end.astype("datetime64[M]"))
+    sensor_start = max(start, end - np.timedelta64(SENSOR_DAYS, "D"))
+    sensor_times = np.arange(sensor_start, end, np.timedelta64(15, "m")).astype("datetime64[s]")
+
+    return {
+        "energy": energy_readings(rng, timestamps, meters, size, go_live),
+        "maintenance": maintenance_events(rng, days, equipment, size),
+        "sensors": sensor_buckets(rng, sensor_times, equipment),
+        "tenant_surveys": tenant_surveys(rng, start, end, units, go_live),
+        "cost_lines": cost_lines(rng, months, size, go_live),
+    }
+
+
+def write_portfolio(store, n_properties, months=12, interval_minutes=15, start="2025-01-01", seed=0,
+                    progress=None):
+    """Generate and append ``n_properties`` properties one at a time.
+
+    Returns ``{dataset: rows written}``. ``progress(done, total)`` is called
+    after each property.
+    """
+    start = np.datetime64(start, "s")
+    end = np.datetime64(np.datetime64(start, "M") + months, "s")
+    rows = {}
+    for index, name in enumerate(property_names(n_properties)):
+        for dataset, columns in generate_property(index, start, end, interval_minutes, seed).items():
+            store.append(dataset, name, columns)
+            rows[dataset] = rows.get(dataset, 0) + len(columns["timestamp"])
+        if progress:
+            progress(index + 1, n_properties)
+    return rows
+
+
+def feedback_records(index, name, responses, seed=0):
+    """Free-text tenant feedback for one property, built from the sentiment templates."""
+    rng = np.random.default_rng([seed, index, 1])
+    mood = rng.dirichlet([2, 1.5, 4])  # negative, neutral, positive
+    categories = list(CATEGORY_TERMS)
+    for label in rng.choice(len(LABELS), responses, p=mood):
+        category = categories[rng.integers(len(categories))]
+        template = rng.choice(SENTIMENT_TEMPLATES[LABELS[label]])
+        text = template.format(term=rng.choice(CATEGORY_TERMS[category]))
+        opener = rng.choice(FEEDBACK_OPENERS)
+        if opener:
+            text = opener + text[0].lower() + text[1:]
+        yield {"property": name, "category": category, "text": text + rng.choice(FEEDBACK_CLOSERS)}
+
+
+def write_feedback(path, n_properties, responses_per_property, seed=0):
+    """Append feedback for every property to a JSON-lines file, one property at a time."""
+    written = 0
+    with open(path, "a") as f:
+        for index, name in enumerate(property_names(n_properties)):
+            for record in feedback_records(index, name, responses_per_property, seed):
+                f.write(json.dumps(record) + "\n")
+                written += 1
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic portfolio into a telemetry store.")
+    parser.add_argument("--properties", type=int, default=len(DEMO_PROPERTIES))
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--interval", type=int, default=15, help="energy reading interval in minutes")
+    parser.add_argument("--start", default="2025-01-01")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="store root (default: PROPERTYPULSE_DATA_DIR or data/telemetry)")
+    parser.add_argument("--feedback", type=int, default=0, help="tenant feedback lines per property")
+    parser.add_argument("--feedback-file", default=FEEDBACK_FILE)
+    args = parser.parse_args(argv)
+
+    store = TelemetryStore(args.data_dir) if args.data_dir else get_store()
+    started = time.perf_counter()
+
+    def progress(done, total):
+        if done == total or done % max(total // 20, 1) == 0:
+            print(f"{done:,}/{total:,} properties ({time.perf_counter() - started:.0f}s)", flush=True)
+
+    rows = write_portfolio(store, args.properties, args.months, args.interval, args.start, args.seed, progress)
+    for dataset, count in rows.items():
+        print(f"{dataset}: {count:,} rows")
+    print(f"Wrote {sum(rows.values()):,} rows to {store.root} in {time.perf_counter() - started:.1f}s")
+    if args.feedback:
+        written = write_feedback(args.feedback_file, args.properties, args.feedback, args.seed)
+        print(f"Appended {written:,} feedback lines to {args.feedback_file}")
+
+
+if __name__ == "__main__":
+    main()
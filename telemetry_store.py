@@ -0,0 +1,464 @@
+"""Columnar telemetry store backing the Energy and Maintenance views.
+
+Readings are partitioned by dataset, property and month:
+
+    <root>/<dataset>/<property-slug>/<YYYY-MM>/<chunk>/<column>.npy
+
+Every column lives in its own .npy file and is opened with ``mmap_mode="r"``,
+so a view maps only the columns it asks for and slices them by time range
+without copying. Appends write a new chunk per month; ``compact`` merges the
+chunks of a month back into one sorted chunk. An append that leaves a month
+with more than ``COMPACT_CHUNKS`` chunks compacts that month on the spot, so
+a steady stream of small appends never leaves reads mapping an unbounded
+number of files.
+
+Each chunk also stores the store version that wrote every row (the
+``_version`` column, which reads never return), and its name carries the
+newest of them, so ``read_since`` can return exactly the readings written
+after a given version even after chunks have been merged.
+"""
+import functools
+import json
+import os
+import re
+import shutil
+import struct
+import threading
+import uuid
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.environ.get(
+    "PROPERTYPULSE_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "telemetry"),
+)
+
+ALL_PROPERTIES = "All Properties"
+# Chunks a month may hold before an append compacts it
+COMPACT_CHUNKS = int(os.environ.get("PROPERTYPULSE_COMPACT_CHUNKS", 16))
+# A read that loses a chunk to a concurrent compaction is retried this often
+READ_ATTEMPTS = 3
+
+# The demo portfolio, shown with sample data until the store holds readings
+DEMO_PROPERTIES = [
+    "San Isidro Plaza",
+    "Los Altos Ranch Market",
+    "Three Amigos",
+    "Santa Fe Building 440",
+    "1651 Galisteo",
+    "Coronado Building",
+    "Imaging Center",
+    "Granada Square",
+    "San Ignacio Apartments",
+    "San Isidro Apartments",
+    "Target Store",
+    "Whole Foods",
+]
+
+# cost_lines.category_id indexes this list
+COST_CATEGORIES = ["Maintenance", "Energy", "Staffing", "Operations"]
+
+# Hidden per-row column holding the store version that wrote the row
+VERSION_COLUMN = "_version"
+
+# Column layout of each dataset. "timestamp" is always present and is the
+# sort key inside a chunk.
+SCHEMAS = {
+    "energy": {
+        "timestamp": "datetime64[s]",
+        "meter_id": "int32",
+        "standard": "float64",
+        "optimized": "float64",
+    },
+    "maintenance": {
+        "timestamp": "datetime64[s]",
+        "equipment_id": "int32",
+        "predicted": "int16",
+        "actual": "int16",
+        "urgent": "int16",
+    },
+    "sensors": {
+        "timestamp": "datetime64[s]",
+        "equipment_id": "int32",
+        "temperature": "float32",
+        "vibration": "float32",
+        "power": "float32",
+    },
+    "tenant_surveys": {
+        "timestamp": "datetime64[s]",
+        "unit_id": "int32",
+        "score": "float32",
+    },
+    "cost_lines": {
+        "timestamp": "datetime64[s]",
+        "category_id": "int16",
+        "amount": "float64",
+    },
+}
+
+
+def property_slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def _month_key(value):
+    return str(np.datetime64(value, "M"))
+
+
+def _retrying(read):
+    # A compaction in another process can remove chunks a read has just
+    # listed; listing again finds the merged chunk instead
+    @functools.wraps(read)
+    def wrapper(*args, **kwargs):
+        for attempt in range(READ_ATTEMPTS):
+            try:
+                return read(*args, **kwargs)
+            except FileNotFoundError:
+                if attempt == READ_ATTEMPTS - 1:
+                    raise
+    return wrapper
+
+
+class TelemetryStore:
+    def __init__(self, root=DATA_DIR, compact_chunks=COMPACT_CHUNKS):
+        self.root = root
+        self.compact_chunks = compact_chunks
+        self._lock = threading.RLock()
+        self._manifest = {"version": 0, "properties": {}}
+        self._manifest_mtime = None
+        self._listeners = []
+
+    # --- Manifest -----------------------------------------------------------
+
+    @property
+    def _manifest_path(self):
+        return os.path.join(self.root, "manifest.json")
+
+    def _load_manifest(self):
+        try:
+            mtime = os.stat(self._manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return self._manifest
+        if mtime != self._manifest_mtime:
+            with open(self._manifest_path) as f:
+                self._manifest = json.load(f)
+            self._manifest_mtime = mtime
+        return self._manifest
+
+    def _save_manifest(self, manifest):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self._manifest_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._manifest_path)
+        self._manifest = manifest
+        self._manifest_mtime = os.stat(self._manifest_path).st_mtime_ns
+
+    @property
+    def write_lock(self):
+        """Held by every write in this process, including while listeners run."""
+        return self._lock
+
+    @property
+    def version(self):
+        # Bumped on every append/compaction; part of every cache key downstream.
+        return self._load_manifest()["version"]
+
+    def properties(self):
+        return sorted(self._load_manifest()["properties"].values())
+
+    def add_listener(self, listener):
+        """Call ``listener(dataset, property_name, columns, version)`` after each write.
+
+        Compaction reports ``property_name`` and ``columns`` as None since it
+        changes the layout but not the readings.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, dataset, property_name, columns, version):
+        for listener in self._listeners:
+            listener(dataset, property_name, columns, version)
+
+    # --- Layout -------------------------------------------------------------
+
+    def _property_slugs(self, dataset, property_name):
+        if property_name in (None, ALL_PROPERTIES):
+            dataset_dir = os.path.join(self.root, dataset)
+            if not os.path.isdir(dataset_dir):
+                return []
+            return sorted(os.listdir(dataset_dir))
+        return [property_slug(property_name)]
+
+    def _months(self, dataset, slug, start=None, end=None):
+        property_dir = os.path.join(self.root, dataset, slug)
+        if not os.path.isdir(property_dir):
+            return []
+        months = sorted(m for m in os.listdir(property_dir) if not m.startswith("."))
+        # Partition pruning: "YYYY-MM" strings sort chronologically.
+        if start is not None:
+            months = [m for m in months if m >= _month_key(start)]
+        if end is not None:
+            months = [m for m in months if m <= _month_key(end)]
+        return months
+
+    def _chunks(self, dataset, slug, month):
+        month_dir = os.path.join(self.root, dataset, slug, month)
+        return [
+            os.path.join(month_dir, c)
+            for c in sorted(os.listdir(month_dir))
+            if not c.startswith(".")
+        ]
+
+    def months(self, dataset, property_name):
+        """Sorted "YYYY-MM" partitions holding readings for one property."""
+        return self._months(dataset, property_slug(property_name))
+
+    def has_data(self, dataset, property_name=ALL_PROPERTIES):
+        return any(self._months(dataset, slug) for slug in self._property_slugs(dataset, property_name))
+
+    # --- Writes -------------------------------------------------------------
+
+    def append(self, dataset, property_name, columns):
+        """Append readings for one property; ``columns`` maps column -> array."""
+        schema = SCHEMAS[dataset]
+        missing = set(schema) - set(columns)
+        if missing:
+            raise ValueError(f"Missing columns for {dataset}: {sorted(missing)}")
+
+        arrays = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in schema.items()}
+        if len(arrays["timestamp"]) == 0:
+            return
+
+        slug = property_slug(property_name)
+        months = arrays["timestamp"].astype("datetime64[M]")
+        order = np.lexsort((arrays["timestamp"], months))
+        months = months[order]
+        boundaries = np.flatnonzero(months[1:] != months[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(months)]))
+
+        with self._lock:
+            manifest = dict(self._load_manifest())
+            manifest["version"] += 1
+            for lo, hi in zip(starts, ends):
+                rows = order[lo:hi]
+                month_dir = os.path.join(self.root, dataset, slug, str(months[lo]))
+                chunk = {name: arr[rows] for name, arr in arrays.items()}
+                chunk[VERSION_COLUMN] = np.full(hi - lo, manifest["version"], dtype="int64")
+                self._write_chunk(month_dir, chunk)
+                if len(self._chunks(dataset, slug, str(months[lo]))) > self.compact_chunks:
+                    self._compact_partition(dataset, slug, str(months[lo]))
+
+            manifest["properties"] = {**manifest["properties"], slug: property_name}
+            self._save_manifest(manifest)
+            self._notify(dataset, property_name, arrays, manifest["version"])
+
+    def _write_chunk(self, month_dir, arrays):
+        os.makedirs(month_dir, exist_ok=True)
+        chunk_name = f"chunk-v{int(arrays[VERSION_COLUMN].max()):010d}-{uuid.uuid4().hex[:8]}"
+        # Write into a hidden directory first so readers never see a partial chunk.
+        tmp_dir = os.path.join(month_dir, f".{chunk_name}")
+        os.makedirs(tmp_dir)
+        for name, arr in arrays.items():
+            out = np.lib.format.open_memmap(
+                os.path.join(tmp_dir, f"{name}.npy"), mode="w+", dtype=arr.dtype, shape=arr.shape
+            )
+            out[:] = arr
+            out.flush()
+            del out
+        os.replace(tmp_dir, os.path.join(month_dir, chunk_name))
+
+    def _compact_partition(self, dataset, slug, month):
+        # Merge a month's chunks into one; False if there was nothing to merge
+        chunks = self._chunks(dataset, slug, month)
+        if len(chunks) < 2:
+            return False
+        merged = self._read_partition(dataset, slug, month, list(SCHEMAS[dataset]))
+        merged[VERSION_COLUMN] = np.concatenate([_chunk_versions(c) for c in chunks])
+        order = np.argsort(merged["timestamp"], kind="stable")
+        month_dir = os.path.join(self.root, dataset, slug, month)
+        self._write_chunk(month_dir, {name: arr[order] for name, arr in merged.items()})
+        for chunk in chunks:
+            shutil.rmtree(chunk)
+        return True
+
+    def compact(self, dataset, property_name=ALL_PROPERTIES):
+        """Merge each month's chunks into a single sorted chunk."""
+        with self._lock:
+            changed = False
+            for slug in self._property_slugs(dataset, property_name):
+                for month in self._months(dataset, slug):
+                    changed |= self._compact_partition(dataset, slug, month)
+
+            if changed:
+                manifest = dict(self._load_manifest())
+                manifest["version"] += 1
+                self._save_manifest(manifest)
+                self._notify(dataset, None, None, manifest["version"])
+
+    # --- Reads --------------------------------------------------------------
+
+    def _chunk_span(self, chunk_dir, schema, start=None, end=None):
+        # Row range of a chunk's readings in [start, end)
+        timestamps = _map_column(os.path.join(chunk_dir, "timestamp.npy"), schema["timestamp"])
+        lo, hi = 0, len(timestamps)
+        if start is not None:
+            lo = np.searchsorted(timestamps, np.datetime64(start, "s"), side="left")
+        if end is not None:
+            hi = np.searchsorted(timestamps, np.datetime64(end, "s"), side="left")
+        return int(lo), int(hi)
+
+    def _read_chunk(self, chunk_dir, columns, schema, start=None, end=None):
+        lo, hi = self._chunk_span(chunk_dir, schema, start, end)
+        return {
+            name: _map_column(os.path.join(chunk_dir, f"{name}.npy"), schema[name])[lo:hi]
+            for name in columns
+        }
+
+    def _read_partition(self, dataset, slug, month, columns, start=None, end=None):
+        schema = SCHEMAS[dataset]
+        parts = [self._read_chunk(c, columns, schema, start, end) for c in self._chunks(dataset, slug, month)]
+        return _concat(parts, columns, SCHEMAS[dataset])
+
+    @_retrying
+    def read(self, dataset, property_name=ALL_PROPERTIES, columns=None, start=None, end=None):
+        """Return ``{column: array}`` for the requested columns and [start, end).
+
+        A single compacted partition is returned as read-only memmap views;
+        spanning several partitions concatenates them.
+        """
+        schema = SCHEMAS[dataset]
+        columns = list(schema) if columns is None else list(columns)
+        unknown = set(columns) - set(schema)
+        if unknown:
+            raise KeyError(f"Unknown columns for {dataset}: {sorted(unknown)}")
+
+        partitions = [(slug, month) for slug in self._property_slugs(dataset, property_name)
+                      for month in self._months(dataset, slug, start, end)]
+        if len(partitions) == 1:
+            return self._read_partition(dataset, *partitions[0], columns, start, end)
+
+        # Each mapped column holds a file descriptor, so rather than mapping
+        # every chunk before concatenating, chunks are copied one at a time
+        # into the result.
+        spans = [(chunk_dir, *self._chunk_span(chunk_dir, schema, start, end))
+                 for slug, month in partitions for chunk_dir in self._chunks(dataset, slug, month)]
+        result = {name: np.empty(sum(hi - lo for _, lo, hi in spans), dtype=schema[name]) for name in columns}
+        position = 0
+        for chunk_dir, lo, hi in spans:
+            for name in columns:
+                column = _map_column(os.path.join(chunk_dir, f"{name}.npy"), schema[name])
+                result[name][position:position + hi - lo] = column[lo:hi]
+            position += hi - lo
+        return result
+
+    @_retrying
+    def read_since(self, dataset, property_name, after_version, up_to_version=None, columns=None):
+        """Readings of one property written after store version ``after_version``.
+
+        With ``up_to_version`` only readings written at or before it are
+        returned, so a caller can read a range of versions exactly once.
+        """
+        schema = SCHEMAS[dataset]
+        columns = list(schema) if columns is None else list(columns)
+        slug = property_slug(property_name)
+        parts = []
+        for month in self._months(dataset, slug):
+            for chunk_dir in self._chunks(dataset, slug, month):
+                if _chunk_name_version(chunk_dir) <= after_version:
+                    continue
+                versions = _chunk_versions(chunk_dir)
+                keep = versions > after_version
+                if up_to_version is not None:
+                    keep &= versions <= up_to_version
+                if keep.any():
+                    parts.append({name: np.asarray(_map_column(os.path.join(chunk_dir, f"{name}.npy"),
+                                                               schema[name])[keep]) for name in columns})
+        return _concat(parts, columns, schema)
+
+    def read_frame(self, dataset, property_name=ALL_PROPERTIES, columns=None, start=None, end=None):
+        return pd.DataFrame(self.read(dataset, property_name, columns, start, end), copy=False)
+
+    @_retrying
+    def monthly(self, dataset, property_name=ALL_PROPERTIES, columns=None, start=None, end=None):
+        """Per-month column sums, computed partition by partition."""
+        schema = SCHEMAS[dataset]
+        if columns is None:
+            columns = [c for c in schema if c != "timestamp" and not c.endswith("_id")]
+
+        totals = {}
+        for slug in self._property_slugs(dataset, property_name):
+            for month in self._months(dataset, slug, start, end):
+                part = self._read_partition(dataset, slug, month, columns, start, end)
+                sums = np.array([part[c].sum(dtype="float64") for c in columns])
+                totals[month] = totals.get(month, 0) + sums
+
+        index = pd.PeriodIndex(sorted(totals), freq="M", name="month")
+        values = np.array([totals[str(m)] for m in index]).reshape(len(index), len(columns))
+        return pd.DataFrame(values, index=index, columns=columns)
+
+
+def _chunk_name_version(chunk_dir):
+    # Newest row version in a chunk, from its name; chunks named before
+    # versions were recorded count as version 0
+    name = os.path.basename(chunk_dir)
+    return int(name[len("chunk-v"):].split("-")[0]) if name.startswith("chunk-v") else 0
+
+
+def _chunk_versions(chunk_dir):
+    path = os.path.join(chunk_dir, f"{VERSION_COLUMN}.npy")
+    if not os.path.exists(path):
+        rows = len(_map_column(os.path.join(chunk_dir, "timestamp.npy"), "datetime64[s]"))
+        return np.zeros(rows, dtype="int64")
+    return np.asarray(_map_column(path, "int64"))
+
+
+# The header np.save writes for a 1-D C-ordered array
+_NPY_HEADER = re.compile(r"\{'descr': '([^']+)', 'fortran_order': False, 'shape': \((\d+),\), \}")
+
+
+def _map_column(path, dtype):
+    # Map a 1-D column file written by _write_chunk, checking its header
+    # against the schema's dtype first. The header is matched with a regular
+    # expression rather than np.load's parser, which uses ast: on Python
+    # 3.11 ast is not safe to run on a background thread while Streamlit
+    # parses the app script.
+    dtype = np.dtype(dtype)
+    with open(path, "rb") as f:
+        major, _ = np.lib.format.read_magic(f)
+        length_format = "<H" if major == 1 else "<I"
+        (header_length,) = struct.unpack(length_format, f.read(struct.calcsize(length_format)))
+        header = f.read(header_length).decode("latin1")
+        offset = f.tell()
+    match = _NPY_HEADER.match(header)
+    if match is None:
+        raise ValueError(f"{path}: not a 1-D column file: {header.strip()}")
+    stored_dtype, rows = np.dtype(match.group(1)), int(match.group(2))
+    if stored_dtype != dtype:
+        raise ValueError(f"{path}: stored as {stored_dtype}, schema expects {dtype}")
+    if os.path.getsize(path) - offset != rows * dtype.itemsize:
+        raise ValueError(f"{path}: expected {rows} rows of {dtype}, file size does not match")
+    if rows == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(rows,))
+
+
+def _concat(parts, columns, schema):
+    if len(parts) == 1:
+        return parts[0]
+    if not parts:
+        return {name: np.empty(0, dtype=schema[name]) for name in columns}
+    return {name: np.concatenate([p[name] for p in parts]) for name in columns}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TelemetryStore()
+        return _store
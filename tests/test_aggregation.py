@@ -0,0 +1,50 @@
+import threading
+
+import numpy as np
+
+from aggregation import PortfolioAggregator
+from telemetry_store import TelemetryStore
+
+
+def energy_readings(start, count, kwh=1.0):
+    return {
+        "timestamp": np.datetime64(start, "s") + np.arange(count) * np.timedelta64(1, "h"),
+        "meter_id": np.zeros(count),
+        "standard": np.full(count, kwh),
+        "optimized": np.full(count, kwh / 2),
+    }
+
+
+def test_follows_appends_incrementally(tmp_path):
+    store = TelemetryStore(str(tmp_path))
+    store.append("energy", "Plaza", energy_readings("2026-03-01", 10))
+    aggregator = PortfolioAggregator(store)
+    assert aggregator.portfolio_totals()["standard_kwh"] == 10
+
+    store.append("energy", "Tower", energy_readings("2026-04-01", 5, kwh=2.0))
+
+    totals = aggregator.property_totals()
+    assert totals["standard_kwh"].to_dict() == {"Plaza": 10, "Tower": 10}
+    assert aggregator.monthly("energy")["standard"].tolist() == [10, 10]
+
+
+def test_append_during_rebuild_is_counted_once(tmp_path):
+    store = TelemetryStore(str(tmp_path))
+    store.append("energy", "Plaza", energy_readings("2026-03-01", 10))
+    aggregator = PortfolioAggregator(store)
+
+    monthly = store.monthly
+    writer = threading.Thread(target=store.append, args=("energy", "Plaza", energy_readings("2026-03-02", 4)))
+
+    def monthly_with_concurrent_append(*args, **kwargs):
+        if not writer.is_alive() and writer.ident is None:
+            writer.start()
+            writer.join(0.2)
+        return monthly(*args, **kwargs)
+
+    store.monthly = monthly_with_concurrent_append
+    aggregator.rebuild()
+    writer.join()
+    store.monthly = monthly
+
+    assert aggregator.portfolio_totals()["standard_kwh"] == 14
@@ -0,0 +1,62 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from api import APIError, MetricsAPI
+
+
+@pytest.fixture
+def api():
+    api = MetricsAPI(properties=lambda: ["Plaza", "Tower"], max_workers=2)
+    api.register("energy", lambda selected_property, time_horizon: {"kwh": 100 * time_horizon})
+    yield api
+    api.stop()
+
+
+def test_batches_properties(api):
+    body, _ = api.query(["Plaza", "Tower"], ["energy"], 2)
+
+    assert json.loads(body)["properties"] == {"Plaza": {"energy": {"kwh": 200}}, "Tower": {"energy": {"kwh": 200}}}
+
+
+@pytest.mark.parametrize("properties, metrics", [
+    ("Plaza", None),
+    (["Plaza", 3], None),
+    ({"Plaza": 1}, None),
+    (["Plaza"], "energy"),
+    (["Plaza"], [["energy"]]),
+])
+def test_rejects_anything_but_lists_of_strings(api, properties, metrics):
+    with pytest.raises(APIError) as error:
+        api.query(properties, metrics)
+
+    assert error.value.status == 400
+
+
+def test_builder_errors_are_500(api):
+    def broken(selected_property, time_horizon):
+        raise RuntimeError("no readings")
+
+    api.register("broken", broken)
+
+    with pytest.raises(APIError) as error:
+        api.query(["Plaza"], ["broken"])
+
+    assert error.value.status == 500
+    assert "no readings" in api.stats["last_error"]
+
+
+def test_builder_errors_are_served_as_json(api):
+    api.register("broken", lambda selected_property, time_horizon: 1 / 0)
+    api.start("127.0.0.1", 0)
+    host, port = api.address
+    request = urllib.request.Request(f"http://{host}:{port}/v1/metrics", method="POST",
+                                     data=json.dumps({"properties": ["Plaza"], "metrics": ["broken"]}).encode())
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request, timeout=5)
+
+    assert error.value.code == 500
+    assert "error" in json.loads(error.value.read())
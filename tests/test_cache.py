@@ -0,0 +1,57 @@
+import numpy as np
+
+import cache
+from cache import ResultCache, cache_key
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    results = ResultCache(ttl=10)
+    results.put("key", 1)
+
+    now[0] += 9
+    assert results.get("key") == 1
+    now[0] += 2
+    assert results.get("key") is None
+    assert len(results) == 0
+    assert results.stats()["bytes"] == 0
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    results = ResultCache(max_entries=2)
+    results.put("a", 1)
+    results.put("b", 2)
+    results.get("a")
+    results.put("c", 3)
+
+    assert "a" in results and "c" in results
+    assert "b" not in results
+    assert results.stats()["evictions"] == 1
+
+
+def test_byte_budget_evicts_and_skips_oversized_values():
+    block = np.zeros(100, dtype="float64")  # 800 bytes
+    results = ResultCache(max_bytes=2000)
+    results.put("a", block)
+    results.put("b", block.copy())
+    results.put("c", block.copy())
+
+    assert "a" not in results
+    assert results.stats()["bytes"] == 1600
+
+    big = np.zeros(1000)
+    assert results.put("big", big) is big
+    assert "big" not in results
+    assert results.stats()["bytes"] == 1600
+
+
+def test_sync_version_drops_entries_from_older_data():
+    results = ResultCache()
+    results.put(cache_key("Plaza", "energy", 5, 1), "old")
+    results.put(cache_key("Plaza", "energy", 5, 2), "new")
+
+    results.sync_version(2)
+
+    assert cache_key("Plaza", "energy", 5, 1) not in results
+    assert results.get(cache_key("Plaza", "energy", 5, 2)) == "new"
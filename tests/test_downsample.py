@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from downsample import downsample_frame, lttb_indices, minmax_indices
+
+
+def test_lttb_keeps_endpoints_and_a_lone_spike():
+    y = np.zeros(1000)
+    y[437] = 50.0
+
+    rows = lttb_indices(np.arange(1000), y, 50)
+
+    assert len(rows) == 50
+    assert rows[0] == 0 and rows[-1] == 999
+    assert 437 in rows
+    assert np.all(np.diff(rows) > 0)
+
+
+def test_lttb_returns_every_point_when_under_budget():
+    assert lttb_indices(np.arange(10), np.arange(10), 20).tolist() == list(range(10))
+
+
+def test_minmax_keeps_every_series_extremes_and_endpoints():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(1001, 2))
+    values[123, 0], values[800, 1] = 10.0, -10.0
+
+    rows = minmax_indices(values, 40)
+
+    assert rows[0] == 0 and rows[-1] == 1000
+    for column in values.T:
+        assert column.argmax() in rows and column.argmin() in rows
+    assert len(rows) <= 2 + 40 * 2 * 2
+
+
+def test_downsample_frame_retains_kept_rows():
+    data = pd.DataFrame({"value": np.sin(np.arange(5000) / 50)})
+
+    sampled = downsample_frame(data, ["value"], max_points=100, keep=[4000])
+
+    assert len(sampled) <= 101
+    assert 4000 in sampled.index
+    assert sampled.index[0] == 0 and sampled.index[-1] == 4999
@@ -0,0 +1,46 @@
+from feeds import PRIORITIES, FeedIndex
+from telemetry_store import ALL_PROPERTIES
+
+
+def make_items():
+    # 12 High and 13 Low items for Plaza, 3 Medium for Tower
+    items = [{"property": "Plaza", "priority": "High", "due_days": day} for day in range(12)]
+    items += [{"property": "Plaza", "priority": "Low", "due_days": day} for day in range(13)]
+    items += [{"property": "Tower", "priority": "Medium", "due_days": day} for day in range(3)]
+    return items[::-1]
+
+
+def test_pages_split_at_page_size_across_priority_runs():
+    feed = FeedIndex.from_items(make_items())
+
+    first = feed.page("Plaza", page=1, page_size=10)
+    second = feed.page("Plaza", page=2, page_size=10)
+    last = feed.page("Plaza", page=3, page_size=10)
+
+    assert (first["total"], first["pages"]) == (25, 3)
+    assert [item["due_days"] for item in first["items"]] == list(range(10))
+    assert [(item["priority"], item["due_days"]) for item in second["items"]] == (
+        [("High", 10), ("High", 11)] + [("Low", day) for day in range(8)])
+    assert [item["due_days"] for item in last["items"]] == list(range(8, 13))
+
+
+def test_page_numbers_are_clamped():
+    feed = FeedIndex.from_items(make_items())
+
+    assert feed.page("Plaza", page=0, page_size=10)["page"] == 1
+    assert feed.page("Plaza", page=99, page_size=10)["page"] == 3
+    assert len(feed.page("Plaza", page=99, page_size=10)["items"]) == 5
+
+
+def test_filters_and_counts():
+    feed = FeedIndex.from_items(make_items())
+
+    assert feed.counts("Tower") == {"High": 0, "Medium": 3, "Low": 0}
+    assert feed.counts(ALL_PROPERTIES) == {"High": 12, "Medium": 3, "Low": 13}
+    low = feed.page("Plaza", ["Low"], page_size=10)
+    assert (low["total"], low["pages"]) == (13, 2)
+    assert all(item["priority"] == "Low" for item in low["items"])
+
+    empty = feed.page("Nowhere", PRIORITIES)
+    assert (empty["items"], empty["total"], empty["pages"]) == ([], 0, 1)
+    assert feed.page("Plaza", [])["items"] == []
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from forecast import ForecastPipeline, LazyForecast, forecast_frame
+
+
+def history(months=12):
+    return pd.DataFrame({
+        "period": pd.period_range("2025-01", periods=months, freq="M"),
+        "usage": np.arange(100, 100 + months, dtype="int64"),
+        "cost": np.linspace(10.0, 20.0, months),
+    })
+
+
+def test_frame_grows_by_the_horizon():
+    pipeline = ForecastPipeline()
+
+    frame = forecast_frame(history(), "energy", ("Plaza", 1), 24, ["usage"], pipeline=pipeline)
+
+    assert len(frame) == 36
+    assert frame["future"].tolist() == [False] * 12 + [True] * 24
+    assert frame["period"].iloc[12] == pd.Period("2026-01", freq="M")
+    assert frame["period"].iloc[-1] == pd.Period("2027-12", freq="M")
+    assert frame["usage"].dtype == np.int64
+    assert (frame["cost"].iloc[12:] == 0).all()
+
+
+def test_no_horizon_adds_no_rows():
+    frame = forecast_frame(history(), "energy", ("Plaza", 1), 0, ["usage"], pipeline=ForecastPipeline())
+
+    assert len(frame) == 12
+    assert not frame["future"].any()
+
+
+def test_shorter_horizon_slices_the_longer_one():
+    pipeline = ForecastPipeline()
+    key = ("Plaza", 1, "usage")
+    long = pipeline.forecast(key, np.arange(12.0), 36).copy()
+    short = pipeline.forecast(key, np.arange(12.0), 6)
+
+    np.testing.assert_array_equal(short, long[:6])
+    assert pipeline.generated_periods(key) == 36
+
+
+def test_forecasts_respect_floor_and_ceiling():
+    falling = LazyForecast(np.linspace(50, 0, 20), floor=0.0)
+    rising = LazyForecast(np.linspace(80, 99, 20), damping=1.0, ceiling=100.0)
+
+    assert falling.take(60).min() >= 0
+    assert rising.take(60).max() <= 100
+    assert len(rising.take(10)) == 10
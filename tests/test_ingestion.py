@@ -0,0 +1,78 @@
+import time
+
+from ingestion import IngestionPipeline
+
+
+class FlakyStore:
+    """Refuses the first append, then records the rest."""
+
+    def __init__(self):
+        self.appends = []
+
+    def append(self, dataset, property_name, columns):
+        if not self.appends:
+            self.appends.append(None)
+            raise OSError("disk full")
+        self.appends.append((dataset, property_name, len(columns["timestamp"])))
+
+
+def reading(minute):
+    return {"dataset": "energy", "property": "Plaza", "timestamp": f"2026-03-01T00:{minute:02d}:00",
+            "meter_id": 1, "standard": 2.0, "optimized": 1.5}
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.01)
+
+
+def test_failed_write_is_counted_and_consumer_keeps_running():
+    store = FlakyStore()
+    pipeline = IngestionPipeline(store, [], buffer_size=2, bucket_seconds=60).start()
+    try:
+        for minute in range(4):
+            pipeline.emit(reading(minute))
+        wait_for(lambda: len(store.appends) == 2)
+    finally:
+        pipeline.stop()
+
+    assert pipeline.stats["errors"] == 1
+    assert pipeline.stats["lost"] == 2
+    assert "disk full" in pipeline.stats["last_error"]
+    assert pipeline.stats["flushed"] == 2
+    assert store.appends[1] == ("energy", "Plaza", 2)
+
+
+def test_consumer_survives_failed_flush_then_keeps_consuming():
+    store = FlakyStore()
+    pipeline = IngestionPipeline(store, [], buffer_size=1).start()
+    try:
+        pipeline.emit(reading(0))
+        wait_for(lambda: pipeline.stats["errors"] == 1)
+        assert pipeline.running
+
+        pipeline.emit(reading(1))
+        wait_for(lambda: pipeline.stats["flushed"] == 1)
+    finally:
+        pipeline.stop()
+
+
+def test_rejects_non_object_and_missing_timestamp():
+    store = FlakyStore()
+    store.appends.append(None)  # accept every append
+    pipeline = IngestionPipeline(store, [], buffer_size=1).start()
+    try:
+        pipeline.emit("42")
+        pipeline.emit(dict(reading(0), timestamp=None))
+        pipeline.emit(reading(1))
+        wait_for(lambda: pipeline.stats["flushed"] == 1)
+        assert pipeline.running
+    finally:
+        pipeline.stop()
+
+    assert pipeline.stats["rejected"] == 2
+    assert pipeline.stats["received"] == 1
+    assert store.appends[1] == ("energy", "Plaza", 1)
@@ -0,0 +1,84 @@
+import numpy as np
+
+from maintenance_scoring import MaintenanceScoringEngine
+from telemetry_store import TelemetryStore
+
+
+def sensor_readings(start, count, equipment_id=1):
+    return {
+        "timestamp": np.datetime64(start, "s") + np.arange(count) * np.timedelta64(15, "m"),
+        "equipment_id": np.full(count, equipment_id),
+        "temperature": np.linspace(20, 30, count),
+        "vibration": np.linspace(0, 1, count),
+        "power": np.linspace(5, 6, count),
+    }
+
+
+class StubModel:
+    def predict_proba(self, features):
+        return np.column_stack([np.zeros(len(features)), np.full(len(features), 0.9)])
+
+
+def test_catch_up_reads_writes_from_other_processes(tmp_path):
+    ingesting, serving = TelemetryStore(str(tmp_path)), TelemetryStore(str(tmp_path))
+    ingesting.append("sensors", "Plaza", sensor_readings("2026-03-01", 10))
+    engine = MaintenanceScoringEngine(StubModel()).attach(serving)
+    assert engine._count[0] == 10
+
+    # Written through another store instance, so no listener fires here
+    ingesting.append("sensors", "Plaza", sensor_readings("2026-03-01T02:30", 5))
+    ingesting.append("sensors", "Tower", sensor_readings("2026-03-02", 8, equipment_id=2))
+
+    assert engine.catch_up(serving) == 13
+    assert engine._count[:len(engine)].tolist() == [15, 8]
+    assert engine.catch_up(serving) == 0
+
+
+def test_catch_up_skips_writes_listeners_already_reported(tmp_path):
+    store = TelemetryStore(str(tmp_path))
+    store.append("sensors", "Plaza", sensor_readings("2026-03-01", 10))
+    engine = MaintenanceScoringEngine(StubModel()).attach(store)
+
+    store.append("sensors", "Plaza", sensor_readings("2026-03-01T02:30", 5))
+
+    assert engine._count[0] == 15
+    assert engine.catch_up(store) == 0
+    assert engine._count[0] == 15
+
+
+def test_catch_up_reads_readings_at_already_seen_timestamps(tmp_path):
+    ingesting, serving = TelemetryStore(str(tmp_path)), TelemetryStore(str(tmp_path))
+    ingesting.append("sensors", "Plaza", sensor_readings("2026-03-01", 10))
+    engine = MaintenanceScoringEngine(StubModel()).attach(serving)
+
+    # A later flush of an earlier bucket, and another piece of equipment
+    # reporting behind the first
+    ingesting.append("sensors", "Plaza", sensor_readings("2026-03-01T02:15", 1))
+    ingesting.append("sensors", "Plaza", sensor_readings("2026-03-01", 4, equipment_id=2))
+
+    assert engine.catch_up(serving) == 5
+    assert engine._count[:len(engine)].tolist() == [11, 4]
+
+
+def test_catch_up_after_compaction_reads_only_new_rows(tmp_path):
+    ingesting, serving = TelemetryStore(str(tmp_path)), TelemetryStore(str(tmp_path))
+    ingesting.append("sensors", "Plaza", sensor_readings("2026-03-01", 10))
+    engine = MaintenanceScoringEngine(StubModel()).attach(serving)
+
+    ingesting.append("sensors", "Plaza", sensor_readings("2026-03-01T02:30", 5))
+    ingesting.compact("sensors")
+
+    assert engine.catch_up(serving) == 5
+    assert engine._count[0] == 15
+
+
+def test_listener_reads_back_writes_it_did_not_hear_about(tmp_path):
+    other, store = TelemetryStore(str(tmp_path)), TelemetryStore(str(tmp_path))
+    store.append("sensors", "Plaza", sensor_readings("2026-03-01", 10))
+    engine = MaintenanceScoringEngine(StubModel()).attach(store)
+
+    other.append("sensors", "Plaza", sensor_readings("2026-03-01T02:30", 5))
+    store.append("sensors", "Plaza", sensor_readings("2026-03-01T03:45", 3))
+
+    assert engine._count[0] == 18
+    assert engine.catch_up(store) == 0
@@ -0,0 +1,60 @@
+import threading
+
+from profiling import RenderProfiler
+
+
+def test_steps_on_other_threads_are_kept_apart_from_the_run():
+    profiler = RenderProfiler(enabled=True)
+
+    def build():
+        with profiler.step("build_snapshot", "data"):
+            pass
+
+    with profiler.run("script", "run"):
+        with profiler.step("show_view", "view"):
+            worker = threading.Thread(target=build, name="snapshot_0")
+            worker.start()
+            worker.join()
+
+    assert [record["step"] for record in profiler.last_run()["steps"]] == ["script", "show_view"]
+    assert len(profiler.runs) == 1
+    [background] = profiler.background
+    assert background["thread"] == "snapshot_0"
+    assert background["steps"][0]["step"] == "build_snapshot"
+    assert background["steps"][0]["peak_kb"] is None
+
+
+def test_a_run_nested_in_a_run_is_a_step():
+    profiler = RenderProfiler(enabled=True)
+
+    with profiler.run("script", "run"):
+        with profiler.run("show_feed", "fragment"):
+            pass
+
+    assert [(record["step"], record["depth"]) for record in profiler.last_run()["steps"]] == [
+        ("script", 0), ("show_feed", 1)]
+
+
+def test_overlapping_runs_drop_allocation_figures():
+    profiler = RenderProfiler(enabled=True)
+    started, release = threading.Event(), threading.Event()
+
+    def other_session():
+        with profiler.run("script", "run"):
+            started.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=other_session)
+    thread.start()
+    assert started.wait(5)
+    with profiler.run("script", "run"):
+        release.set()
+        thread.join()
+    with profiler.run("script", "run"):
+        pass
+
+    overlapped, alone = list(profiler.runs)[:2], profiler.runs[2]
+    assert all(run["concurrent"] for run in overlapped)
+    assert all(run["steps"][0]["peak_kb"] is None for run in overlapped)
+    assert not alone["concurrent"]
+    assert alone["steps"][0]["peak_kb"] is not None
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from roi import cumulative_roi
+
+
+def loop_cumulative_roi(investment, returns):
+    # The per-period sum() loop cumulative_roi replaced
+    result = []
+    for i in range(len(investment)):
+        total_investment = sum(investment[:i + 1])
+        total_returns = sum(returns[:i + 1])
+        result.append((total_returns - total_investment) / total_investment * 100)
+    return result
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_sum_loop(seed):
+    rng = np.random.default_rng(seed)
+    periods = int(rng.integers(1, 120))
+    investment = rng.uniform(1, 1e6, periods)
+    returns = rng.uniform(0, 1e6, periods)
+
+    roi = cumulative_roi(investment, returns)
+
+    np.testing.assert_allclose(roi["cumulative_roi"], loop_cumulative_roi(investment, returns), rtol=1e-10)
+    np.testing.assert_allclose(roi["net"], np.cumsum(returns) - np.cumsum(investment), rtol=1e-10)
+
+
+def test_sample_data_matches_sum_loop():
+    investment = [350000, 75000, 50000, 50000, 25000]
+    returns = [247500, 320000, 382500, 420000, 475000]
+
+    roi = cumulative_roi(investment, returns)
+
+    np.testing.assert_allclose(roi["cumulative_roi"], loop_cumulative_roi(investment, returns))
+
+
+def test_stacked_properties_match_each_series():
+    rng = np.random.default_rng(42)
+    investment = rng.uniform(1, 1e5, (3, 4, 36))
+    returns = rng.uniform(0, 1e5, (3, 4, 36))
+
+    stacked = cumulative_roi(investment, returns)
+
+    for index in np.ndindex(investment.shape[:-1]):
+        single = cumulative_roi(investment[index], returns[index])
+        np.testing.assert_allclose(stacked["cumulative_roi"][index],
+                                   loop_cumulative_roi(investment[index], returns[index]), rtol=1e-10)
+        for name in ("net", "break_even_index", "break_even_period"):
+            np.testing.assert_allclose(stacked[name][index], single[name])
+
+
+def test_never_breaks_even():
+    roi = cumulative_roi([100, 100, 100], [10, 10, 10])
+
+    assert roi["break_even_index"] == -1
+    assert np.isnan(roi["break_even_period"])
+
+
+def test_breaks_even_in_first_period():
+    roi = cumulative_roi([100, 0, 0], [200, 0, 0])
+
+    assert roi["break_even_index"] == 0
+    # Half of the first period's returns cover the investment
+    assert roi["break_even_period"] == pytest.approx(0.5)
+
+
+def test_stacked_break_even_edge_cases():
+    roi = cumulative_roi([[100, 100, 100], [100, 0, 0], [100, 0, 0]],
+                         [[10, 10, 10], [200, 0, 0], [50, 100, 0]])
+
+    np.testing.assert_array_equal(roi["break_even_index"], [-1, 0, 1])
+    np.testing.assert_allclose(roi["break_even_period"], [np.nan, 0.5, 1.5])
+
+
+def test_shape_mismatch_raises():
+    with pytest.raises(ValueError):
+        cumulative_roi([1, 2], [1, 2, 3])
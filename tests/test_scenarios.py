@@ -0,0 +1,47 @@
+import numpy as np
+
+from scenarios import ScenarioSummary, evaluate_batch, implementation_costs, run_scenarios
+
+SPREADS = (0.2, 0.25, 0.1)
+
+
+def test_every_scenario_lands_in_a_histogram_bin():
+    # Wide spreads push scenarios to the edges the bins are sized for
+    for spreads in (SPREADS, (0.9, 0.9, 0.9), (0.0, 0.0, 0.0)):
+        batch = evaluate_batch(0, 20_000, 7, *spreads)
+        assert batch["roi_hist"].sum() == batch["net_hist"].sum() == batch["count"] == 20_000
+
+
+def test_merged_batches_add_up():
+    summary = ScenarioSummary(*SPREADS)
+    batches = [evaluate_batch(start, start + 5_000, 0, *SPREADS) for start in (0, 5_000, 10_000)]
+    for batch in batches:
+        summary.merge(batch)
+
+    assert summary.count == 15_000
+    assert summary.roi_hist.sum() == summary.net_hist.sum() == 15_000
+    assert summary.roi_under_3 == sum(batch["roi_under_3"] for batch in batches)
+    assert summary.net_sum == sum(batch["net_sum"] for batch in batches)
+
+
+def test_without_variation_percentiles_match_the_calculator():
+    summary = ScenarioSummary(0.0, 0.0, 0.0)
+    # 180 scenarios cover the property-count x level x existing-systems grid once
+    summary.merge(evaluate_batch(0, 180, 0, 0.0, 0.0, 0.0))
+    roi = summary.roi_percentiles()
+
+    fastest = implementation_costs(1, "Basic (Monitoring)", "Modern/Advanced")["roi_period"]
+    slowest = implementation_costs(1, "Advanced (Full AI Integration)", "None/Minimal")["roi_period"]
+    # Percentiles interpolate inside a bin, so they are exact to one bin width
+    bin_width = summary.roi_edges[1] - summary.roi_edges[0]
+    assert fastest - bin_width <= roi[5] <= roi[95] <= slowest + bin_width
+
+
+def test_run_scenarios_reports_every_batch():
+    updates = list(run_scenarios(n_scenarios=2_500, batch_size=1_000, max_workers=1))
+
+    assert [(completed, total) for completed, total, _ in updates] == [(1, 3), (2, 3), (3, 3)]
+    summary = updates[-1][2]
+    assert summary.count == summary.roi_hist.sum() == 2_500
+    assert 0 < summary.to_dict()["share_roi_under_3_years"] <= 1
+    assert np.isfinite(summary.to_dict()["net_benefit_5y_mean"])
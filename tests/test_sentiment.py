@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+
+import numpy as np
+
+from sentiment import SentimentPipeline
+
+
+class StubModel:
+    def predict(self, texts):
+        return np.array([2 if "great" in text else 0 for text in texts])
+
+
+def append_feedback(path, *texts):
+    with open(path, "a") as f:
+        for text in texts:
+            f.write(json.dumps({"property": "Plaza", "category": "Staff", "text": text}) + "\n")
+
+
+def test_version_does_not_read_the_file(tmp_path):
+    path = str(tmp_path / "feedback.jsonl")
+    append_feedback(path, "great staff")
+    pipeline = SentimentPipeline(StubModel(), path=path)
+    pipeline.refresh()
+
+    append_feedback(path, "rude staff")
+
+    assert pipeline.version == (0, 1)
+
+
+def test_background_thread_follows_the_file(tmp_path):
+    path = str(tmp_path / "feedback.jsonl")
+    append_feedback(path, "great staff")
+    pipeline = SentimentPipeline(StubModel(), path=path)
+    pipeline.refresh()
+    pipeline.start(interval=0.01)
+
+    append_feedback(path, "rude staff", "great lobby")
+
+    deadline = time.monotonic() + 5
+    while pipeline.version != (0, 3):
+        assert time.monotonic() < deadline, "feedback was not picked up"
+        time.sleep(0.01)
+    assert pipeline.aggregates()[["positive", "negative"]].values.tolist() == [[67, 33]]
+
+
+def test_malformed_lines_are_rejected_without_losing_the_batch(tmp_path):
+    path = tmp_path / "feedback.jsonl"
+    append_feedback(str(path), "great staff")
+    with open(path, "a") as f:
+        f.write('42\n{"property": "Plaza", "text": 7}\n["great"]\nnot json\n')
+    append_feedback(str(path), "rude staff")
+    pipeline = SentimentPipeline(StubModel(), path=str(path))
+
+    assert pipeline.refresh() == 2
+    assert pipeline.stats["documents"] == 2
+    assert pipeline.stats["rejected"] == 4
+
+
+def test_readers_do_not_wait_for_the_model(tmp_path):
+    path = str(tmp_path / "feedback.jsonl")
+    append_feedback(path, "great staff")
+    entered, release = threading.Event(), threading.Event()
+
+    class SlowModel(StubModel):
+        def predict(self, texts):
+            entered.set()
+            release.wait(5)
+            return super().predict(texts)
+
+    pipeline = SentimentPipeline(SlowModel(), path=path)
+    refresh = threading.Thread(target=pipeline.refresh)
+    refresh.start()
+    try:
+        assert entered.wait(5)
+        started = time.monotonic()
+        assert pipeline.version == (0, 0)
+        assert not pipeline.has_data()
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+        refresh.join()
+    assert pipeline.version == (0, 1)
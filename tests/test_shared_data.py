@@ -0,0 +1,49 @@
+import threading
+import time
+
+import pandas as pd
+
+from cache import estimate_size
+from shared_data import SharedFrames
+
+
+def test_concurrent_callers_share_one_build():
+    builds = []
+
+    def build(n):
+        builds.append(n)
+        time.sleep(0.05)
+        return pd.DataFrame({"x": range(n)})
+
+    frames = SharedFrames()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(frames.get("build", build, 100))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert builds == [100]
+    assert frames.stats()["bytes"] == estimate_size(results[0])
+    assert frames.stats()["references"] == 8
+
+
+def test_frames_are_rebuilt_when_the_version_moves_on():
+    version = [1]
+    frames = SharedFrames(version=lambda: version[0])
+    build = lambda: pd.DataFrame({"version": [version[0]]})
+
+    assert frames.get("build", build)["version"].tolist() == [1]
+    version[0] = 2
+    assert frames.get("build", build)["version"].tolist() == [2]
+    assert frames.stats()["entries"] == 1
+
+
+def test_edits_to_a_reference_do_not_reach_the_shared_frame():
+    frames = SharedFrames()
+    build = lambda: pd.DataFrame({"x": [1, 2, 3]})
+
+    first = frames.get("build", build)
+    first.loc[0, "x"] = 100
+
+    assert frames.get("build", build)["x"].tolist() == [1, 2, 3]
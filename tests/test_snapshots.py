@@ -0,0 +1,78 @@
+from snapshots import SnapshotWorker
+
+
+class DictBackend:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+def counting_builder(calls):
+    def build(selected_property, time_horizon):
+        calls.append((selected_property, time_horizon))
+        return len(calls)
+    return build
+
+
+def test_snapshot_is_reused_until_the_version_moves_on():
+    version, calls = [1], []
+    worker = SnapshotWorker(version=lambda: version[0])
+    worker.register("energy", counting_builder(calls))
+
+    first = worker.get("energy", "Plaza", 5)
+    assert worker.get("energy", "Plaza", 5) is first
+    assert calls == [("Plaza", 5)]
+
+    version[0] = 2
+    stale = worker.get("energy", "Plaza", 5)
+    assert stale is first and not worker.is_current(stale)
+    worker.submit(worker._key("energy", "Plaza", 5)).result()
+
+    fresh = worker.get("energy", "Plaza", 5)
+    assert (fresh["value"], fresh["version"]) == (2, 2)
+    assert worker.stats["served_stale"] == 1
+
+
+def test_views_ignoring_the_horizon_share_one_snapshot():
+    calls = []
+    worker = SnapshotWorker()
+    worker.register("financial", counting_builder(calls), uses_horizon=False)
+
+    assert worker.get("financial", "Plaza", 1) is worker.get("financial", "Plaza", 10)
+    assert calls == [("Plaza", None)]
+
+
+def test_refresh_recomputes_only_stale_keys():
+    version, calls = [1], []
+    worker = SnapshotWorker(version=lambda: version[0])
+    worker.register("energy", counting_builder(calls))
+    worker.get("energy", "Plaza", 5)
+
+    assert worker.refresh() == 0
+    version[0] = 2
+    assert worker.refresh() == 1
+    worker.submit(worker._key("energy", "Plaza", 5)).result()
+    assert worker.get("energy", "Plaza", 5)["version"] == 2
+
+
+def test_unshared_views_stay_out_of_the_backend():
+    backend = DictBackend()
+    worker = SnapshotWorker(backend=backend)
+    worker.register("energy", counting_builder([]))
+    worker.register("maintenance", counting_builder([]), shared=False)
+
+    worker.get("energy", "Plaza", 5)
+    worker.get("maintenance", "Plaza", 5)
+
+    assert [key[1][0] for key in backend.values] == ["energy"]
+
+    calls = []
+    other = SnapshotWorker(backend=backend)
+    other.register("energy", counting_builder(calls))
+    assert other.get("energy", "Plaza", 5)["value"] == 1
+    assert calls == [] and other.stats["shared"] == 1
@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+import pytest
+
+from telemetry_store import TelemetryStore, _map_column
+
+
+def test_map_column_matches_np_load(tmp_path):
+    path = str(tmp_path / "timestamp.npy")
+    values = np.datetime64("2026-03-01", "s") + np.arange(100) * np.timedelta64(15, "m")
+    np.save(path, values)
+
+    column = _map_column(path, "datetime64[s]")
+
+    np.testing.assert_array_equal(column, np.load(path))
+    assert column.dtype == values.dtype
+
+
+def test_map_column_empty_file(tmp_path):
+    path = str(tmp_path / "score.npy")
+    np.save(path, np.empty(0, dtype="float32"))
+
+    column = _map_column(path, "float32")
+
+    assert len(column) == 0
+    assert column.dtype == np.float32
+
+
+def test_read_across_partitions_keeps_order_and_range(tmp_path):
+    store = TelemetryStore(str(tmp_path))
+    timestamps = np.datetime64("2026-01-01", "s") + np.arange(0, 90 * 24, 6) * np.timedelta64(1, "h")
+    for name in ("Plaza", "Tower"):
+        for half in np.array_split(np.arange(len(timestamps)), 2):
+            store.append("tenant_surveys", name, {"timestamp": timestamps[half], "unit_id": half,
+                                                  "score": half.astype("float32")})
+    start, end = np.datetime64("2026-01-20", "s"), np.datetime64("2026-03-10", "s")
+    expected = np.flatnonzero((timestamps >= start) & (timestamps < end))
+
+    columns = store.read("tenant_surveys", start=start, end=end)
+
+    np.testing.assert_array_equal(columns["unit_id"], np.tile(expected, 2))
+    np.testing.assert_array_equal(columns["timestamp"], np.tile(timestamps[expected], 2))
+    assert len(store.read("tenant_surveys", "Nowhere")["timestamp"]) == 0
+
+
+def test_appends_keep_chunk_count_bounded(tmp_path):
+    store = TelemetryStore(str(tmp_path), compact_chunks=4)
+    start = np.datetime64("2026-03-01", "s")
+    for i in range(30):
+        store.append("tenant_surveys", "Plaza", {"timestamp": [start + np.timedelta64(i, "h")], "unit_id": [i],
+                                                 "score": [float(i)]})
+        assert len(store._chunks("tenant_surveys", "plaza", "2026-03")) <= 4
+
+    columns = store.read("tenant_surveys", "Plaza")
+    assert sorted(columns["unit_id"].tolist()) == list(range(30))
+    assert len(store.read_since("tenant_surveys", "Plaza", 25)["timestamp"]) == 5
+
+
+def test_map_column_rejects_a_different_dtype(tmp_path):
+    path = str(tmp_path / "score.npy")
+    np.save(path, np.arange(10, dtype="float64"))
+
+    with pytest.raises(ValueError, match="float32"):
+        _map_column(path, "float32")
+
+
+def test_map_column_rejects_a_truncated_file(tmp_path):
+    path = str(tmp_path / "score.npy")
+    np.save(path, np.arange(10, dtype="float32"))
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 4)
+
+    with pytest.raises(ValueError, match="10 rows"):
+        _map_column(path, "float32")